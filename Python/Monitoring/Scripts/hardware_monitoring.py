@@ -19,11 +19,36 @@ import os
 import re
 import json
 import csv
+import errno
+import fcntl
+import fnmatch
 import argparse
+import atexit
+import bisect
+import contextlib
 import glob
+import hashlib
+import http.server
+import io
+import math
+import mmap
+from array import array
 from datetime import datetime
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import shutil
+import socket
+import socketserver
+import struct
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+
+# curses needs the optional _curses extension; run_dashboard() imports it on demand
+curses = None
 
 #############
 # CONSTANTS #
@@ -35,6 +60,7 @@ VERSION = "0.0.1"
 SEVERITY_CRITICAL = "CRITICAL"
 SEVERITY_WARN = "WARN"
 SEVERITY_INFO = "INFO"
+SEVERITY_LEVELS = (SEVERITY_INFO, SEVERITY_WARN, SEVERITY_CRITICAL)
 
 # Terminal colors
 COLOR_RESET = '\033[0m'
@@ -46,39 +72,588 @@ COLOR_CYAN = '\033[96m'
 COLOR_BOLD = '\033[1m'
 COLOR_MAGENTA = '\033[95m'
 COLOR_WHITE = '\033[97m'
+# Cleared by --no-color, by NO_COLOR in the environment or when stdout is not a terminal
+USE_COLOR = True
 
 # Verbosity levels
 VERBOSITY_BASIC = 1
 VERBOSITY_DETAILED = 2
 VERBOSITY_FULL = 3
 
+# Collection engine
+DEFAULT_COLLECTOR_WORKERS = 8
+
+# CPU topology
+CPU_SYSFS_PATH = '/sys/devices/system/cpu'
+NODE_SYSFS_PATH = '/sys/devices/system/node'
+CPUINFO_PATH = '/proc/cpuinfo'
+
+# CPU utilization (/proc/stat column order; guest time is already included in user)
+CPU_STAT_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+CPU_USAGE_MODES = ('user', 'nice', 'system', 'iowait', 'irq', 'softirq', 'steal')
+CPU_FREQ_HISTOGRAM_BUCKETS = 8
+
+# Rate sampling (delay between the two samples of one-shot rate metrics)
+RATE_SAMPLE_INTERVAL = 0.25
+# Delay actually used by the collectors (0 while benchmarking, so only the parsing is timed)
+SAMPLE_PAUSE = RATE_SAMPLE_INTERVAL
+
+# Block I/O
+DISKSTATS_PATH = '/proc/diskstats'
+DISK_SECTOR_SIZE = 512
+DISK_VIRTUAL_PREFIXES = ('loop', 'ram')
+DISK_METRIC_UNITS = OrderedDict([
+    ('read_iops', 'IOPS'), ('write_iops', 'IOPS'), ('read_bytes', 'B/s'), ('write_bytes', 'B/s'),
+    ('await_ms', 'ms'), ('utilization', '%'), ('queue_depth', ''),
+])
+# Cumulative diskstats columns exposed as counters: (name, column, scale, unit)
+DISK_COUNTER_COLUMNS = (
+    ('reads_completed_total', 0, 1, ''), ('read_bytes_total', 2, DISK_SECTOR_SIZE, 'B'),
+    ('writes_completed_total', 4, 1, ''), ('written_bytes_total', 6, DISK_SECTOR_SIZE, 'B'),
+    ('io_time_seconds_total', 9, 0.001, ''),
+)
+
+# Network traffic
+NETDEV_PATH = '/proc/net/dev'
+NET_RATE_UNITS = OrderedDict([
+    ('rx_bytes', 'B/s'), ('tx_bytes', 'B/s'), ('rx_packets', 'pkt/s'), ('tx_packets', 'pkt/s'),
+    ('rx_drops', '/s'), ('tx_drops', '/s'), ('rx_errors', '/s'), ('tx_errors', '/s'),
+    ('utilization', '%'),
+])
+# Cumulative /proc/net/dev columns exposed as counters: (name, column, unit)
+NET_COUNTER_COLUMNS = (
+    ('rx_bytes_total', 0, 'B'), ('rx_packets_total', 1, ''), ('rx_errors_total', 2, ''),
+    ('rx_drops_total', 3, ''), ('tx_bytes_total', 8, 'B'), ('tx_packets_total', 9, ''),
+    ('tx_errors_total', 10, ''), ('tx_drops_total', 11, ''),
+)
+NET_ERROR_COUNTERS = ('rx_crc_errors', 'rx_frame_errors', 'rx_fifo_errors', 'rx_missed_errors',
+                      'rx_over_errors', 'tx_carrier_errors', 'tx_aborted_errors', 'tx_fifo_errors',
+                      'collisions')
+
+# Watch mode
+WATCH_STATIC_SECTIONS = ('os', 'cpu', 'motherboard', 'graphics', 'peripherals', 'pci')
+SAMPLE_LABELS = {
+    'os.load1': 'Load Average (1min)',
+    'os.load5': 'Load Average (5min)',
+    'os.load15': 'Load Average (15min)',
+    'cpu.usage': 'CPU Usage',
+    'cpu.user': 'CPU User Time',
+    'cpu.nice': 'CPU Nice Time',
+    'cpu.system': 'CPU System Time',
+    'cpu.iowait': 'CPU I/O Wait',
+    'cpu.irq': 'CPU IRQ Time',
+    'cpu.softirq': 'CPU SoftIRQ Time',
+    'cpu.steal': 'CPU Steal Time',
+    'cpu.socket_frequency': 'Socket Median Frequency',
+    'cpu.core_usage': 'Per-Core Usage',
+    'cpu.core_iowait': 'Per-Core I/O Wait',
+    'cpu.core_steal': 'Per-Core Steal Time',
+    'memory.usage': 'Memory Usage',
+    'memory.available': 'Available Memory',
+    'memory.swap_usage': 'Swap Usage',
+    'thermal.temperature': 'Temperature',
+    'hwmon.temperature': 'Sensor Temperature',
+    'hwmon.fan': 'Fan Speed',
+    'hwmon.voltage': 'Voltage',
+    'hwmon.power': 'Power',
+    'hwmon.current': 'Current',
+    'power.rapl': 'RAPL Power',
+    'power.energy_joules_total': 'RAPL Energy Consumed (J)',
+    'cpu.frequency': 'CPU Frequency',
+    'disk.read_iops': 'Disk Read IOPS',
+    'disk.write_iops': 'Disk Write IOPS',
+    'disk.read_bytes': 'Disk Read Throughput',
+    'disk.write_bytes': 'Disk Write Throughput',
+    'disk.await_ms': 'Disk Average Await',
+    'disk.utilization': 'Disk Utilization',
+    'disk.queue_depth': 'Disk Queue Depth',
+    'network.rx_bytes': 'RX Throughput',
+    'network.tx_bytes': 'TX Throughput',
+    'network.rx_packets': 'RX Packets',
+    'network.tx_packets': 'TX Packets',
+    'network.rx_drops': 'RX Drops',
+    'network.tx_drops': 'TX Drops',
+    'network.rx_errors': 'RX Errors',
+    'network.tx_errors': 'TX Errors',
+    'network.utilization': 'Link Utilization',
+    'network.error_rate': 'NIC Error Rate',
+    'network.queue_inflight': 'TX Queue In-Flight',
+    'network.link': 'Link State',
+    'network.rx_bytes_total': 'Bytes Received',
+    'network.tx_bytes_total': 'Bytes Transmitted',
+    'network.rx_packets_total': 'Packets Received',
+    'network.tx_packets_total': 'Packets Transmitted',
+    'network.rx_errors_total': 'Receive Errors',
+    'network.tx_errors_total': 'Transmit Errors',
+    'network.rx_drops_total': 'Received Packets Dropped',
+    'network.tx_drops_total': 'Transmitted Packets Dropped',
+    'disk.reads_completed_total': 'Reads Completed',
+    'disk.read_bytes_total': 'Bytes Read',
+    'disk.writes_completed_total': 'Writes Completed',
+    'disk.written_bytes_total': 'Bytes Written',
+    'disk.io_time_seconds_total': 'Time Spent Doing I/O (s)',
+    'cpu.sockets': 'CPU Sockets',
+    'cpu.cores': 'Physical CPU Cores',
+    'cpu.logical_cpus': 'Logical CPUs',
+    'memory.total': 'Total Memory',
+    'memory.swap_size': 'Total Swap',
+    'build_info': 'hardware_monitor.py version',
+    'snapshot.timestamp_seconds': 'Unix time of the last metric snapshot',
+    'snapshot.duration_seconds': 'Seconds taken by the last metric snapshot',
+    'network.speed': 'Link Speed',
+    'alert.severity': 'Active alerts (1 = warning, 2 = critical)',
+    'cooling.max_temp': 'Max Temperature',
+    'os.uptime': 'Uptime',
+    'storage.root_usage': 'Root Filesystem Usage',
+    'network.errors': 'NIC Errors',
+}
+# Per-device series shown as one min/avg/max row in watch mode
+WATCH_SUMMARIZED_SAMPLES = ('cpu.core_usage', 'cpu.core_iowait', 'cpu.core_steal')
+# Per-device series hidden in watch mode while their value is zero (idle devices)
+WATCH_HIDE_IDLE_PREFIXES = ('disk.', 'network.rx_', 'network.tx_', 'network.utilization',
+                            'network.error_rate', 'network.queue_')
+
+# Alert rules: warn/crit thresholds per metric name or fnmatch pattern (see --rules)
+ALERT_RULE_FIELDS = ('metric', 'labels', 'warn', 'crit', 'below', 'hysteresis', 'for', 'rate')
+DEFAULT_ALERT_RULES = [
+    {'metric': 'cpu.usage', 'warn': 80, 'crit': 90, 'hysteresis': 5, 'for': 3},
+    {'metric': 'cpu.core_usage', 'warn': 80, 'crit': 90, 'hysteresis': 5, 'for': 3},
+    {'metric': 'memory.usage', 'warn': 80, 'crit': 90, 'hysteresis': 2},
+    {'metric': 'memory.swap_usage', 'warn': 80, 'crit': 90, 'hysteresis': 2},
+    {'metric': 'thermal.temperature', 'warn': 70, 'crit': 80, 'hysteresis': 3},
+    {'metric': 'hwmon.temperature', 'warn': 70, 'crit': 80, 'hysteresis': 3},
+    {'metric': 'cooling.max_temp', 'warn': 70, 'crit': 80, 'hysteresis': 3},
+    {'metric': 'disk.utilization', 'warn': 80, 'crit': 95, 'for': 3},
+    {'metric': 'storage.root_usage', 'warn': 80, 'crit': 90},
+    {'metric': 'network.?x_errors', 'warn': 0},
+    {'metric': 'network.error_rate', 'warn': 0},
+    # Temperature climbing faster than 2 °C/s for three samples in a row
+    {'metric': 'hwmon.temperature', 'rate': True, 'warn': 2, 'for': 3},
+]
+# Rows of non-numeric values whose presence alone is a finding
+ROW_STATUS = {
+    'Error': SEVERITY_CRITICAL,
+    'NIC Error Counters': SEVERITY_CRITICAL,
+    'Sensor Alarms': SEVERITY_CRITICAL,
+    'Temperature Status': SEVERITY_WARN,
+}
+
+# Dashboard panels and the metric name prefixes shown in each
+DASHBOARD_DEFAULT_INTERVAL = 1.0
+DASHBOARD_KEY_TIMEOUT_MS = 100
+DASHBOARD_PANELS = (
+    ('CPU', ('os.load', 'cpu.usage', 'cpu.iowait', 'cpu.steal', 'cpu.socket_frequency', 'cpu.core_usage')),
+    ('Memory', ('memory.',)),
+    ('Sensors', ('thermal.', 'hwmon.', 'power.rapl')),
+    ('Disks', ('disk.',)),
+    ('Network', ('network.',)),
+)
+DASHBOARD_PANEL_TITLES = tuple(title for title, _ in DASHBOARD_PANELS) + ('Alerts',)
+
+# Metric history
+DEFAULT_HISTORY_SLOTS = 120
+SERIES_SLOT_BYTES = 16  # one double timestamp plus one double value
+HISTORY_BLOCK_SIZE = 4096
+HISTORY_GROW_BLOCKS = 64
+HISTORY_AGGREGATES = OrderedDict([
+    ('max', lambda state: state[1]),
+    ('min', lambda state: state[0]),
+    ('avg', lambda state: state[2] / state[3]),
+    ('last', lambda state: state[4]),
+    ('count', lambda state: state[3]),
+])
+
+# Prometheus exporter
+PROMETHEUS_DEFAULT_PORT = 9105
+PROMETHEUS_REFRESH_INTERVAL = 15.0
+PROMETHEUS_PREFIX = 'hardware_monitor_'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+PROMETHEUS_UNIT_SUFFIXES = {
+    '%': '_percent', 'B': '_bytes', 'B/s': '_bytes_per_second', '°C': '_celsius',
+    'MHz': '_megahertz', 'RPM': '_rpm', 'V': '_volts', 'W': '_watts', 'A': '_amperes', 'Mb/s': '_megabits_per_second', 'ms': '_milliseconds',
+    '/s': '_per_second', 'pkt/s': '_per_second', 'state': '_up',
+}
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# External tools
+COMMAND_TIMEOUT = 5
+TOOL_SEARCH_DIRS = ['/usr/local/sbin', '/usr/sbin', '/sbin']
+
+# DMI / SMBIOS tables
+DMI_TABLE_PATH = '/sys/firmware/dmi/tables/DMI'
+DMI_TYPE_BIOS = 0
+DMI_TYPE_SYSTEM = 1
+DMI_TYPE_BASEBOARD = 2
+DMI_TYPE_CHASSIS = 3
+DMI_TYPE_PROCESSOR = 4
+DMI_TYPE_MEMORY_DEVICE = 17
+DMI_TYPE_POWER_SUPPLY = 39
+DMI_TYPE_END_OF_TABLE = 127
+DMI_TYPE_NAMES = {
+    DMI_TYPE_BIOS: 'BIOS Information',
+    DMI_TYPE_SYSTEM: 'System Information',
+    DMI_TYPE_BASEBOARD: 'Base Board Information',
+    DMI_TYPE_CHASSIS: 'Chassis Information',
+    DMI_TYPE_PROCESSOR: 'Processor Information',
+    DMI_TYPE_MEMORY_DEVICE: 'Memory Device',
+    DMI_TYPE_POWER_SUPPLY: 'System Power Supply',
+}
+DMI_MEMORY_TYPES = {
+    0x01: 'Other', 0x02: 'Unknown', 0x07: 'RAM', 0x0F: 'SDRAM', 0x12: 'DDR',
+    0x13: 'DDR2', 0x18: 'DDR3', 0x1A: 'DDR4', 0x1B: 'LPDDR', 0x1C: 'LPDDR2',
+    0x1D: 'LPDDR3', 0x1E: 'LPDDR4', 0x20: 'HBM', 0x21: 'HBM2', 0x22: 'DDR5',
+    0x23: 'LPDDR5',
+}
+DMI_MEMORY_FORM_FACTORS = {
+    0x01: 'Other', 0x02: 'Unknown', 0x03: 'SIMM', 0x09: 'DIMM', 0x0B: 'Row Of Chips',
+    0x0C: 'RIMM', 0x0D: 'SODIMM', 0x0F: 'FB-DIMM', 0x10: 'Die',
+}
+DMI_PSU_STATUSES = {1: 'Other', 2: 'Unknown', 3: 'OK', 4: 'Non-critical', 5: 'Critical'}
+DMI_CHASSIS_TYPES = {
+    1: 'Other', 2: 'Unknown', 3: 'Desktop', 4: 'Low Profile Desktop', 6: 'Mini Tower',
+    7: 'Tower', 8: 'Portable', 9: 'Laptop', 10: 'Notebook', 13: 'All In One',
+    14: 'Sub Notebook', 17: 'Main Server Chassis', 23: 'Rack Mount Chassis',
+    24: 'Sealed-case PC', 25: 'Multi-system', 28: 'Blade', 29: 'Blade Enclosure',
+    30: 'Tablet', 31: 'Convertible', 35: 'Mini PC', 36: 'Stick PC',
+}
+DMI_EMPTY_VALUES = ('Not Specified', 'Unknown', 'Not Provided', 'None', 'To Be Filled By O.E.M.',
+                    'Default string')
+DMI_SIZE_UNITS = {'bytes': 1, 'kB': 1024, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+# PCI devices
+PCI_DEVICES_PATH = '/sys/bus/pci/devices'
+PCI_IDS_PATHS = ['/usr/share/hwdata/pci.ids', '/usr/share/misc/pci.ids',
+                 '/usr/share/pci.ids', '/usr/local/share/pci.ids']
+PCI_IDS_INDEX_NAME = 'pci.ids.idx'
+PCI_CLASS_DISPLAY = 0x03
+PCI_CLASS_NETWORK = 0x02
+PCI_VENDOR_NAMES = {
+    0x8086: 'Intel Corporation', 0x10de: 'NVIDIA Corporation', 0x1002: 'Advanced Micro Devices, Inc. [AMD/ATI]',
+    0x1022: 'Advanced Micro Devices, Inc. [AMD]', 0x1af4: 'Red Hat, Inc.', 0x1234: 'QEMU',
+    0x15b3: 'Mellanox Technologies', 0x14e4: 'Broadcom Inc. and subsidiaries', 0x10ec: 'Realtek Semiconductor Co., Ltd.',
+    0x144d: 'Samsung Electronics Co Ltd', 0x1b36: 'Red Hat, Inc.', 0x15ad: 'VMware',
+}
+PCI_CLASS_NAMES = {
+    (0x00, None): 'Unclassified device', (0x01, None): 'Mass storage controller',
+    (0x01, 0x06): 'SATA controller', (0x01, 0x08): 'Non-Volatile memory controller',
+    (0x02, None): 'Network controller', (0x02, 0x00): 'Ethernet controller',
+    (0x03, None): 'Display controller', (0x03, 0x00): 'VGA compatible controller',
+    (0x03, 0x02): '3D controller', (0x04, None): 'Multimedia controller',
+    (0x05, None): 'Memory controller', (0x06, None): 'Bridge', (0x06, 0x00): 'Host bridge',
+    (0x06, 0x01): 'ISA bridge', (0x06, 0x04): 'PCI bridge', (0x07, None): 'Communication controller',
+    (0x08, None): 'Generic system peripheral', (0x09, None): 'Input device controller',
+    (0x0c, None): 'Serial bus controller', (0x0c, 0x03): 'USB controller',
+    (0x0d, None): 'Wireless controller', (0x12, None): 'Processing accelerators',
+    (0x13, None): 'Non-Essential Instrumentation', (0xff, None): 'Unassigned class',
+}
+
+# Cache
+CACHE_DIR_NAME = 'hardware_monitor'
+
+# Hardware monitoring chips: kind -> (unit, divisor of the raw sysfs value)
+HWMON_PATH = '/sys/class/hwmon'
+HWMON_SENSOR_KINDS = OrderedDict([
+    ('temp', ('°C', 1000.0)), ('fan', ('RPM', 1)), ('in', ('V', 1000.0)),
+    ('power', ('W', 1000000.0)), ('curr', ('A', 1000.0)),
+])
+HWMON_SAMPLE_NAMES = {'temp': 'hwmon.temperature', 'fan': 'hwmon.fan', 'in': 'hwmon.voltage',
+                      'power': 'hwmon.power', 'curr': 'hwmon.current'}
+HWMON_SECTION_TITLES = {'temp': 'Temperature Sensors', 'fan': 'Fans', 'in': 'Voltages',
+                        'power': 'Power Sensors', 'curr': 'Current Sensors'}
+HWMON_FILE_PATTERN = re.compile(r'^(temp|fan|in|power|curr)(\d+)_(input|average|label|max|crit|alarm|max_alarm|crit_alarm)$')
+
+# Powercap RAPL energy counters (intel-rapl:0, intel-rapl:0:1, intel-rapl-mmio:0, ...)
+POWERCAP_PATH = '/sys/class/powercap'
+RAPL_ZONE_PATTERN = re.compile(r'^[a-z-]*rapl[a-z-]*(:\d+)+$')
+
+# Inventory cache (static sources, valid for one boot)
+BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+INVENTORY_CACHE_NAME = 'inventory.json'
+INVENTORY_CACHE_VERSION = 1
+USB_DEVICES_PATH = '/sys/bus/usb/devices'
+OS_RELEASE_PATH = '/etc/os-release'
+
+# Hotplug subsystems tracked through kernel uevents: name -> sysfs listing
+HOTPLUG_SUBSYSTEMS = OrderedDict([
+    ('block', '/sys/block'), ('net', '/sys/class/net'), ('drm', '/sys/class/drm'), ('usb', USB_DEVICES_PATH),
+])
+# Report sections re-collected in watch mode after a hotplug event
+HOTPLUG_SECTIONS = {'block': 'storage', 'net': 'network', 'drm': 'graphics', 'usb': 'peripherals'}
+UEVENT_ACTIONS = ('add', 'remove', 'change', 'move', 'bind', 'unbind')
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 1
+UEVENT_BUFFER_SIZE = 16384
+UEVENT_RECEIVE_BUFFER = 1024 * 1024
+UEVENT_POLL_TIMEOUT = 0.5
+
+# Paths whose state invalidates a cached source (hotplug buses, CPU hotplug, files)
+INVENTORY_DEPENDENCIES = {
+    'dmi': (),
+    'pci': (PCI_DEVICES_PATH,),
+    'usb': (USB_DEVICES_PATH,),
+    'lsusb': (USB_DEVICES_PATH,),
+    'lsusb_tree': (USB_DEVICES_PATH,),
+    'cpu_identity': (f'{CPU_SYSFS_PATH}/online',),
+    'cpu_topology': (f'{CPU_SYSFS_PATH}/online', NODE_SYSFS_PATH),
+    'lscpu': (f'{CPU_SYSFS_PATH}/online',),
+    'os_release': (OS_RELEASE_PATH,),
+}
+
+# File reader
+PERSISTENT_FD_LIMIT = 4096
+READ_BUFFER_SIZE = 8192
+# Read errors meaning the file is gone; others (EINVAL, ENODATA) only mean no value right now
+FILE_GONE_ERRNOS = frozenset((errno.ENODEV, errno.ENOENT, errno.ENXIO, errno.EBADF))
+
+# Host tree: paths under these prefixes are read below HOST_ROOT (--root, a fixture or snapshot)
+HOST_PATH_PREFIXES = ('/proc/', '/sys/', '/etc/', '/usr/share/', '/usr/local/share/')
+HOST_ROOT = ''
+# Set of host paths touched while capturing a snapshot (None when not capturing)
+HOST_PATH_LOG = None
+
+# Host snapshots (capture subcommand)
+SNAPSHOT_VERSION = 1
+SNAPSHOT_METADATA_NAME = 'capture.json'
+SNAPSHOT_MAX_LINK_DEPTH = 40
+KERNEL_SYSCTL_PATH = '/proc/sys/kernel'
+# os.uname() field -> /proc/sys/kernel file
+KERNEL_IDENTITY_FILES = OrderedDict([
+    ('sysname', 'ostype'), ('nodename', 'hostname'), ('release', 'osrelease'),
+    ('version', 'version'), ('machine', 'arch'),
+])
+
+# Benchmark
+BENCHMARK_ITERATIONS = 20
+BENCHMARK_ROUNDS = 5
+BENCHMARK_THRESHOLD = 20.0
+BENCHMARK_MIN_DELTA_MS = 0.5
+BENCHMARK_BASELINE_VERSION = 2
+BENCHMARK_FIXTURE_CPUS = 8
+BENCHMARK_FIXTURE_DISKS = 2
+BENCHMARK_FIXTURE_NICS = 2
+
 #####################
 # UTILITY FUNCTIONS #
 #####################
 
-def clean_ansi_codes(text):
-    """Remove ANSI color codes from text for accurate length calculation."""
-    return re.sub(r'\033\[[0-9;]*m', '', str(text))
+def configure_color(enabled):
+    """Enable or disable ANSI colors for all output."""
+    global USE_COLOR
+    USE_COLOR = enabled
 
 def colorize(text, color):
-    """Apply color to text for terminal output."""
+    """Apply color to text for terminal output (plain text in no-color mode)."""
+    if not USE_COLOR:
+        return str(text)
     return f"{color}{text}{COLOR_RESET}"
 
-def read_file_safe(path):
-    """Safely read file content and return as string."""
+def configure_host_root(root):
+    """Read /proc, /sys and /etc below root instead of from the running host."""
+    global HOST_ROOT
+    HOST_ROOT = os.path.abspath(root).rstrip('/') if root else ''
+
+def configure_sample_pause(seconds):
+    """Set the delay between the two reads of one-shot rate metrics."""
+    global SAMPLE_PAUSE
+    SAMPLE_PAUSE = seconds
+
+def host_path(path):
+    """Map a host path such as /proc/cpuinfo into the configured host tree."""
+    if path.startswith(HOST_PATH_PREFIXES):
+        if HOST_PATH_LOG is not None:
+            HOST_PATH_LOG.add(path)
+        return HOST_ROOT + path
+    return path
+
+def host_glob(pattern):
+    """Glob in the host tree and return the matches as host paths."""
+    if not pattern.startswith(HOST_PATH_PREFIXES):
+        return glob.glob(pattern)
+    matches = [match[len(HOST_ROOT):] for match in glob.glob(HOST_ROOT + pattern)]
+    if HOST_PATH_LOG is not None:
+        HOST_PATH_LOG.update(matches)
+    return matches
+
+def read_host_metadata():
+    """Return the capture metadata of a snapshot host tree ({} for a live host or plain directory)."""
+    if not HOST_ROOT:
+        return {}
     try:
-        with open(path, 'r') as f:
-            return f.read().strip()
-    except Exception:
-        return None
+        with open(os.path.join(HOST_ROOT, SNAPSHOT_METADATA_NAME)) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
 
-def read_lines_safe(path):
+class MetricFileReader:
+    """Reader for /proc and /sys files that can keep hot descriptors open.
+    
+    One-shot reads open, read and close the file as usual. Persistent reads
+    keep the descriptor open and re-read it with positional reads from offset 0
+    into a reusable buffer, which makes the kernel regenerate the contents
+    without any open/close syscalls. The number of cached descriptors is capped
+    (least recently read closed first), descriptors are dropped when the file disappears
+    (hot-unplug) and all of them are closed at exit. Attributes that exist but
+    have no value at the moment (speed of a link without carrier, some hwmon
+    inputs) keep their descriptor and read as None.
+    """
+    
+    def __init__(self, max_open=PERSISTENT_FD_LIMIT, buffer_size=READ_BUFFER_SIZE):
+        self.max_open = max_open
+        self._fds = OrderedDict()
+        self._buffer = bytearray(buffer_size)
+        self._buffers = [self._buffer]
+        self._preadv = getattr(os, 'preadv', None)
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.reads = 0
+    
+    def read_once(self, path):
+        """Open, read and close a file; return its text or None."""
+        with self._lock:
+            self.opens += 1
+        try:
+            with open(host_path(path), 'r') as f:
+                return f.read()
+        except Exception:
+            return None
+    
+    def read_until(self, path, terminator):
+        """Read a file only up to the first occurrence of terminator.
+        
+        Used for large generated files such as /proc/cpuinfo where only the
+        first record is needed, so the kernel never formats the rest.
+        """
+        with self._lock:
+            self.opens += 1
+        try:
+            with open(host_path(path), 'r') as f:
+                content = ''
+                while True:
+                    chunk = f.read(READ_BUFFER_SIZE)
+                    if not chunk:
+                        return content
+                    content += chunk
+                    end = content.find(terminator)
+                    if end >= 0:
+                        return content[:end]
+        except Exception:
+            return None
+    
+    def read_binary_once(self, path):
+        """Open, read and close a binary file; return its bytes or None."""
+        with self._lock:
+            self.opens += 1
+        try:
+            with open(host_path(path), 'rb') as f:
+                return f.read()
+        except Exception:
+            return None
+    
+    def read_persistent(self, path):
+        """Re-read a file through a cached descriptor; return its text or None."""
+        with self._lock:
+            return self._read_locked(path)
+    
+    def read_batch(self, paths):
+        """Re-read several files through cached descriptors under one lock acquisition."""
+        with self._lock:
+            return [self._read_locked(path) for path in paths]
+    
+    def _read_locked(self, path):
+        fd = self._fds.get(path)
+        if fd is not None:
+            self._fds.move_to_end(path)
+            try:
+                return self._pread(fd)
+            except OSError as e:
+                if e.errno not in FILE_GONE_ERRNOS:
+                    return None
+                # The device may have been unplugged or the file replaced
+                self._close(path)
+        
+        try:
+            fd = os.open(host_path(path), os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        except OSError:
+            return None
+        self.opens += 1
+        self._fds[path] = fd
+        while len(self._fds) > self.max_open:
+            self._close(next(iter(self._fds)))
+        
+        try:
+            return self._pread(fd)
+        except OSError as e:
+            if e.errno in FILE_GONE_ERRNOS:
+                self._close(path)
+            return None
+    
+    def _pread(self, fd):
+        """Read the whole file from offset 0 with positional reads until one returns no data.
+        
+        A short read is not the end of the file: multi-record seq_files such
+        as /proc/net/dev or /proc/diskstats return at most about a page per
+        read. The buffer only grows when a read fills it.
+        """
+        self.reads += 1
+        chunks = []
+        offset = 0
+        while True:
+            if self._preadv is not None:
+                length = self._preadv(fd, self._buffers, offset)
+                data = self._buffer[:length]
+            else:
+                data = os.pread(fd, len(self._buffer), offset)
+                length = len(data)
+            if not length:
+                return b''.join(chunks).decode('utf-8', 'replace')
+            chunks.append(data)
+            offset += length
+            if length == len(self._buffer):
+                self._buffer = bytearray(len(self._buffer) * 2)
+                self._buffers = [self._buffer]
+    
+    def _close(self, path):
+        fd = self._fds.pop(path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def forget(self, prefix):
+        """Close cached descriptors for paths under prefix (e.g. a removed device)."""
+        with self._lock:
+            for path in [p for p in self._fds if p.startswith(prefix)]:
+                self._close(path)
+    
+    def close_all(self):
+        """Close every cached descriptor."""
+        with self._lock:
+            for path in list(self._fds):
+                self._close(path)
+    
+    def open_count(self):
+        """Return the number of descriptors currently kept open."""
+        with self._lock:
+            return len(self._fds)
+
+FILE_READER = MetricFileReader()
+atexit.register(FILE_READER.close_all)
+
+def read_file_safe(path, persistent=False):
+    """Safely read file content and return as string.
+    
+    With persistent=True the descriptor is kept open for cheap re-reads of
+    metric files that are sampled repeatedly.
+    """
+    content = FILE_READER.read_persistent(path) if persistent else FILE_READER.read_once(path)
+    return content.strip() if content is not None else None
+
+def read_lines_safe(path, persistent=False):
     """Safely read file lines and return as list."""
-    try:
-        with open(path, 'r') as f:
-            return [line.strip() for line in f.readlines()]
-    except Exception:
-        return []
+    content = FILE_READER.read_persistent(path) if persistent else FILE_READER.read_once(path)
+    return [line.strip() for line in content.splitlines()] if content is not None else []
 
 def bytes_to_human(bytes_value):
     """Convert bytes to human-readable format."""
@@ -101,146 +676,219 @@ def get_severity_color(severity):
     return severity_colors.get(severity, COLOR_GREEN)
 
 def truncate_text(text, max_length):
-    """Truncate text to maximum length and add ellipsis if needed."""
-    text_clean = clean_ansi_codes(str(text))
-    if len(text_clean) <= max_length:
-        return str(text)
-    return str(text)[:max_length-3] + "..."
+    """Truncate plain text to maximum length and add ellipsis if needed."""
+    text = str(text)
+    if len(text) <= max_length:
+        return text
+    return text[:max_length-3] + "..."
 
-def run_command_safe(command):
-    """Safely run a shell command and return its output if successful."""
-    try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return None
-    except Exception:
+def parse_cpu_list(cpu_list):
+    """Expand a sysfs CPU list such as '0-3,8,10-11' into integers.
+    
+    Both the range syntax of cpulist files and the space-separated syntax of
+    affected_cpus are accepted.
+    """
+    cpus = []
+    for part in (cpu_list or '').replace(' ', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = part.split('-', 1)
+                cpus.extend(range(int(start), int(end) + 1))
+            else:
+                cpus.append(int(part))
+        except ValueError:
+            continue
+    return cpus
+
+def format_cpu_list(cpus):
+    """Compress a list of CPU numbers into sysfs range syntax."""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(f"{start}-{end}" if start != end else str(start) for start, end in ranges)
+
+class ToolRegistry:
+    """Process-wide registry of external binaries and the subprocesses they spawn.
+
+    Each tool is resolved at most once per run with shutil.which, so no shell
+    is forked just to ask whether a binary exists. Commands are executed as
+    argv lists without a shell and every spawn is counted per tool.
+    """
+    
+    def __init__(self, search_dirs=None):
+        path = os.environ.get('PATH', os.defpath)
+        extra_dirs = [d for d in (search_dirs or []) if d not in path.split(os.pathsep)]
+        self.search_path = os.pathsep.join([path] + extra_dirs)
+        self._paths = {}
+        self._spawns = OrderedDict()
+        self._lock = threading.Lock()
+        self.offline = False
+    
+    def configure(self, offline=False):
+        """In offline mode no tool is found, so nothing is spawned against a fixture tree."""
+        self.offline = offline
+    
+    def which(self, name):
+        """Return the absolute path of a tool, resolving it only once."""
+        if self.offline:
+            return None
+        with self._lock:
+            if name not in self._paths:
+                self._paths[name] = shutil.which(name, path=self.search_path)
+            return self._paths[name]
+    
+    def available(self, name):
+        """Check whether a tool is installed."""
+        return self.which(name) is not None
+    
+    def run(self, argv, timeout=COMMAND_TIMEOUT):
+        """Run argv without a shell and return stripped stdout on success."""
+        executable = self.which(argv[0])
+        if executable is None:
+            return None
+        
+        with self._lock:
+            self._spawns[argv[0]] = self._spawns.get(argv[0], 0) + 1
+        
+        try:
+            result = subprocess.run([executable] + list(argv[1:]), capture_output=True,
+                                    text=True, timeout=timeout)
+            if result.returncode == 0:
+                return result.stdout.strip()
+            return None
+        except Exception:
+            return None
+    
+    def spawn_count(self):
+        """Return the total number of subprocesses spawned so far."""
+        with self._lock:
+            return sum(self._spawns.values())
+    
+    def report(self):
+        """Return (tool, path, spawns) rows for every tool looked up so far."""
+        with self._lock:
+            return [(name, path or 'not found', self._spawns.get(name, 0))
+                    for name, path in sorted(self._paths.items())]
+
+TOOLS = ToolRegistry(TOOL_SEARCH_DIRS)
+
+def tool_available(name):
+    """Check whether an external tool is installed (cached per run)."""
+    return TOOLS.available(name)
+
+def run_command_safe(argv, timeout=COMMAND_TIMEOUT):
+    """Safely run a command given as an argv list and return its output if successful."""
+    return TOOLS.run(argv, timeout)
+
+def filter_output_lines(output, pattern, ignore_case=True):
+    """Return the lines of command output containing pattern, like grep."""
+    if not output:
         return None
+    if ignore_case:
+        pattern = pattern.lower()
+        lines = [line for line in output.splitlines() if pattern in line.lower()]
+    else:
+        lines = [line for line in output.splitlines() if pattern in line]
+    return '\n'.join(lines) or None
 
 #####################
 # DISPLAY FUNCTIONS #
 #####################
 
+def emit(text):
+    """Write a fully rendered block to stdout in one write and flush it."""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def render_banner(titles, color):
+    """Render the '#' framed banner used for the main header and footer."""
+    width = 70
+    border = colorize('#' * width, color)
+    lines = [border]
+    for title in titles:
+        padding = width - 2 - len(title)
+        left_pad = padding // 2
+        lines.append(colorize('#' + ' ' * left_pad + title + ' ' * (padding - left_pad) + '#', color))
+    lines.append(border)
+    return '\n' + '\n'.join(lines) + '\n'
+
 def print_main_header():
     """Print main header with borders."""
-    title1 = "hardware_monitor.py - A Universal Linux Hardware Information Tool"
-    title2 = f"Version {VERSION}"
-    width = 70
-    border = '#' * width
-    
-    print(f"\n{COLOR_CYAN}{border}{COLOR_RESET}")
-    
-    # Calculate padding for title1
-    padding1 = width - 2 - len(title1)
-    left_pad1 = padding1 // 2
-    right_pad1 = padding1 - left_pad1
-    line1 = '#' + ' ' * left_pad1 + title1 + ' ' * right_pad1 + '#'
-    print(f"{COLOR_CYAN}{line1}{COLOR_RESET}")
-    
-    # Calculate padding for title2
-    padding2 = width - 2 - len(title2)
-    left_pad2 = padding2 // 2
-    right_pad2 = padding2 - left_pad2
-    line2 = '#' + ' ' * left_pad2 + title2 + ' ' * right_pad2 + '#'
-    print(f"{COLOR_CYAN}{line2}{COLOR_RESET}")
-    
-    print(f"{COLOR_CYAN}{border}{COLOR_RESET}")
+    emit(render_banner(["hardware_monitor.py - A Universal Linux Hardware Information Tool",
+                        f"Version {VERSION}"], COLOR_CYAN))
 
 def print_main_footer():
     """Print main footer with borders."""
-    title = "Hardware monitoring completed"
-    width = 70
-    border = '#' * width
-    
-    print(f"\n{COLOR_GREEN}{border}{COLOR_RESET}")
-    
-    # Calculate padding for title
-    padding = width - 2 - len(title)
-    left_pad = padding // 2
-    right_pad = padding - left_pad
-    line = '#' + ' ' * left_pad + title + ' ' * right_pad + '#'
-    print(f"{COLOR_GREEN}{line}{COLOR_RESET}")
-    
-    print(f"{COLOR_GREEN}{border}{COLOR_RESET}\n")
+    emit(render_banner(["Hardware monitoring completed"], COLOR_GREEN) + '\n')
+
+def render_section_header(title, color=COLOR_CYAN):
+    """Render a section header with borders."""
+    width = max(60, len(title) + 4)
+    border = colorize('+' + '-' * (width - 2) + '+', color)
+    title_line = (colorize('|', color) + colorize(f" {title.center(width - 4)} ", color + COLOR_BOLD)
+                  + colorize('|', color))
+    return f"\n{border}\n{title_line}\n{border}\n"
 
 def print_section_header(title, color=COLOR_CYAN):
     """Print formatted section header with borders."""
-    title_clean = clean_ansi_codes(title)
-    width = max(60, len(title_clean) + 4)
-    border = '+' + '-' * (width - 2) + '+'
-    
-    print(f"\n{color}{border}{COLOR_RESET}")
-    print(f"{color}|{COLOR_BOLD} {title.center(width - 4)} {COLOR_RESET}{color}|{COLOR_RESET}")
-    print(f"{color}{border}{COLOR_RESET}")
-
-def print_formatted_table(headers, data, header_color=COLOR_BLUE, 
-                         data_colors=None, max_col_width=50):
-    """Print formatted table with headers and data."""
-    if not data:
-        print(colorize("No data available", COLOR_YELLOW))
-        return
+    emit(render_section_header(title, color))
 
-    # Calculate column widths
-    col_widths = []
-    for i, header in enumerate(headers):
-        max_width = len(clean_ansi_codes(header))
-        for row in data:
-            if i < len(row):
-                cell_clean = clean_ansi_codes(str(row[i]))
-                cell_width = min(len(cell_clean), max_col_width)
-                max_width = max(max_width, cell_width)
-        col_widths.append(max_width + 2)
+def pad_center(text, width):
+    """Center plain text in width columns, with the odd space on the right."""
+    padding = width - len(text)
+    left_pad = padding // 2
+    return ' ' * left_pad + text + ' ' * (padding - left_pad)
 
-    # Create borders
-    border = '+' + '+'.join(['-' * w for w in col_widths]) + '+'
+def render_table(headers, data, header_color=COLOR_BLUE, data_colors=None, max_col_width=50):
+    """Render a table of plain-text cells, styling each cell only after padding.
     
-    # Print header
-    print(colorize(border, header_color))
-    header_row = '|'
-    for i, header in enumerate(headers):
-        header_text = str(header)
-        header_clean = clean_ansi_codes(header_text)
-        padding = col_widths[i] - len(header_clean)
-        left_pad = padding // 2
-        right_pad = padding - left_pad
-        centered_header = ' ' * left_pad + header_text + ' ' * right_pad
-        header_row += colorize(centered_header, header_color) + '|'
-    print(header_row)
-    print(colorize(border, header_color))
-
-    # Print data rows
-    for row_idx, row in enumerate(data):
-        row_str = '|'
-        for i in range(len(headers)):
+    Cells never contain escape codes, so column widths are plain len() of the
+    (truncated) text and color is applied per padded cell, or not at all in
+    no-color mode.
+    """
+    if not data:
+        return colorize("No data available", COLOR_YELLOW) + '\n'
+    
+    headers = [str(header) for header in headers]
+    rows = [[truncate_text(cell, max_col_width) for cell in row] for row in data]
+    col_widths = [max([len(header)] + [len(row[i]) for row in rows if i < len(row)]) + 2
+                  for i, header in enumerate(headers)]
+    
+    border = colorize('+' + '+'.join('-' * w for w in col_widths) + '+', header_color)
+    lines = [border,
+             '|' + ''.join(colorize(pad_center(header, w), header_color) + '|'
+                           for header, w in zip(headers, col_widths)),
+             border]
+    
+    for row_idx, row in enumerate(rows):
+        row_colors = data_colors[row_idx] if data_colors and row_idx < len(data_colors) else ()
+        cells = []
+        for i, width in enumerate(col_widths):
             if i < len(row):
-                cell = truncate_text(row[i], max_col_width)
-                cell_clean = clean_ansi_codes(cell)
-                padding = col_widths[i] - len(cell_clean)
-                left_pad = padding // 2
-                right_pad = padding - left_pad
-                
-                cell_color = (data_colors[row_idx][i] 
-                            if data_colors and row_idx < len(data_colors) 
-                            and i < len(data_colors[row_idx]) 
-                            else COLOR_WHITE)
-                
-                padded_cell = ' ' * left_pad + cell + ' ' * right_pad
-                row_str += colorize(padded_cell, cell_color) + '|'
+                cell_color = row_colors[i] if i < len(row_colors) else COLOR_WHITE
+                cells.append(colorize(pad_center(row[i], width), cell_color))
             else:
-                row_str += ' ' * col_widths[i] + '|'
-        print(row_str)
-        if row_idx < len(data) - 1:
-            print(colorize(border, header_color))
+                cells.append(' ' * width)
+        lines.append('|' + '|'.join(cells) + '|')
+        lines.append(border)
+    
+    return '\n'.join(lines) + '\n\n'
 
-    # Print closing border
-    print(colorize(border, header_color))
-    print()
+def print_formatted_table(headers, data, header_color=COLOR_BLUE, 
+                         data_colors=None, max_col_width=50):
+    """Print formatted table with headers and data."""
+    emit(render_table(headers, data, header_color, data_colors, max_col_width))
 
-def print_info_table(category_data, category_name, verbosity):
-    """Print information in table format with status."""
+def render_info_table(category_data, verbosity):
+    """Render collected information as a Metric/Value/Status table."""
     if not category_data:
-        print(colorize("No data available", COLOR_YELLOW))
-        return
+        return colorize("No data available", COLOR_YELLOW) + '\n'
     
     headers = ["Metric", "Value", "Status"]
     data = []
@@ -256,8 +904,11 @@ def print_info_table(category_data, category_name, verbosity):
             else:
                 value_str = f"{len(value)} items"
         elif isinstance(value, dict):
-            value_str = (json.dumps(value) if verbosity >= VERBOSITY_FULL 
+            value_str = (json.dumps(value, default=str) if verbosity >= VERBOSITY_FULL 
                         else f"{len(value)} keys")
+        elif isinstance(value, Metric):
+            # Rows keyed by format_sample_label() already name the labels
+            value_str = value.format() if key == format_sample_label(value) else str(value)
         else:
             value_str = str(value)
         
@@ -267,54 +918,277 @@ def print_info_table(category_data, category_name, verbosity):
         data.append([key, value_str, status])
         colors.append([COLOR_BLUE, COLOR_WHITE, status_color])
     
-    print_formatted_table(headers, data, COLOR_CYAN, colors, max_col_width=40)
+    return render_table(headers, data, COLOR_CYAN, colors, max_col_width=40)
+
+def print_info_table(category_data, category_name, verbosity):
+    """Print information in table format with status."""
+    emit(render_info_table(category_data, verbosity))
+
+SEVERITY_STATUS = {
+    SEVERITY_CRITICAL: ("CRITICAL", COLOR_RED),
+    SEVERITY_WARN: ("WARNING", COLOR_YELLOW),
+    SEVERITY_INFO: ("OK", COLOR_GREEN),
+}
 
 def determine_status(key, value):
-    """Determine status and color based on key and value."""
-    status = "OK"
-    status_color = COLOR_GREEN
-    value_lower = str(value).lower()
-    key_lower = key.lower()
-    
-    # Check for usage percentage
-    if "usage" in key_lower or "percentage" in key_lower:
-        try:
-            usage_value = float(str(value).strip('%'))
-            if usage_value > 90:
-                status, status_color = "CRITICAL", COLOR_RED
-            elif usage_value > 80:
-                status, status_color = "WARNING", COLOR_YELLOW
-        except (ValueError, AttributeError):
-            pass
-    
-    # Check for temperature
-    elif "temperature" in key_lower:
-        try:
-            temp_value = float(str(value).strip('°C'))
-            if temp_value > 80:
-                status, status_color = "CRITICAL", COLOR_RED
-            elif temp_value > 70:
-                status, status_color = "WARNING", COLOR_YELLOW
-        except (ValueError, AttributeError):
-            pass
-    
-    # Check for error indicators
-    elif ("error" in key_lower or "failed" in key_lower or 
-          "critical" in value_lower):
-        status, status_color = "CRITICAL", COLOR_RED
-    
-    elif "warning" in value_lower or "warn" in key_lower:
-        status, status_color = "WARNING", COLOR_YELLOW
-    
-    elif "unknown" in value_lower or "n/a" in value_lower:
-        status, status_color = "UNKNOWN", COLOR_YELLOW
+    """Determine status and color of a table row.
+    
+    Metrics were classified by the alert rules when they were collected;
+    other rows only get a status from ROW_STATUS or an unknown value.
+    """
+    if isinstance(value, Metric):
+        return SEVERITY_STATUS[value.severity or SEVERITY_INFO]
+    if key in ROW_STATUS:
+        return SEVERITY_STATUS[ROW_STATUS[key]]
+    if isinstance(value, str) and value.lower() in ('unknown', 'n/a'):
+        return "UNKNOWN", COLOR_YELLOW
+    return "OK", COLOR_GREEN
+
+###############
+# ALERT RULES #
+###############
+
+Alert = namedtuple('Alert', ['sample', 'previous', 'level'])
+
+def worse_severity(first, second):
+    """Return the more severe of two severity levels."""
+    return first if SEVERITY_LEVELS.index(first) >= SEVERITY_LEVELS.index(second) else second
+
+class AlertRule:
+    """A warn/crit threshold rule for one metric name or fnmatch pattern.
+    
+    A rule with hysteresis keeps an active level until the value has moved
+    back past the threshold by that margin. "for" requires that many
+    consecutive breaching samples before a level is raised, and "rate"
+    compares the per-second change of the value instead of the value itself.
+    """
+    
+    __slots__ = ('metric', 'labels', 'warn', 'crit', 'below', 'hysteresis', 'for_samples', 'rate')
+    
+    def __init__(self, spec):
+        unknown = set(spec) - set(ALERT_RULE_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown rule field(s): {', '.join(sorted(unknown))}")
+        self.metric = spec.get('metric')
+        if not isinstance(self.metric, str) or not self.metric:
+            raise ValueError("rule needs a 'metric' name or pattern")
+        self.labels = {str(k): str(v) for k, v in (spec.get('labels') or {}).items()}
+        self.warn = self._number(spec, 'warn')
+        self.crit = self._number(spec, 'crit')
+        if self.warn is None and self.crit is None:
+            raise ValueError(f"rule for '{self.metric}' needs 'warn' and/or 'crit'")
+        self.below = bool(spec.get('below', False))
+        self.hysteresis = self._number(spec, 'hysteresis') or 0.0
+        self.for_samples = max(1, int(spec.get('for', 1)))
+        self.rate = bool(spec.get('rate', False))
+    
+    def _number(self, spec, field):
+        value = spec.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"rule for '{self.metric}': '{field}' must be a number")
+        return value
+    
+    def matches(self, labels):
+        return all(str(labels.get(k)) == v for k, v in self.labels.items())
+    
+    def level(self, value, current=0):
+        """Return 0 (ok), 1 (warn) or 2 (crit) for value given the currently active level."""
+        for level, threshold in ((2, self.crit), (1, self.warn)):
+            if threshold is None:
+                continue
+            margin = self.hysteresis if level <= current else 0.0
+            if (value < threshold + margin) if self.below else (value > threshold - margin):
+                return level
+        return 0
+
+class RuleEngine:
+    """Alert rules compiled into per-metric lookups and evaluated in one pass.
+    
+    Exact metric names resolve with a dict lookup; patterns are matched once
+    per new metric name and the result is cached. Stateful evaluation keeps
+    the active level, the pending "for" count and the previous value for rate
+    rules per (rule, series).
+    """
+    
+    def __init__(self, specs=()):
+        self.configure(specs)
+    
+    def configure(self, specs):
+        """Compile a rule table, dropping all evaluation state."""
+        self.rules = [AlertRule(spec) for spec in specs]
+        self._exact = {}
+        self._patterns = []
+        for rule in self.rules:
+            if any(c in rule.metric for c in '*?['):
+                self._patterns.append(rule)
+            else:
+                self._exact.setdefault(rule.metric, []).append(rule)
+        self._compiled = {}
+        self._state = {}
+        self.firing = {}
+    
+    def rules_for(self, name):
+        """Return the rules that apply to a metric name."""
+        rules = self._compiled.get(name)
+        if rules is None:
+            rules = tuple(self._exact.get(name, ())) + tuple(
+                rule for rule in self._patterns if fnmatch.fnmatchcase(name, rule.metric))
+            self._compiled[name] = rules
+        return rules
+    
+    def classify(self, name, labels, value):
+        """Return the severity of a single reading, for one-shot reports.
+        
+        Without earlier samples, "for" and hysteresis do not apply and rate
+        rules are skipped.
+        """
+        level = 0
+        for rule in self.rules_for(name):
+            if not rule.rate and rule.matches(labels):
+                level = max(level, rule.level(value))
+        return SEVERITY_LEVELS[level]
+    
+    def evaluate(self, samples, timestamp=None):
+        """Evaluate a batch of samples and return the Alerts whose level changed.
+        
+        The batch is the complete set of current series: firing series that
+        are absent from it (a removed interface or disk) are resolved and the
+        state of every absent series is dropped.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        rules_for = self.rules_for
+        state = self._state
+        firing = self.firing
+        changes = []
+        seen = set()
+        for sample in samples:
+            rules = rules_for(sample.name)
+            if not rules:
+                continue
+            key = (sample.name, tuple(sample.labels.items()) if sample.labels else ())
+            seen.add(key)
+            worst = 0
+            for rule in rules:
+                if rule.labels and not rule.matches(sample.labels):
+                    continue
+                # [active level, pending level, pending count, previous value, previous time]
+                entry = state.get((id(rule), key))
+                if entry is None:
+                    entry = state[(id(rule), key)] = [0, 0, 0, None, None]
+                value = sample.value
+                if rule.rate:
+                    previous, previous_time = entry[3], entry[4]
+                    entry[3], entry[4] = value, timestamp
+                    if previous_time is None or timestamp <= previous_time:
+                        continue
+                    value = (value - previous) / (timestamp - previous_time)
+                level = rule.level(value, entry[0])
+                if level > entry[0] and rule.for_samples > 1:
+                    entry[2] = entry[2] + 1 if entry[1] == level else 1
+                    entry[1] = level
+                    if entry[2] < rule.for_samples:
+                        level = entry[0]
+                else:
+                    entry[1] = entry[2] = 0
+                entry[0] = level
+                if level > worst:
+                    worst = level
+            active = firing.get(key)
+            previous_level = active[0] if active else 0
+            if worst:
+                firing[key] = (worst, sample)
+            elif active:
+                del firing[key]
+            if worst != previous_level:
+                changes.append(Alert(sample, previous_level, worst))
+        
+        for key in [key for key in firing if key not in seen]:
+            level, sample = firing.pop(key)
+            changes.append(Alert(sample, level, 0))
+        for entry in [entry for entry in state if entry[1] not in seen]:
+            del state[entry]
+        return changes
+    
+    def severity(self, name, labels):
+        """Return the evaluated severity of a series."""
+        active = self.firing.get((name, tuple(labels.items()) if labels else ()))
+        return SEVERITY_LEVELS[active[0]] if active else SEVERITY_INFO
+    
+    def alert_samples(self):
+        """Return one sample per firing series (1 = warning, 2 = critical)."""
+        return [Sample('alert.severity', OrderedDict([('metric', name)] + list(labels)), level, '')
+                for (name, labels), (level, _) in self.firing.items()]
+
+def load_alert_rules(path):
+    """Load a JSON rule file: a list of rules or {"rules": [...]}.
     
-    return status, status_color
+    Rules replace the default rules for the same metric name or pattern;
+    defaults for other metrics are kept. Raises ValueError when the file is
+    unreadable or invalid.
+    """
+    try:
+        with open(path) as f:
+            content = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read rule file {path}: {e}")
+    rules = content.get('rules') if isinstance(content, dict) else content
+    if not isinstance(rules, list) or not all(isinstance(rule, dict) for rule in rules):
+        raise ValueError(f"rule file {path} must contain a list of rule objects")
+    overridden = {rule.get('metric') for rule in rules}
+    specs = [rule for rule in DEFAULT_ALERT_RULES if rule['metric'] not in overridden] + rules
+    RuleEngine(specs)  # validate before replacing the active rules
+    return specs
+
+ALERT_RULES = RuleEngine(DEFAULT_ALERT_RULES)
 
 ########################
 # HARDWARE INFORMATION #
 ########################
 
+class Metric:
+    """A numeric reading kept raw until it is rendered or exported.
+    
+    Collectors store Metrics in HardwareInfo.data instead of preformatted
+    strings: the table renderer formats the value with its unit, status
+    checks compare the number directly, and exports carry the raw number and
+    unit. The name uses the same dotted scheme as the dynamic samples.
+    """
+    
+    __slots__ = ('name', 'value', 'unit', 'labels', 'severity')
+    
+    def __init__(self, name, value, unit='', labels=None, severity=None):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.labels = labels or {}
+        self.severity = severity
+    
+    @classmethod
+    def from_sample(cls, sample):
+        return cls(sample.name, sample.value, sample.unit, sample.labels)
+    
+    def format(self):
+        """Return the value formatted with its unit."""
+        return format_sample_value(self.value, self.unit)
+    
+    def __str__(self):
+        if self.labels:
+            return f"{' '.join(str(v) for v in self.labels.values())}: {self.format()}"
+        return self.format()
+    
+    def __repr__(self):
+        return f"Metric({self.name!r}, {self.value!r}, {self.unit!r})"
+    
+    def to_export(self):
+        """Return the raw value, unit and labels for JSON/CSV exports."""
+        exported = OrderedDict([('value', self.value), ('unit', self.unit)])
+        if self.labels:
+            exported['labels'] = dict(self.labels)
+        if self.severity:
+            exported['severity'] = self.severity
+        return exported
+
 class HardwareInfo:
     """Base class for hardware information storage."""
     
@@ -322,6 +1196,16 @@ class HardwareInfo:
         self.data = OrderedDict()
         self.severity = SEVERITY_INFO
     
+    def apply_rules(self, rules):
+        """Classify every Metric with the alert rules and raise the section severity to match."""
+        for value in self.data.values():
+            for metric in (value if isinstance(value, list) else (value,)):
+                if isinstance(metric, Metric) and metric.severity is None:
+                    severity = rules.classify(metric.name, metric.labels, metric.value)
+                    if severity != SEVERITY_INFO:
+                        metric.severity = severity
+                        self.severity = worse_severity(self.severity, severity)
+    
     def to_dict(self):
         """Convert to dictionary for export."""
         return {
@@ -330,16 +1214,1267 @@ class HardwareInfo:
             'data': self.data
         }
 
+#######################
+# SHARED DATA SOURCES #
+#######################
+
+class SharedSource:
+    """Lazily loaded value shared by every collector during a run.
+    
+    The loader runs at most once, even when several collectors ask for the
+    value concurrently from the collection thread pool. Sources given a
+    cache_name are looked up in the boot-scoped inventory cache first; encode
+    and decode convert the value to and from JSON-compatible data.
+    """
+    
+    instances = []
+    
+    def __init__(self, loader, cache_name=None, encode=None, decode=None):
+        self._loader = loader
+        self._cache_name = cache_name
+        self._encode = encode
+        self._decode = decode
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+        SharedSource.instances.append(self)
+    
+    def get(self):
+        """Return the shared value, loading it on first use."""
+        with self._lock:
+            if not self._loaded:
+                if self._cache_name:
+                    self._value = INVENTORY_CACHE.get(self._cache_name, self._loader,
+                                                      self._encode, self._decode)
+                else:
+                    self._value = self._loader()
+                self._loaded = True
+            return self._value
+    
+    def reset(self):
+        """Drop the cached value so the next get() reloads it."""
+        with self._lock:
+            self._loaded = False
+            self._value = None
+    
+    @classmethod
+    def reset_all(cls):
+        """Reset every shared source, as if the process had just started."""
+        for source in cls.instances:
+            source.reset()
+
+def get_cache_dir():
+    """Return the per-user cache directory used for on-disk indexes and caches."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, CACHE_DIR_NAME)
+
+class InventoryCache:
+    """Boot-scoped on-disk cache of static inventory sources.
+    
+    Entries live in one JSON file in the cache directory and are only valid
+    for the boot that wrote them (kernel boot_id). Each entry additionally
+    stores a fingerprint of the sysfs paths its source depends on (directory
+    listings for hotplug buses, file contents otherwise), so a hotplugged USB
+    device only invalidates the USB inventory and not the DMI table.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.enabled = True
+        self.refresh = False
+        self.status = OrderedDict()
+        self._lock = threading.Lock()
+        self._boot_id = None
+        self._entries = None
+        self._dirty = False
+    
+    def configure(self, enabled=True, refresh=False):
+        self.enabled = enabled
+        self.refresh = refresh
+    
+    def _load(self):
+        """Read the cache file, discarding it when it belongs to another boot."""
+        self._boot_id = read_file_safe(BOOT_ID_PATH)
+        self._entries = {}
+        if not self._boot_id or self.refresh:
+            return
+        try:
+            with open(self.path) as f:
+                content = json.load(f, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError):
+            return
+        if (isinstance(content, dict) and content.get('version') == INVENTORY_CACHE_VERSION
+                and content.get('boot_id') == self._boot_id):
+            self._entries = content.get('entries') or {}
+    
+    @staticmethod
+    def fingerprint(paths):
+        """Summarise the current state of the paths an entry depends on."""
+        digest = hashlib.sha1()
+        for path in paths:
+            if os.path.isdir(host_path(path)):
+                state = '\n'.join(sorted(os.listdir(host_path(path))))
+            elif path.startswith(('/sys/', '/proc/')):
+                state = read_file_safe(path) or ''
+            else:
+                try:
+                    stat = os.stat(host_path(path))
+                    state = f'{stat.st_mtime_ns}:{stat.st_size}'
+                except OSError:
+                    state = ''
+            digest.update(f'{path}\0{state}\0'.encode('utf-8', 'replace'))
+        return digest.hexdigest()
+    
+    def get(self, name, loader, encode=None, decode=None):
+        """Return a cached source value, or load it and remember the result."""
+        if not self.enabled:
+            self.status[name] = 'disabled'
+            return loader()
+        
+        with self._lock:
+            if self._entries is None:
+                self._load()
+        fingerprint = self.fingerprint(INVENTORY_DEPENDENCIES.get(name, ()))
+        entry = self._entries.get(name)
+        # Empty entries written by earlier versions are reloaded as well
+        if entry is not None and entry.get('fingerprint') == fingerprint and self.cacheable(entry.get('value')):
+            try:
+                value = decode(entry['value']) if decode else entry['value']
+                self.status[name] = 'hit'
+                return value
+            except (KeyError, TypeError, ValueError):
+                pass
+        
+        value = loader()
+        if not self.cacheable(value):
+            # A failed or timed-out command or a read without root: retry on the next run
+            self.status[name] = 'empty'
+            return value
+        if self._boot_id:
+            with self._lock:
+                self._entries[name] = {'fingerprint': fingerprint,
+                                       'value': encode(value) if encode else value}
+                self._dirty = True
+        self.status[name] = 'miss'
+        return value
+    
+    @staticmethod
+    def cacheable(value):
+        """Only non-empty results are cached; None and empty strings or collections are not."""
+        if value is None:
+            return False
+        return not isinstance(value, (str, bytes, list, tuple, dict)) or len(value) > 0
+    
+    def save(self):
+        """Write the cache file atomically if any entry changed."""
+        with self._lock:
+            if not self._dirty or not self.enabled:
+                return
+            self._dirty = False
+            content = {'version': INVENTORY_CACHE_VERSION, 'boot_id': self._boot_id,
+                       'entries': self._entries}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(content, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def report(self):
+        """Return (name, status) for every source looked up during this run."""
+        return list(self.status.items())
+
+INVENTORY_CACHE = InventoryCache(os.path.join(get_cache_dir(), INVENTORY_CACHE_NAME))
+atexit.register(INVENTORY_CACHE.save)
+
+def run_command_cached(name, argv, timeout=COMMAND_TIMEOUT):
+    """Run a command whose output only changes across boots or hotplug, via the inventory cache."""
+    return INVENTORY_CACHE.get(name, lambda: run_command_safe(argv, timeout))
+
+class DmiRecord:
+    """A single SMBIOS structure with typed fields named after dmidecode's labels."""
+    
+    __slots__ = ('type', 'handle', 'name', 'fields')
+    
+    def __init__(self, dmi_type, handle, name, fields=None):
+        self.type = dmi_type
+        self.handle = handle
+        self.name = name
+        self.fields = fields if fields is not None else OrderedDict()
+    
+    def get(self, key, default=None):
+        """Return a field value, treating missing and empty values alike."""
+        value = self.fields.get(key)
+        return default if value in (None, '') else value
+    
+    def to_dict(self):
+        """Convert to dictionary for export."""
+        return {'type': self.type, 'handle': self.handle, 'name': self.name,
+                'fields': dict(self.fields)}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record from to_dict() output."""
+        return cls(data['type'], data['handle'], data['name'], OrderedDict(data['fields']))
+
+def dmi_string(strings, index):
+    """Resolve a 1-based SMBIOS string reference."""
+    if index == 0 or index > len(strings):
+        return None
+    return strings[index - 1].strip() or None
+
+def decode_dmi_structure(dmi_type, formatted, strings):
+    """Decode the formatted area of the SMBIOS types used by the collectors."""
+    length = len(formatted)
+    fields = OrderedDict()
+    
+    def byte(offset):
+        return formatted[offset] if offset < length else None
+    
+    def word(offset):
+        return struct.unpack_from('<H', formatted, offset)[0] if offset + 2 <= length else None
+    
+    def dword(offset):
+        return struct.unpack_from('<I', formatted, offset)[0] if offset + 4 <= length else None
+    
+    def string(offset):
+        return dmi_string(strings, formatted[offset]) if offset < length else None
+    
+    if dmi_type == DMI_TYPE_BIOS:
+        fields['Vendor'] = string(0x04)
+        fields['Version'] = string(0x05)
+        fields['Release Date'] = string(0x08)
+        rom_size = byte(0x09)
+        if rom_size is not None:
+            fields['ROM Size'] = (rom_size + 1) * 64 * 1024
+        if byte(0x14) is not None and byte(0x14) != 0xFF:
+            fields['BIOS Revision'] = f"{byte(0x14)}.{byte(0x15)}"
+        if byte(0x16) is not None and byte(0x16) != 0xFF:
+            fields['Firmware Revision'] = f"{byte(0x16)}.{byte(0x17)}"
+    
+    elif dmi_type == DMI_TYPE_SYSTEM:
+        fields['Manufacturer'] = string(0x04)
+        fields['Product Name'] = string(0x05)
+        fields['Version'] = string(0x06)
+        fields['Serial Number'] = string(0x07)
+        if length >= 0x18:
+            raw = formatted[0x08:0x18]
+            if raw not in (b'\x00' * 16, b'\xff' * 16):
+                # The first three UUID fields are stored little-endian since SMBIOS 2.6
+                fields['UUID'] = str(uuid.UUID(bytes_le=bytes(raw))).upper()
+        fields['SKU Number'] = string(0x19)
+        fields['Family'] = string(0x1A)
+    
+    elif dmi_type == DMI_TYPE_BASEBOARD:
+        fields['Manufacturer'] = string(0x04)
+        fields['Product Name'] = string(0x05)
+        fields['Version'] = string(0x06)
+        fields['Serial Number'] = string(0x07)
+        fields['Asset Tag'] = string(0x08)
+    
+    elif dmi_type == DMI_TYPE_CHASSIS:
+        fields['Manufacturer'] = string(0x04)
+        chassis_type = byte(0x05)
+        if chassis_type is not None:
+            fields['Type'] = DMI_CHASSIS_TYPES.get(chassis_type & 0x7F, 'Unknown')
+        fields['Version'] = string(0x06)
+        fields['Serial Number'] = string(0x07)
+        fields['Asset Tag'] = string(0x08)
+    
+    elif dmi_type == DMI_TYPE_PROCESSOR:
+        fields['Socket Designation'] = string(0x04)
+        fields['Manufacturer'] = string(0x07)
+        fields['Version'] = string(0x10)
+        fields['External Clock'] = word(0x12) or None
+        fields['Max Speed'] = word(0x14) or None
+        fields['Current Speed'] = word(0x16) or None
+        status = byte(0x18)
+        if status is not None:
+            populated = "Populated" if status & 0x40 else "Unpopulated"
+            enabled = "Enabled" if status & 0x07 == 1 else "Disabled"
+            fields['Status'] = f"{populated}, {enabled}" if status & 0x40 else populated
+        core_count = byte(0x23)
+        if core_count == 0xFF and word(0x2A) is not None:
+            core_count = word(0x2A)
+        core_enabled = byte(0x24)
+        if core_enabled == 0xFF and word(0x2C) is not None:
+            core_enabled = word(0x2C)
+        thread_count = byte(0x25)
+        if thread_count == 0xFF and word(0x2E) is not None:
+            thread_count = word(0x2E)
+        fields['Core Count'] = core_count or None
+        fields['Core Enabled'] = core_enabled or None
+        fields['Thread Count'] = thread_count or None
+    
+    elif dmi_type == DMI_TYPE_MEMORY_DEVICE:
+        size = word(0x0C)
+        if size == 0x7FFF and dword(0x1C) is not None:
+            fields['Size'] = (dword(0x1C) & 0x7FFFFFFF) * 1024 * 1024
+        elif size == 0xFFFF or size is None:
+            fields['Size'] = None
+        elif size & 0x8000:
+            fields['Size'] = (size & 0x7FFF) * 1024
+        else:
+            fields['Size'] = size * 1024 * 1024
+        fields['Form Factor'] = DMI_MEMORY_FORM_FACTORS.get(byte(0x0E))
+        fields['Locator'] = string(0x10)
+        fields['Bank Locator'] = string(0x11)
+        fields['Type'] = DMI_MEMORY_TYPES.get(byte(0x12))
+        speed = word(0x15)
+        if speed == 0xFFFF and dword(0x54) is not None:
+            speed = dword(0x54)
+        fields['Speed'] = speed or None
+        fields['Manufacturer'] = string(0x17)
+        fields['Serial Number'] = string(0x18)
+        fields['Asset Tag'] = string(0x19)
+        fields['Part Number'] = string(0x1A)
+        attributes = byte(0x1B)
+        fields['Rank'] = attributes & 0x0F if attributes else None
+        configured_speed = word(0x20)
+        if configured_speed == 0xFFFF and dword(0x58) is not None:
+            configured_speed = dword(0x58)
+        fields['Configured Memory Speed'] = configured_speed or None
+    
+    elif dmi_type == DMI_TYPE_POWER_SUPPLY:
+        fields['Location'] = string(0x05)
+        fields['Name'] = string(0x06)
+        fields['Manufacturer'] = string(0x07)
+        fields['Serial Number'] = string(0x08)
+        fields['Asset Tag'] = string(0x09)
+        fields['Model Part Number'] = string(0x0A)
+        fields['Revision'] = string(0x0B)
+        capacity = word(0x0C)
+        fields['Max Power Capacity'] = capacity if capacity not in (None, 0x8000) else None
+        characteristics = word(0x0E)
+        if characteristics is not None:
+            fields['Hot Replaceable'] = "Yes" if characteristics & 0x01 else "No"
+            fields['Status'] = ("Present, " if characteristics & 0x02 else "Not Present, ") + \
+                DMI_PSU_STATUSES.get((characteristics >> 7) & 0x07, "Unknown")
+            fields['Plugged'] = "No" if characteristics & 0x04 else "Yes"
+    
+    return fields
+
+def parse_dmi_table(table):
+    """Parse a raw SMBIOS structure table into DmiRecord objects."""
+    records = []
+    offset = 0
+    table_length = len(table)
+    
+    while offset + 4 <= table_length:
+        dmi_type, length, handle = struct.unpack_from('<BBH', table, offset)
+        if length < 4 or offset + length > table_length:
+            break
+        formatted = table[offset:offset + length]
+        
+        # The string set follows the formatted area and ends with a double NUL
+        end = table.find(b'\x00\x00', offset + length)
+        if end < 0:
+            break
+        raw_strings = table[offset + length:end]
+        strings = [s.decode('ascii', 'replace') for s in raw_strings.split(b'\x00')] if raw_strings else []
+        
+        if dmi_type in DMI_TYPE_NAMES:
+            fields = decode_dmi_structure(dmi_type, formatted, strings)
+            records.append(DmiRecord(dmi_type, handle, DMI_TYPE_NAMES[dmi_type], fields))
+        
+        if dmi_type == DMI_TYPE_END_OF_TABLE:
+            break
+        offset = end + 2
+    
+    return records
+
+def parse_dmi_value(key, value):
+    """Convert a dmidecode text value to the typed value used by DmiRecord."""
+    if value in DMI_EMPTY_VALUES or value.startswith('No Module Installed'):
+        return None
+    
+    unit_match = re.match(r'^(\d+(?:\.\d+)?)\s*(bytes|kB|KB|MB|GB|TB|MT/s|MHz|W)$', value)
+    if unit_match:
+        number, unit = float(unit_match.group(1)), unit_match.group(2)
+        if unit in DMI_SIZE_UNITS:
+            return int(number * DMI_SIZE_UNITS[unit])
+        return int(number)
+    
+    if key in ('Core Count', 'Core Enabled', 'Thread Count', 'Rank') and value.isdigit():
+        return int(value)
+    return value
+
+def parse_dmidecode_output(output):
+    """Parse dmidecode text output into DmiRecord objects."""
+    records = []
+    record = None
+    list_key = None
+    expect_name = False
+    
+    for line in output.splitlines():
+        handle_match = re.match(r'^Handle (0x[0-9A-Fa-f]+), DMI type (\d+)', line)
+        if handle_match:
+            record = DmiRecord(int(handle_match.group(2)), int(handle_match.group(1), 16), None)
+            records.append(record)
+            list_key = None
+            expect_name = True
+            continue
+        
+        if record is None or not line.strip():
+            continue
+        
+        if expect_name:
+            record.name = line.strip()
+            expect_name = False
+        elif line.startswith('\t\t') and list_key:
+            record.fields[list_key].append(line.strip())
+        elif line.startswith('\t') and ':' in line:
+            key, value = line.strip().split(':', 1)
+            value = value.strip()
+            if value:
+                record.fields[key] = parse_dmi_value(key, value)
+                list_key = None
+            else:
+                record.fields[key] = []
+                list_key = key
+    
+    return [r for r in records if r.type in DMI_TYPE_NAMES]
+
+def load_dmi_records():
+    """Read the SMBIOS table once, natively if possible, otherwise via a single dmidecode run."""
+    table = FILE_READER.read_binary_once(DMI_TABLE_PATH)
+    if table:
+        records = parse_dmi_table(table)
+        if records:
+            return records
+    
+    dmi_types = ','.join(str(t) for t in sorted(DMI_TYPE_NAMES) if t != DMI_TYPE_END_OF_TABLE)
+    output = run_command_safe(['dmidecode', '-t', dmi_types])
+    return parse_dmidecode_output(output) if output else []
+
+DMI_RECORDS = SharedSource(load_dmi_records, 'dmi',
+                           lambda records: [r.to_dict() for r in records],
+                           lambda data: [DmiRecord.from_dict(d) for d in data])
+
+def get_dmi_records(dmi_type):
+    """Return the shared DMI records of the given SMBIOS type."""
+    return [record for record in DMI_RECORDS.get() if record.type == dmi_type]
+
+def find_pci_ids_file():
+    """Locate the system pci.ids database, if installed."""
+    for path in PCI_IDS_PATHS:
+        if os.path.isfile(host_path(path)):
+            return path
+    return None
+
+class PciIdsIndex:
+    """Name lookups in pci.ids through a sorted on-disk index.
+    
+    The index is a header followed by fixed-width (key, offset) records sorted
+    by key, where offset points at the name inside pci.ids. It is built once
+    per pci.ids version and then memory-mapped, so a lookup is a binary search
+    plus a single line read instead of a full parse of the database.
+    """
+    
+    HEADER = struct.Struct('<8sQQI')
+    RECORD = struct.Struct('<QI')
+    MAGIC = b'HWPCIIDX'
+    
+    def __init__(self, ids_path, index_path):
+        self.ids_path = ids_path
+        self.index_path = index_path
+        self._ids = None
+        self._index = None
+        self._count = 0
+    
+    @staticmethod
+    def vendor_key(vendor):
+        return vendor << 20
+    
+    @staticmethod
+    def device_key(vendor, device):
+        return (vendor << 20) | (device + 1)
+    
+    @staticmethod
+    def class_key(base_class, subclass=None):
+        key = (1 << 40) | (base_class << 20)
+        return key if subclass is None else key | (subclass + 1)
+    
+    def open(self):
+        """Map pci.ids and its index, rebuilding the index when stale."""
+        try:
+            stat = os.stat(host_path(self.ids_path))
+            with open(host_path(self.ids_path), 'rb') as f:
+                self._ids = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        
+        self._index = self._load_index(stat)
+        if self._index is None:
+            index_data = self._build_index(stat)
+            self._index = self._store_index(index_data) or index_data
+        self._count = (len(self._index) - self.HEADER.size) // self.RECORD.size
+        return True
+    
+    def _load_index(self, stat):
+        """Map an existing index file if it matches the current pci.ids."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        
+        if len(index) >= self.HEADER.size:
+            magic, mtime_ns, size, _ = self.HEADER.unpack_from(index, 0)
+            if magic == self.MAGIC and mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                return index
+        index.close()
+        return None
+    
+    def _build_index(self, stat):
+        """Scan pci.ids once and return the serialized index."""
+        records = []
+        base_class = vendor = None
+        in_classes = False
+        offset = 0
+        
+        for line in self._ids[:].split(b'\n'):
+            line_offset = offset
+            offset += len(line) + 1
+            if not line or line.startswith(b'#'):
+                continue
+            
+            if line.startswith(b'C '):
+                in_classes = True
+                base_class = int(line[2:4], 16)
+                records.append((self.class_key(base_class), line_offset + 6))
+            elif in_classes:
+                if line.startswith(b'\t') and not line.startswith(b'\t\t') and base_class is not None:
+                    records.append((self.class_key(base_class, int(line[1:3], 16)), line_offset + 5))
+            elif not line.startswith(b'\t'):
+                try:
+                    vendor = int(line[:4], 16)
+                except ValueError:
+                    vendor = None
+                    continue
+                records.append((self.vendor_key(vendor), line_offset + 6))
+            elif not line.startswith(b'\t\t') and vendor is not None:
+                try:
+                    records.append((self.device_key(vendor, int(line[1:5], 16)), line_offset + 7))
+                except ValueError:
+                    continue
+        
+        records.sort()
+        data = bytearray(self.HEADER.pack(self.MAGIC, stat.st_mtime_ns, stat.st_size, len(records)))
+        for key, name_offset in records:
+            data += self.RECORD.pack(key, name_offset)
+        return bytes(data)
+    
+    def _store_index(self, data):
+        """Atomically write the index to the cache directory and map it."""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+            with open(self.index_path, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    
+    def lookup(self, key):
+        """Binary search the index and return the name for key, or None."""
+        if not self._count:
+            return None
+        
+        low, high = 0, self._count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            entry_key, name_offset = self.RECORD.unpack_from(
+                self._index, self.HEADER.size + middle * self.RECORD.size)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle - 1
+            else:
+                end = self._ids.find(b'\n', name_offset)
+                return self._ids[name_offset:end if end >= 0 else len(self._ids)].decode('utf-8', 'replace').strip()
+        return None
+    
+    def vendor_name(self, vendor):
+        return self.lookup(self.vendor_key(vendor))
+    
+    def device_name(self, vendor, device):
+        return self.lookup(self.device_key(vendor, device))
+    
+    def class_name(self, base_class, subclass):
+        return self.lookup(self.class_key(base_class, subclass)) or self.lookup(self.class_key(base_class))
+
+def open_pci_ids_index():
+    """Open the pci.ids index, or return None when pci.ids is not installed."""
+    ids_path = find_pci_ids_file()
+    if ids_path is None:
+        return None
+    index = PciIdsIndex(ids_path, os.path.join(get_cache_dir(), PCI_IDS_INDEX_NAME))
+    return index if index.open() else None
+
+PCI_IDS = SharedSource(open_pci_ids_index)
+
+class PciDevice:
+    """A PCI function as described by its /sys/bus/pci/devices entry."""
+    
+    __slots__ = ('address', 'vendor_id', 'device_id', 'class_code', 'revision',
+                 'subsystem_vendor_id', 'subsystem_device_id', 'driver', 'numa_node',
+                 'link_speed', 'link_width', 'max_link_speed', 'max_link_width',
+                 'vendor_name', 'device_name', 'class_name')
+    
+    def __init__(self, address):
+        for attr in self.__slots__:
+            setattr(self, attr, None)
+        self.address = address
+    
+    @property
+    def base_class(self):
+        return (self.class_code or 0) >> 16
+    
+    @property
+    def subclass(self):
+        return ((self.class_code or 0) >> 8) & 0xFF
+    
+    def describe(self):
+        """Return an lspci-style one-line description."""
+        vendor = self.vendor_name or f"Vendor {self.vendor_id:04x}"
+        device = self.device_name or f"Device {self.device_id:04x}"
+        return f"{self.address} {self.class_name}: {vendor} {device}"
+    
+    def link_status(self):
+        """Return the negotiated PCIe link, with the maximum when it differs."""
+        if not self.link_speed or not self.link_width:
+            return None
+        link = f"{self.link_speed} x{self.link_width}"
+        if self.is_link_downgraded():
+            link += f" (max {self.max_link_speed} x{self.max_link_width})"
+        return link
+    
+    def is_link_downgraded(self):
+        """Check whether the link trained below its maximum speed or width."""
+        if not (self.link_speed and self.max_link_speed and self.link_width and self.max_link_width):
+            return False
+        return ((self.link_speed, self.link_width) != (self.max_link_speed, self.max_link_width)
+                and parse_link_speed(self.link_speed) <= parse_link_speed(self.max_link_speed))
+    
+    def to_dict(self):
+        """Convert to dictionary for export."""
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a device from to_dict() output."""
+        device = cls(data['address'])
+        for attr in cls.__slots__:
+            setattr(device, attr, data.get(attr))
+        return device
+
+def parse_link_speed(speed):
+    """Extract the GT/s value of a sysfs PCIe link speed string."""
+    match = re.match(r'^([\d.]+)', speed or '')
+    return float(match.group(1)) if match else 0.0
+
+def parse_hex_safe(value):
+    """Parse a 0x-prefixed sysfs hex attribute."""
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return None
+
+def parse_pci_device(address, pci_path, ids_index):
+    """Read a single PCI function from sysfs and resolve its names."""
+    device_path = os.path.join(pci_path, address)
+    device = PciDevice(address)
+    
+    device.vendor_id = parse_hex_safe(read_file_safe(f'{device_path}/vendor'))
+    device.device_id = parse_hex_safe(read_file_safe(f'{device_path}/device'))
+    device.class_code = parse_hex_safe(read_file_safe(f'{device_path}/class'))
+    device.revision = parse_hex_safe(read_file_safe(f'{device_path}/revision'))
+    device.subsystem_vendor_id = parse_hex_safe(read_file_safe(f'{device_path}/subsystem_vendor'))
+    device.subsystem_device_id = parse_hex_safe(read_file_safe(f'{device_path}/subsystem_device'))
+    if device.vendor_id is None or device.device_id is None:
+        return None
+    
+    driver_path = f'{device_path}/driver'
+    if os.path.islink(host_path(driver_path)):
+        device.driver = os.path.basename(os.readlink(host_path(driver_path)))
+    
+    numa_node = read_file_safe(f'{device_path}/numa_node')
+    if numa_node and numa_node.lstrip('-').isdigit() and int(numa_node) >= 0:
+        device.numa_node = int(numa_node)
+    
+    read_pci_link_state(device, device_path)
+    
+    if ids_index is not None:
+        device.vendor_name = ids_index.vendor_name(device.vendor_id)
+        device.device_name = ids_index.device_name(device.vendor_id, device.device_id)
+        device.class_name = ids_index.class_name(device.base_class, device.subclass)
+    device.vendor_name = device.vendor_name or PCI_VENDOR_NAMES.get(device.vendor_id)
+    device.class_name = (device.class_name
+                         or PCI_CLASS_NAMES.get((device.base_class, device.subclass))
+                         or PCI_CLASS_NAMES.get((device.base_class, None))
+                         or f"Class {device.base_class:02x}{device.subclass:02x}")
+    
+    return device
+
+def read_pci_link_state(device, device_path):
+    """Read the negotiated and maximum PCIe link of a device."""
+    device.link_speed = read_file_safe(f'{device_path}/current_link_speed')
+    device.link_width = read_file_safe(f'{device_path}/current_link_width')
+    device.max_link_speed = read_file_safe(f'{device_path}/max_link_speed')
+    device.max_link_width = read_file_safe(f'{device_path}/max_link_width')
+    if device.link_width == '0':
+        device.link_speed = device.link_width = None
+
+def decode_pci_devices(data):
+    """Rebuild cached PCI devices, re-reading the link state that power management can change."""
+    devices = [PciDevice.from_dict(d) for d in data]
+    for device in devices:
+        if device.max_link_speed:
+            read_pci_link_state(device, os.path.join(PCI_DEVICES_PATH, device.address))
+    return devices
+
+def enumerate_pci_devices():
+    """Enumerate all PCI functions from sysfs, sorted by address."""
+    if not os.path.isdir(host_path(PCI_DEVICES_PATH)):
+        return []
+    ids_index = PCI_IDS.get()
+    devices = (parse_pci_device(address, PCI_DEVICES_PATH, ids_index)
+               for address in sorted(os.listdir(host_path(PCI_DEVICES_PATH))))
+    return [device for device in devices if device is not None]
+
+PCI_DEVICES = SharedSource(enumerate_pci_devices, 'pci',
+                           lambda devices: [d.to_dict() for d in devices], decode_pci_devices)
+
+def get_pci_devices(base_class=None):
+    """Return the shared PCI enumeration, optionally filtered by base class."""
+    devices = PCI_DEVICES.get()
+    if base_class is None:
+        return devices
+    return [device for device in devices if device.base_class == base_class]
+
+class CpuCache:
+    """A CPU cache instance and the logical CPUs sharing it."""
+    
+    __slots__ = ('level', 'type', 'size', 'cpus')
+    
+    def __init__(self, level, cache_type, size, cpus):
+        self.level = level
+        self.type = cache_type
+        self.size = size
+        self.cpus = cpus
+    
+    @property
+    def name(self):
+        suffix = {'Data': 'd', 'Instruction': 'i'}.get(self.type, '')
+        return f"L{self.level}{suffix}"
+
+class CpuTopology:
+    """Socket/die/core/thread tree of the online CPUs with caches and NUMA nodes."""
+    
+    def __init__(self):
+        self.sockets = OrderedDict()
+        self.packages = {}
+        self.caches = []
+        self.numa_nodes = OrderedDict()
+    
+    def add_thread(self, cpu, package, die, core):
+        """Place a logical CPU in the tree."""
+        dies = self.sockets.setdefault(package, OrderedDict())
+        cores = dies.setdefault(die, OrderedDict())
+        cores.setdefault(core, []).append(cpu)
+        self.packages[cpu] = package
+    
+    @property
+    def socket_count(self):
+        return len(self.sockets)
+    
+    @property
+    def die_count(self):
+        return sum(len(dies) for dies in self.sockets.values())
+    
+    @property
+    def core_count(self):
+        return sum(len(cores) for dies in self.sockets.values() for cores in dies.values())
+    
+    @property
+    def thread_count(self):
+        return len(self.packages)
+    
+    def package_of(self, cpu):
+        """Return the physical package (socket) id of a logical CPU."""
+        return self.packages.get(cpu, 0)
+    
+    def to_dict(self):
+        """Convert to JSON-compatible data (inverse of from_dict)."""
+        return {
+            'threads': [[cpu, package, die, core]
+                        for package, dies in self.sockets.items()
+                        for die, cores in dies.items()
+                        for core, cpus in cores.items()
+                        for cpu in cpus],
+            'caches': [[c.level, c.type, c.size, c.cpus] for c in self.caches],
+            'numa_nodes': [[node, cpus, memory] for node, (cpus, memory) in self.numa_nodes.items()],
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a topology from to_dict() output."""
+        topology = cls()
+        for cpu, package, die, core in data['threads']:
+            topology.add_thread(cpu, package, die, core)
+        topology.caches = [CpuCache(*cache) for cache in data['caches']]
+        for node, cpus, memory in data['numa_nodes']:
+            topology.numa_nodes[node] = (cpus, memory)
+        return topology
+    
+    def cache_summary(self):
+        """Return (name, size, instances) per cache level, in level order."""
+        summary = OrderedDict()
+        for cache in sorted(self.caches, key=lambda c: (c.level, c.type != 'Data')):
+            entry = summary.setdefault(cache.name, [cache.size, 0])
+            entry[1] += 1
+        return [(name, size, instances) for name, (size, instances) in summary.items()]
+
+def parse_cache_size(size):
+    """Convert a sysfs cache size such as '48K' or '32M' to bytes."""
+    match = re.match(r'^(\d+)\s*([KMG]?)', size or '')
+    if not match:
+        return None
+    return int(match.group(1)) * {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}[match.group(2)]
+
+def read_int_safe(path, default=None):
+    """Read an integer sysfs attribute."""
+    value = read_file_safe(path)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def read_cpu_topology(cpu_path=CPU_SYSFS_PATH, node_path=NODE_SYSFS_PATH):
+    """Build the CPU topology from sysfs instead of /proc/cpuinfo.
+    
+    Core ids are only unique within a package (and die), so cores are keyed by
+    (package, die, core). Thread siblings and shared caches are read once per
+    group rather than once per logical CPU.
+    """
+    topology = CpuTopology()
+    online = parse_cpu_list(read_file_safe(f'{cpu_path}/online'))
+    if not online:
+        online = sorted(int(d[3:]) for d in (os.listdir(host_path(cpu_path)) if os.path.isdir(host_path(cpu_path)) else [])
+                        if re.match(r'^cpu\d+$', d))
+    
+    placed = set()
+    for cpu in online:
+        if cpu in placed:
+            continue
+        topology_dir = f'{cpu_path}/cpu{cpu}/topology'
+        package = read_int_safe(f'{topology_dir}/physical_package_id', 0)
+        die = read_int_safe(f'{topology_dir}/die_id', 0)
+        core = read_int_safe(f'{topology_dir}/core_id', cpu)
+        siblings = parse_cpu_list(read_file_safe(f'{topology_dir}/thread_siblings_list')) or [cpu]
+        for sibling in siblings:
+            if sibling in online and sibling not in placed:
+                topology.add_thread(sibling, package, die, core)
+                placed.add(sibling)
+    
+    covered = {}
+    for cpu in online:
+        for index_dir in sorted(host_glob(f'{cpu_path}/cpu{cpu}/cache/index[0-9]*')):
+            index = os.path.basename(index_dir)
+            if cpu in covered.get(index, ()):
+                continue
+            shared = parse_cpu_list(read_file_safe(f'{index_dir}/shared_cpu_list')) or [cpu]
+            covered.setdefault(index, set()).update(shared)
+            level = read_int_safe(f'{index_dir}/level')
+            if level is not None:
+                topology.caches.append(CpuCache(level, read_file_safe(f'{index_dir}/type'),
+                                                parse_cache_size(read_file_safe(f'{index_dir}/size')),
+                                                shared))
+    
+    if os.path.isdir(host_path(node_path)):
+        nodes = [d for d in os.listdir(host_path(node_path)) if re.match(r'^node\d+$', d)]
+        for node in sorted(nodes, key=lambda n: int(n[4:])):
+            memory = None
+            for line in read_lines_safe(f'{node_path}/{node}/meminfo'):
+                if 'MemTotal:' in line:
+                    memory = int(line.split()[-2]) * 1024
+                    break
+            topology.numa_nodes[int(node[4:])] = (
+                parse_cpu_list(read_file_safe(f'{node_path}/{node}/cpulist')), memory)
+    
+    return topology
+
+CPU_TOPOLOGY = SharedSource(read_cpu_topology, 'cpu_topology',
+                            lambda topology: topology.to_dict(), CpuTopology.from_dict)
+
+def read_cpu_identity():
+    """Parse the identity fields of the first /proc/cpuinfo block, or None."""
+    cpuinfo = FILE_READER.read_until(CPUINFO_PATH, '\n\n')
+    return parse_cpuinfo(cpuinfo.splitlines()) if cpuinfo else None
+
+def read_current_cpu_mhz():
+    """Return the current clock of the first CPU in MHz (cpufreq, else /proc/cpuinfo)."""
+    khz = read_int_safe(f'{CPU_SYSFS_PATH}/cpu0/cpufreq/scaling_cur_freq')
+    if khz:
+        return f"{khz / 1000:.3f}"
+    identity = read_cpu_identity()
+    return identity.get('cpu_mhz') if identity else None
+
+# The clock speed is dynamic, so it is left out of the cached identity
+CPU_IDENTITY = SharedSource(read_cpu_identity, 'cpu_identity',
+                            lambda identity: identity and {k: v for k, v in identity.items() if k != 'cpu_mhz'})
+
+def read_os_release():
+    """Parse /etc/os-release into a dictionary, or None when absent."""
+    if not os.path.exists(host_path(OS_RELEASE_PATH)):
+        return None
+    distro_info = {}
+    for line in read_lines_safe(OS_RELEASE_PATH):
+        if '=' in line:
+            key, value = line.split('=', 1)
+            distro_info[key] = value.strip('"')
+    return distro_info
+
+OS_RELEASE = SharedSource(read_os_release, 'os_release')
+
+class HwmonSensor:
+    """One hwmon channel (e.g. temp1) with its label and static limits."""
+    
+    __slots__ = ('chip', 'channel', 'kind', 'label', 'input_path', 'alarm_paths', 'max', 'crit')
+    
+    def __init__(self, chip, channel, kind):
+        self.chip = chip
+        self.channel = channel
+        self.kind = kind
+        self.label = channel
+        self.input_path = None
+        self.alarm_paths = []
+        self.max = None
+        self.crit = None
+    
+    @property
+    def unit(self):
+        return HWMON_SENSOR_KINDS[self.kind][0]
+    
+    def scale(self, raw):
+        """Convert a raw sysfs value (milli-/micro-units) to the display unit."""
+        return int(raw) / HWMON_SENSOR_KINDS[self.kind][1]
+    
+    def describe(self, value, alarm=False):
+        """Format a reading with its limits for display."""
+        text = f"{self.chip}/{self.label}: {format_sample_value(value, self.unit)}"
+        limits = [f"{name} {format_sample_value(limit, self.unit)}"
+                  for name, limit in (('max', self.max), ('crit', self.crit)) if limit is not None]
+        if limits:
+            text += f" ({', '.join(limits)})"
+        if alarm:
+            text += " ALARM"
+        return text
+
+def discover_hwmon_chips(hwmon_path=HWMON_PATH):
+    """Discover every hwmon chip and its sensor channels once.
+    
+    Each chip directory is listed a single time; labels and max/crit limits
+    are read during discovery, so later samples only re-read the *_input and
+    *_alarm files. Returns (chip name, [HwmonSensor]) pairs.
+    """
+    if not os.path.isdir(host_path(hwmon_path)):
+        return []
+    
+    chips = []
+    for hwmon in sorted(os.listdir(host_path(hwmon_path)), key=lambda d: int(re.sub(r'\D', '', d) or 0)):
+        chip_path = os.path.join(hwmon_path, hwmon)
+        # Older drivers keep the attributes in the device directory
+        if not os.path.exists(host_path(f'{chip_path}/name')) and os.path.exists(host_path(f'{chip_path}/device/name')):
+            chip_path = f'{chip_path}/device'
+        try:
+            files = os.listdir(host_path(chip_path))
+        except OSError:
+            continue
+        chip = read_file_safe(f'{chip_path}/name') or hwmon
+        
+        sensors = OrderedDict()
+        for filename in sorted(files):
+            match = HWMON_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            kind, index, attribute = match.groups()
+            channel = f'{kind}{index}'
+            sensor = sensors.get(channel)
+            if sensor is None:
+                sensor = sensors[channel] = HwmonSensor(chip, channel, kind)
+            path = f'{chip_path}/{filename}'
+            if attribute == 'input' or (attribute == 'average' and sensor.input_path is None):
+                sensor.input_path = path
+            elif attribute.endswith('alarm'):
+                sensor.alarm_paths.append(path)
+            elif attribute == 'label':
+                sensor.label = read_file_safe(path) or channel
+            elif attribute in ('max', 'crit'):
+                raw = read_file_safe(path)
+                if raw and raw.lstrip('-').isdigit():
+                    setattr(sensor, attribute, sensor.scale(raw))
+        
+        channels = [s for s in sensors.values() if s.input_path is not None]
+        channels.sort(key=lambda s: (list(HWMON_SENSOR_KINDS).index(s.kind), int(re.sub(r'\D', '', s.channel))))
+        if channels:
+            chips.append((chip, channels))
+    return chips
+
+HWMON_CHIPS = SharedSource(discover_hwmon_chips)
+
+def read_hwmon_sensors(chips=None):
+    """Read all hwmon inputs and alarms in one batch; return (sensor, value, alarm) tuples."""
+    if chips is None:
+        chips = HWMON_CHIPS.get()
+    sensors = [sensor for _, channels in chips for sensor in channels]
+    paths = [sensor.input_path for sensor in sensors]
+    alarm_sensors = [sensor for sensor in sensors for _ in sensor.alarm_paths]
+    contents = FILE_READER.read_batch(paths + [path for sensor in sensors for path in sensor.alarm_paths])
+    alarms = {}
+    for sensor, content in zip(alarm_sensors, contents[len(paths):]):
+        if (content or '').strip() not in ('', '0'):
+            alarms[id(sensor)] = True
+    
+    readings = []
+    for sensor, content in zip(sensors, contents):
+        try:
+            value = sensor.scale(content.strip())
+        except (AttributeError, ValueError):
+            # Disconnected inputs report errors such as ENODATA
+            continue
+        readings.append((sensor, value, alarms.get(id(sensor), False)))
+    return readings
+
+class DeviceInventory:
+    """Device names of the hotplug subsystems, kept current by uevents.
+    
+    Without an event source every lookup lists the sysfs directory as before.
+    Once a UeventMonitor (or the polling fallback) feeds it, listings are
+    taken once and then only patched on add/remove/move events, and per-device
+    details built by the collectors are kept until an event touches that
+    device. Collectors and samplers can subscribe to changes per subsystem.
+    """
+    
+    def __init__(self, subsystems=HOTPLUG_SUBSYSTEMS):
+        self.paths = OrderedDict(subsystems)
+        self.tracking = False
+        self._lock = threading.RLock()
+        self._names = {}
+        self._entries = {}
+        self._listeners = {}
+        self._pending = []
+    
+    def _list(self, subsystem):
+        path = self.paths[subsystem]
+        return sorted(os.listdir(host_path(path))) if os.path.isdir(host_path(path)) else None
+    
+    def names(self, subsystem):
+        """Return the device names of a subsystem (None if it has no sysfs directory)."""
+        if not self.tracking:
+            return self._list(subsystem)
+        with self._lock:
+            if subsystem not in self._names:
+                self._names[subsystem] = self._list(subsystem)
+            names = self._names[subsystem]
+            return list(names) if names is not None else None
+    
+    def entry(self, subsystem, name, key, builder):
+        """Return a per-device value built by builder(), cached until the device changes."""
+        if not self.tracking:
+            return builder()
+        cache_key = (subsystem, name, key)
+        with self._lock:
+            if cache_key in self._entries:
+                return self._entries[cache_key]
+        value = builder()
+        with self._lock:
+            self._entries[cache_key] = value
+        return value
+    
+    def subscribe(self, subsystem, callback):
+        """Call callback(action, name) after each change of a subsystem."""
+        with self._lock:
+            self._listeners.setdefault(subsystem, []).append(callback)
+    
+    def apply(self, event):
+        """Apply one parsed uevent; return (subsystem, action, name) or None if ignored."""
+        subsystem = event.get('SUBSYSTEM')
+        if subsystem not in self.paths or (subsystem == 'block' and event.get('DEVTYPE') != 'disk'):
+            return None
+        action = event.get('ACTION')
+        name = event.get('INTERFACE') if subsystem == 'net' and event.get('INTERFACE') else \
+            os.path.basename(event.get('DEVPATH', ''))
+        if not name or action not in UEVENT_ACTIONS:
+            return None
+        old_name = os.path.basename(event['DEVPATH_OLD']) if action == 'move' and event.get('DEVPATH_OLD') else None
+        self._change(subsystem, action, name, old_name)
+        return subsystem, action, name
+    
+    def _change(self, subsystem, action, name, old_name=None):
+        """Patch the listing, drop the affected entries and notify subscribers."""
+        with self._lock:
+            names = self._names.get(subsystem)
+            for stale in (name, old_name):
+                if stale:
+                    self._entries = {k: v for k, v in self._entries.items() if k[:2] != (subsystem, stale)}
+            if names is not None:
+                if old_name in names:
+                    names.remove(old_name)
+                if action == 'remove':
+                    if name in names:
+                        names.remove(name)
+                elif name not in names:
+                    names.append(name)
+                    names.sort()
+            self._pending.append((subsystem, action, name))
+            listeners = list(self._listeners.get(subsystem, ()))
+        for callback in listeners:
+            try:
+                callback(action, name)
+            except Exception:
+                continue
+    
+    def poll(self):
+        """Polling fallback: diff the sysfs listings and synthesise add/remove events."""
+        for subsystem in self.paths:
+            with self._lock:
+                known = self._names.get(subsystem)
+            current = self._list(subsystem)
+            if known is None or current is None:
+                with self._lock:
+                    self._names[subsystem] = current
+                continue
+            for name in sorted(set(known) - set(current)):
+                self._change(subsystem, 'remove', name)
+            for name in sorted(set(current) - set(known)):
+                self._change(subsystem, 'add', name)
+    
+    def rescan(self):
+        """Drop every listing and cached entry (after lost events)."""
+        with self._lock:
+            self._names.clear()
+            self._entries.clear()
+            self._pending.append((None, 'rescan', None))
+    
+    def drain_events(self):
+        """Return and clear the (subsystem, action, name) changes since the last call."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+DEVICE_INVENTORY = DeviceInventory()
+
+def parse_uevent(message):
+    """Parse a kernel uevent datagram ('action@devpath' followed by KEY=VALUE fields)."""
+    parts = message.split(b'\0')
+    if not parts or b'@' not in parts[0]:
+        return None
+    event = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition(b'=')
+        if sep:
+            event[key.decode('ascii', 'replace')] = value.decode('utf-8', 'replace')
+    return event if 'ACTION' in event else None
+
+class UeventMonitor:
+    """Feeds DEVICE_INVENTORY from the kernel's NETLINK_KOBJECT_UEVENT socket.
+    
+    The socket is local to the host and needs no network. A background thread
+    applies events as they arrive, so nothing is rescanned between hotplugs.
+    When netlink is unavailable (non-Linux, seccomp, old containers) the
+    inventory falls back to diffing the sysfs listings on every poll().
+    """
+    
+    def __init__(self, inventory=None):
+        self.inventory = inventory if inventory is not None else DEVICE_INVENTORY
+        self.events = 0
+        self._socket = None
+        self._thread = None
+        self._stop = threading.Event()
+    
+    @property
+    def event_driven(self):
+        return self._socket is not None
+    
+    def start(self):
+        """Subscribe to kernel uevents; return True when event-driven."""
+        self.inventory.tracking = True
+        if HOST_ROOT:
+            # Kernel events describe the running host, not the tree being read
+            return False
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UEVENT_RECEIVE_BUFFER)
+            sock.bind((0, UEVENT_KERNEL_GROUP))
+            sock.settimeout(UEVENT_POLL_TIMEOUT)
+        except (AttributeError, OSError):
+            return False
+        self._socket = sock
+        self._thread = threading.Thread(target=self._run, name='uevent-monitor', daemon=True)
+        self._thread.start()
+        return True
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                message = self._socket.recv(UEVENT_BUFFER_SIZE)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    # Events were dropped; the listings can no longer be trusted
+                    self.inventory.rescan()
+                    continue
+                break
+            event = parse_uevent(message)
+            if event is not None and self.inventory.apply(event) is not None:
+                self.events += 1
+    
+    def poll(self):
+        """Pick up hotplug changes when no event socket is available."""
+        if self._socket is None:
+            self.inventory.poll()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
 #####################
 # HARDWARE CRAWLERS #
 #####################
 
+KernelIdentity = namedtuple('KernelIdentity', list(KERNEL_IDENTITY_FILES))
+
+def read_kernel_identity():
+    """Return hostname and kernel identity from /proc/sys/kernel.
+    
+    Fields missing there (arch is only exposed by recent kernels) fall back
+    to os.uname() on a live host, or to the uname recorded in a snapshot.
+    """
+    if HOST_ROOT:
+        fallback = read_host_metadata().get('uname') or {}
+    else:
+        uname = os.uname()
+        fallback = {field: getattr(uname, field) for field in KERNEL_IDENTITY_FILES}
+    return KernelIdentity(*(read_file_safe(f'{KERNEL_SYSCTL_PATH}/{name}') or fallback.get(field, 'Unknown')
+                            for field, name in KERNEL_IDENTITY_FILES.items()))
+
 def collect_os_information(verbosity):
     """Collect operating system and kernel information."""
     info = HardwareInfo()
     
     # Basic OS information
-    uname = os.uname()
+    uname = read_kernel_identity()
     info.data['Hostname'] = uname.nodename
     info.data['Kernel Name'] = uname.sysname
     info.data['Kernel Release'] = uname.release
@@ -347,13 +2482,8 @@ def collect_os_information(verbosity):
     info.data['Architecture'] = uname.machine
     
     # Distribution information
-    if os.path.exists('/etc/os-release'):
-        distro_info = {}
-        for line in read_lines_safe('/etc/os-release'):
-            if '=' in line:
-                key, value = line.split('=', 1)
-                distro_info[key] = value.strip('"')
-        
+    distro_info = OS_RELEASE.get()
+    if distro_info is not None:
         info.data['Distribution'] = distro_info.get('PRETTY_NAME', 
                                                      distro_info.get('NAME', 'Unknown'))
         info.data['Distribution ID'] = distro_info.get('ID', 'unknown')
@@ -372,17 +2502,15 @@ def add_os_detailed_info(info):
     # Uptime
     uptime_data = read_file_safe('/proc/uptime')
     if uptime_data:
-        uptime_seconds = float(uptime_data.split()[0])
-        days = int(uptime_seconds // 86400)
-        hours = int((uptime_seconds % 86400) // 3600)
-        minutes = int((uptime_seconds % 3600) // 60)
-        info.data['Uptime'] = f"{days}d {hours}h {minutes}m"
+        info.data['Uptime'] = Metric('os.uptime', float(uptime_data.split()[0]), 's')
     
     # Load average
     load_avg = read_file_safe('/proc/loadavg')
     if load_avg:
         loads = load_avg.split()[:3]
-        info.data['Load Average'] = f"{loads[0]} (1min) / {loads[1]} (5min) / {loads[2]} (15min)"
+        for period, value in zip((1, 5, 15), loads):
+            name = f'os.load{period}'
+            info.data[SAMPLE_LABELS[name]] = Metric(name, float(value), '')
 
 def add_os_full_info(info):
     """Add full OS information."""
@@ -393,7 +2521,7 @@ def add_os_full_info(info):
                                           if len(cmdline) > 100 else cmdline)
     
     # Kernel modules count
-    if os.path.exists('/proc/modules'):
+    if os.path.exists(host_path('/proc/modules')):
         modules = read_lines_safe('/proc/modules')
         info.data['Loaded Modules'] = len(modules)
 
@@ -401,48 +2529,52 @@ def collect_cpu_information(verbosity):
     """Collect CPU hardware information."""
     info = HardwareInfo()
     
-    cpuinfo = read_lines_safe('/proc/cpuinfo')
-    if not cpuinfo:
+    cpu_data = CPU_IDENTITY.get()
+    if not cpu_data:
         info.severity = SEVERITY_CRITICAL
         info.data['Status'] = "Unable to read CPU information"
         return info
     
-    cpu_data = parse_cpuinfo(cpuinfo)
+    topology = CPU_TOPOLOGY.get()
+    sockets = topology.socket_count or 1
     
     # Basic CPU information
     info.data['Model'] = cpu_data.get('model_name', 'Unknown')
     info.data['Vendor'] = cpu_data.get('vendor_id', 'Unknown')
-    info.data['Logical Processors'] = cpu_data['processor_count']
-    info.data['Physical CPUs'] = len(cpu_data['physical_ids']) or 1
-    info.data['Cores per CPU'] = len(cpu_data['core_ids']) or cpu_data['processor_count']
+    info.data['Logical Processors'] = topology.thread_count or os.cpu_count() or 1
+    info.data['Physical CPUs'] = sockets
+    info.data['Cores per CPU'] = (topology.core_count // sockets) or info.data['Logical Processors']
     
     if verbosity >= VERBOSITY_DETAILED:
         add_cpu_detailed_info(info, cpu_data)
+        add_cpu_topology_info(info, topology, verbosity)
+        add_cpu_usage_info(info, sample_over_interval(CpuStatSampler()), verbosity)
     
     if verbosity >= VERBOSITY_FULL:
         add_cpu_full_info(info, cpu_data)
     
     # Optional: Use lscpu if available for more details
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v lscpu'):
-        lscpu_output = run_command_safe('lscpu')
+    if verbosity >= VERBOSITY_DETAILED and tool_available('lscpu'):
+        lscpu_output = run_command_cached('lscpu', ['lscpu'])
         if lscpu_output:
             info.data['LSCPU Details'] = lscpu_output[:200] + "..." if len(lscpu_output) > 200 else lscpu_output
 
-    # Optional: dmidecode -t processor
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v dmidecode'):
-        dmidecode_proc = run_command_safe('dmidecode -t processor')
-        if dmidecode_proc:
-            info.data['DMI Processor Details'] = dmidecode_proc[:200] + "..." if len(dmidecode_proc) > 200 else dmidecode_proc
+    # Optional: processor sockets from the shared DMI table
+    if verbosity >= VERBOSITY_FULL:
+        sockets = [format_dmi_processor(r) for r in get_dmi_records(DMI_TYPE_PROCESSOR)
+                   if str(r.get('Status', '')).startswith('Populated')]
+        if sockets:
+            info.data['DMI Processor Details'] = sockets
     
     return info
 
 def parse_cpuinfo(cpuinfo):
-    """Parse /proc/cpuinfo data."""
-    cpu_data = {
-        'processor_count': 0,
-        'physical_ids': set(),
-        'core_ids': set()
-    }
+    """Parse the identity fields of the first processor block of /proc/cpuinfo.
+    
+    Counts and topology come from sysfs (see read_cpu_topology), so only the
+    first block is needed and the per-CPU repetition of flags is never read.
+    """
+    cpu_data = {}
     
     for line in cpuinfo:
         if ':' not in line:
@@ -451,9 +2583,7 @@ def parse_cpuinfo(cpuinfo):
         key = key.strip()
         value = value.strip()
         
-        if key == 'processor':
-            cpu_data['processor_count'] += 1
-        elif key == 'model name' and 'model_name' not in cpu_data:
+        if key == 'model name' and 'model_name' not in cpu_data:
             cpu_data['model_name'] = value
         elif key == 'vendor_id' and 'vendor_id' not in cpu_data:
             cpu_data['vendor_id'] = value
@@ -461,10 +2591,6 @@ def parse_cpuinfo(cpuinfo):
             cpu_data['cpu_mhz'] = value
         elif key == 'cache size' and 'cache_size' not in cpu_data:
             cpu_data['cache_size'] = value
-        elif key == 'physical id':
-            cpu_data['physical_ids'].add(value)
-        elif key == 'core id':
-            cpu_data['core_ids'].add(value)
         elif key == 'flags' and 'flags' not in cpu_data:
             cpu_data['flags'] = value.split()
         elif key == 'bogomips' and 'bogomips' not in cpu_data:
@@ -474,26 +2600,85 @@ def parse_cpuinfo(cpuinfo):
 
 def add_cpu_detailed_info(info, cpu_data):
     """Add detailed CPU information."""
-    info.data['Current Frequency'] = f"{cpu_data.get('cpu_mhz', 'N/A')} MHz"
+    mhz = cpu_data.get('cpu_mhz') or read_current_cpu_mhz()
+    try:
+        info.data['Current Frequency'] = Metric('cpu.frequency', float(mhz), 'MHz')
+    except (TypeError, ValueError):
+        info.data['Current Frequency'] = 'N/A'
     info.data['Cache Size'] = cpu_data.get('cache_size', 'N/A')
     info.data['BogoMIPS'] = cpu_data.get('bogomips', 'N/A')
 
+def add_cpu_topology_info(info, topology, verbosity):
+    """Add socket/die/core/thread, cache and NUMA information."""
+    if topology.core_count:
+        info.data['Threads per Core'] = topology.thread_count // topology.core_count
+    if topology.die_count > topology.socket_count:
+        info.data['Dies per CPU'] = topology.die_count // max(topology.socket_count, 1)
+    info.data['NUMA Nodes'] = len(topology.numa_nodes) or 1
+    
+    caches = topology.cache_summary()
+    if caches:
+        info.data['CPU Caches'] = [
+            f"{name}: {bytes_to_human(size) if size else 'unknown size'} x {instances}"
+            for name, size, instances in caches
+        ]
+    
+    if verbosity >= VERBOSITY_FULL:
+        info.data['Socket Topology'] = [
+            f"socket {package}: {len(dies)} die(s), "
+            f"{sum(len(cores) for cores in dies.values())} cores, "
+            f"{sum(len(threads) for cores in dies.values() for threads in cores.values())} threads"
+            for package, dies in topology.sockets.items()
+        ]
+        if topology.numa_nodes:
+            info.data['NUMA Topology'] = [
+                f"node{node}: cpus {format_cpu_list(cpus) or 'none'}"
+                + (f", {bytes_to_human(memory)}" if memory else "")
+                for node, (cpus, memory) in topology.numa_nodes.items()
+            ]
+
+def add_cpu_usage_info(info, samples, verbosity):
+    """Add CPU utilization breakdown from /proc/stat samples."""
+    for sample in samples:
+        if sample.labels.get('cpu') == 'all':
+            info.data[SAMPLE_LABELS[sample.name]] = Metric(sample.name, sample.value, sample.unit)
+    
+    if verbosity >= VERBOSITY_FULL:
+        per_core = OrderedDict()
+        for sample in samples:
+            if sample.name in ('cpu.core_usage', 'cpu.core_steal'):
+                per_core.setdefault(sample.labels['cpu'], {})[sample.name] = sample.value
+        info.data['Per-Core Usage'] = [
+            f"{cpu}: {values['cpu.core_usage']:.1f}% (steal {values['cpu.core_steal']:.1f}%)"
+            for cpu, values in per_core.items()
+        ]
+
+def format_cpufreq_policy(policy):
+    """Format a cpufreq policy with its governor and limits for display."""
+    limits = (f"{policy.min_freq:.0f}-{policy.max_freq:.0f} MHz"
+              if policy.min_freq and policy.max_freq else "limits unknown")
+    text = f"{policy.name} (cpus {format_cpu_list(policy.cpus)}): {policy.governor or 'unknown'}, {limits}"
+    if policy.is_capped():
+        text += f" (capped, hw max {policy.hw_max_freq:.0f} MHz)"
+    return text
+
 def add_cpu_full_info(info, cpu_data):
     """Add full CPU information."""
-    # CPU frequency scaling
-    freq_paths = glob.glob('/sys/devices/system/cpu/cpu*/cpufreq/scaling_cur_freq')
-    if freq_paths:
-        frequencies = []
-        for path in freq_paths[:4]:
-            freq = read_file_safe(path)
-            if freq:
-                frequencies.append(int(freq) / 1000)
-        
-        if frequencies:
-            freq_display = ', '.join(f'{f:.0f}MHz' for f in frequencies[:3])
-            if len(frequencies) > 3:
-                freq_display += "..."
-            info.data['Core Frequencies'] = f"{len(frequencies)} cores: {freq_display}"
+    # CPU frequency scaling across every core
+    freq_sampler = CpuFreqSampler()
+    summary = freq_sampler.summarize()
+    if summary:
+        info.data['Core Frequencies'] = (
+            f"{summary['count']} cores: min {summary['min']:.0f} / median {summary['median']:.0f} / "
+            f"p95 {summary['p95']:.0f} / max {summary['max']:.0f} MHz")
+        info.data['Frequency Histogram'] = [
+            f"{low:.0f}-{high:.0f} MHz: {count}" for low, high, count in summary['histogram'] if count
+        ]
+        if len(summary['sockets']) > 1:
+            info.data['Socket Median Frequencies'] = [
+                f"socket {socket}: {mhz:.0f} MHz" for socket, mhz in summary['sockets'].items()
+            ]
+        info.data['Frequency Policies'] = [format_cpufreq_policy(p) for p in freq_sampler.policies]
     
     # CPU features/flags
     flags = cpu_data.get('flags')
@@ -523,18 +2708,12 @@ def collect_memory_information(verbosity):
     available_mem = mem_data.get('MemAvailable', mem_data.get('MemFree', 0))
     used_mem = total_mem - available_mem
     
-    info.data['Total Memory'] = bytes_to_human(total_mem)
-    info.data['Available Memory'] = bytes_to_human(available_mem)
-    info.data['Used Memory'] = bytes_to_human(used_mem)
+    info.data['Total Memory'] = Metric('memory.total', total_mem, 'B')
+    info.data['Available Memory'] = Metric('memory.available', available_mem, 'B')
+    info.data['Used Memory'] = Metric('memory.used', used_mem, 'B')
     
     usage_percent = (used_mem / total_mem * 100) if total_mem > 0 else 0
-    info.data['Usage Percentage'] = f"{usage_percent:.1f}%"
-    
-    # Set severity based on usage
-    if usage_percent > 90:
-        info.severity = SEVERITY_CRITICAL
-    elif usage_percent > 80:
-        info.severity = SEVERITY_WARN
+    info.data['Usage Percentage'] = Metric('memory.usage', usage_percent, '%')
     
     if verbosity >= VERBOSITY_DETAILED:
         add_memory_detailed_info(info, mem_data)
@@ -542,11 +2721,9 @@ def collect_memory_information(verbosity):
     if verbosity >= VERBOSITY_FULL:
         add_memory_full_info(info, mem_data)
     
-    # Optional: Physical modules via dmidecode if available
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v dmidecode'):
-        dmidecode_mem = run_command_safe('dmidecode -t memory')
-        if dmidecode_mem:
-            info.data['Physical Modules (DMI)'] = dmidecode_mem[:200] + "..." if len(dmidecode_mem) > 200 else dmidecode_mem
+    # Optional: Physical modules from the shared DMI table
+    if verbosity >= VERBOSITY_FULL:
+        add_memory_dmi_info(info)
     
     return info
 
@@ -571,21 +2748,21 @@ def add_memory_detailed_info(info, mem_data):
     swap_free = mem_data.get('SwapFree', 0)
     swap_used = swap_total - swap_free
     
-    info.data['Swap Total'] = bytes_to_human(swap_total)
-    info.data['Swap Used'] = bytes_to_human(swap_used)
-    info.data['Swap Free'] = bytes_to_human(swap_free)
+    info.data['Swap Total'] = Metric('memory.swap_size', swap_total, 'B')
+    info.data['Swap Used'] = Metric('memory.swap_used', swap_used, 'B')
+    info.data['Swap Free'] = Metric('memory.swap_free', swap_free, 'B')
     
     if swap_total > 0:
         swap_usage = (swap_used / swap_total * 100)
-        info.data['Swap Usage'] = f"{swap_usage:.1f}%"
+        info.data['Swap Usage'] = Metric('memory.swap_usage', swap_usage, '%')
 
 def add_memory_full_info(info, mem_data):
     """Add full memory information."""
-    info.data['Active Memory'] = bytes_to_human(mem_data.get('Active', 0))
-    info.data['Inactive Memory'] = bytes_to_human(mem_data.get('Inactive', 0))
-    info.data['Dirty Pages'] = bytes_to_human(mem_data.get('Dirty', 0))
-    info.data['Writeback'] = bytes_to_human(mem_data.get('Writeback', 0))
-    info.data['Slab'] = bytes_to_human(mem_data.get('Slab', 0))
+    info.data['Active Memory'] = Metric('memory.active', mem_data.get('Active', 0), 'B')
+    info.data['Inactive Memory'] = Metric('memory.inactive', mem_data.get('Inactive', 0), 'B')
+    info.data['Dirty Pages'] = Metric('memory.dirty', mem_data.get('Dirty', 0), 'B')
+    info.data['Writeback'] = Metric('memory.writeback', mem_data.get('Writeback', 0), 'B')
+    info.data['Slab'] = Metric('memory.slab', mem_data.get('Slab', 0), 'B')
     
     # Huge pages
     hugepages_total = mem_data.get('HugePages_Total', 0)
@@ -593,12 +2770,45 @@ def add_memory_full_info(info, mem_data):
         info.data['HugePages Total'] = hugepages_total
         info.data['HugePages Free'] = mem_data.get('HugePages_Free', 0)
 
+def add_memory_dmi_info(info):
+    """Add physical memory module information from the DMI table."""
+    slots = get_dmi_records(DMI_TYPE_MEMORY_DEVICE)
+    if not slots:
+        return
+    
+    modules = [slot for slot in slots if slot.get('Size')]
+    info.data['Memory Slots (DMI)'] = f"{len(modules)} used / {len(slots)} total"
+    info.data['Installed Memory (DMI)'] = Metric('memory.installed', sum(m.get('Size') for m in modules), 'B')
+    info.data['Physical Modules (DMI)'] = [format_dmi_memory_module(m) for m in modules]
+
+def format_dmi_memory_module(module):
+    """Format a DMI memory device record for display."""
+    description = [bytes_to_human(module.get('Size')), module.get('Type'), module.get('Form Factor')]
+    speed = module.get('Configured Memory Speed') or module.get('Speed')
+    if speed:
+        description.append(f"{speed} MT/s")
+    description.extend([module.get('Manufacturer'), module.get('Part Number')])
+    details = ' '.join(str(d).strip() for d in description if d)
+    return f"{module.get('Locator', 'Unknown slot')}: {details}"
+
+def format_dmi_processor(processor):
+    """Format a DMI processor record for display."""
+    details = []
+    if processor.get('Max Speed'):
+        details.append(f"max {processor.get('Max Speed')} MHz")
+    if processor.get('Core Count'):
+        details.append(f"{processor.get('Core Count')} cores")
+    if processor.get('Thread Count'):
+        details.append(f"{processor.get('Thread Count')} threads")
+    name = f"{processor.get('Socket Designation', 'Socket')}: {processor.get('Version', 'Unknown')}"
+    return f"{name} ({', '.join(details)})" if details else name
+
 def collect_motherboard_information(verbosity):
     """Collect motherboard and system board information."""
     info = HardwareInfo()
     dmi_base = '/sys/class/dmi/id'
     
-    if not os.path.exists(dmi_base):
+    if not os.path.exists(host_path(dmi_base)):
         info.severity = SEVERITY_WARN
         info.data['Status'] = "DMI information not available"
         return info
@@ -614,17 +2824,22 @@ def collect_motherboard_information(verbosity):
     if verbosity >= VERBOSITY_FULL:
         add_motherboard_full_info(info, dmi_base)
     
-    # Optional: dmidecode for baseboard
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v dmidecode'):
-        dmidecode_base = run_command_safe('dmidecode -t baseboard')
-        if dmidecode_base:
-            info.data['Baseboard Details (DMI)'] = dmidecode_base[:200] + "..." if len(dmidecode_base) > 200 else dmidecode_base
-
-    # Optional: dmidecode for bios
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v dmidecode'):
-        dmidecode_bios = run_command_safe('dmidecode -t bios')
-        if dmidecode_bios:
-            info.data['BIOS Details (DMI)'] = dmidecode_bios[:200] + "..." if len(dmidecode_bios) > 200 else dmidecode_bios
+    # Optional: baseboard and BIOS details from the shared DMI table
+    if verbosity >= VERBOSITY_DETAILED:
+        for board in get_dmi_records(DMI_TYPE_BASEBOARD)[:1]:
+            if board.get('Serial Number'):
+                info.data['Baseboard Serial (DMI)'] = board.get('Serial Number')
+            if board.get('Asset Tag'):
+                info.data['Baseboard Asset Tag (DMI)'] = board.get('Asset Tag')
+    
+    if verbosity >= VERBOSITY_FULL:
+        for bios in get_dmi_records(DMI_TYPE_BIOS)[:1]:
+            if bios.get('BIOS Revision'):
+                info.data['BIOS Revision (DMI)'] = bios.get('BIOS Revision')
+            if bios.get('Firmware Revision'):
+                info.data['Firmware Revision (DMI)'] = bios.get('Firmware Revision')
+            if bios.get('ROM Size'):
+                info.data['BIOS ROM Size (DMI)'] = Metric('motherboard.bios_rom_size', bios.get('ROM Size'), 'B')
     
     return info
 
@@ -659,23 +2874,23 @@ def add_motherboard_full_info(info, dmi_base):
 def collect_storage_information(verbosity):
     """Collect storage devices information."""
     info = HardwareInfo()
-    block_path = '/sys/block'
+    block_path = HOTPLUG_SUBSYSTEMS['block']
     
-    if not os.path.exists(block_path):
+    block_devices = DEVICE_INVENTORY.names('block')
+    if block_devices is None:
         info.severity = SEVERITY_WARN
         info.data['Status'] = "Block device information not available"
         return info
     
     devices = []
-    block_devices = os.listdir(block_path)
-    
     for device in block_devices:
         # Skip loop and ram devices in basic verbosity
         if verbosity < VERBOSITY_FULL:
             if device.startswith(('loop', 'ram')):
                 continue
         
-        device_info = parse_block_device(device, block_path, verbosity)
+        device_info = DEVICE_INVENTORY.entry('block', device, verbosity,
+                                             lambda: parse_block_device(device, block_path, verbosity))
         if device_info:
             devices.append(device_info)
     
@@ -692,26 +2907,45 @@ def collect_storage_information(verbosity):
     else:
         info.data['Devices'] = device_display
     
+    # Block I/O load from /proc/diskstats deltas
+    if verbosity >= VERBOSITY_DETAILED:
+        add_storage_io_info(info, verbosity)
+    
     # Optional: lsblk if available
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v lsblk'):
-        lsblk_output = run_command_safe('lsblk -d -o NAME,MODEL,SIZE,TYPE')
+    if verbosity >= VERBOSITY_DETAILED and tool_available('lsblk'):
+        lsblk_output = run_command_safe(['lsblk', '-d', '-o', 'NAME,MODEL,SIZE,TYPE'])
         if lsblk_output:
             info.data['LSBLK Summary'] = lsblk_output
 
     # Optional: lsscsi if available
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v lsscsi'):
-        lsscsi_output = run_command_safe('lsscsi')
+    if verbosity >= VERBOSITY_FULL and tool_available('lsscsi'):
+        lsscsi_output = run_command_safe(['lsscsi'])
         if lsscsi_output:
             info.data['LSSCSI Devices'] = lsscsi_output
 
     # Optional: nvme list if available
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v nvme'):
-        nvme_output = run_command_safe('nvme list')
+    if verbosity >= VERBOSITY_FULL and tool_available('nvme'):
+        nvme_output = run_command_safe(['nvme', 'list'])
         if nvme_output:
             info.data['NVMe Devices'] = nvme_output
     
     return info
 
+def add_storage_io_info(info, verbosity):
+    """Add per-disk IOPS, throughput, await, utilization and queue depth."""
+    sampler = DiskStatsSampler(include_virtual=verbosity >= VERBOSITY_FULL)
+    sampler.sample_rates()
+    time.sleep(SAMPLE_PAUSE)
+    rates = sampler.sample_rates()
+    if not rates:
+        return
+    
+    busiest = max(rates, key=lambda name: rates[name].utilization)
+    info.data['Busiest Disk'] = Metric('disk.utilization', rates[busiest].utilization, '%',
+                                       OrderedDict([('device', busiest)]))
+    info.data['Disk I/O'] = [format_disk_rates(name, disk_rates, sampler.partitions.get(name))
+                             for name, disk_rates in rates.items()]
+
 def parse_block_device(device, block_path, verbosity):
     """Parse information for a single block device."""
     device_path = os.path.join(block_path, device)
@@ -745,13 +2979,15 @@ def collect_graphics_information(verbosity):
     info = HardwareInfo()
     gpus = []
     
-    drm_path = '/sys/class/drm'
-    if os.path.exists(drm_path):
-        drm_cards = [d for d in os.listdir(drm_path) 
+    drm_path = HOTPLUG_SUBSYSTEMS['drm']
+    drm_devices = DEVICE_INVENTORY.names('drm')
+    if drm_devices is not None:
+        drm_cards = [d for d in drm_devices 
                      if d.startswith('card') and '-' not in d]
         
         for card in drm_cards:
-            gpu_info = parse_gpu_device(card, drm_path, verbosity)
+            gpu_info = DEVICE_INVENTORY.entry('drm', card, verbosity,
+                                              lambda: parse_gpu_device(card, drm_path, verbosity))
             if gpu_info:
                 gpus.append(gpu_info)
     
@@ -764,15 +3000,15 @@ def collect_graphics_information(verbosity):
     else:
         info.data['GPUs'] = ["No discrete GPU detected"]
     
-    # Optional: lspci for VGA
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v lspci'):
-        lspci_vga = run_command_safe('lspci | grep -i vga')
-        if lspci_vga:
-            info.data['PCI VGA Devices'] = lspci_vga
+    # Optional: display controllers from the shared PCI enumeration
+    if verbosity >= VERBOSITY_DETAILED:
+        pci_display = [d.describe() for d in get_pci_devices(PCI_CLASS_DISPLAY)]
+        if pci_display:
+            info.data['PCI VGA Devices'] = pci_display
 
     # Optional: glxinfo for OpenGL renderer
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v glxinfo'):
-        glx_output = run_command_safe('glxinfo | grep "OpenGL renderer"')
+    if verbosity >= VERBOSITY_FULL and tool_available('glxinfo'):
+        glx_output = filter_output_lines(run_command_safe(['glxinfo']), 'OpenGL renderer', ignore_case=False)
         if glx_output:
             info.data['OpenGL Renderer'] = glx_output
     
@@ -783,7 +3019,7 @@ def parse_gpu_device(card, drm_path, verbosity):
     card_path = os.path.join(drm_path, card)
     device_path = f'{card_path}/device'
     
-    if not os.path.exists(device_path):
+    if not os.path.exists(host_path(device_path)):
         return None
     
     gpu_info = {'device': card}
@@ -796,8 +3032,8 @@ def parse_gpu_device(card, drm_path, verbosity):
     if verbosity >= VERBOSITY_DETAILED:
         # Driver
         driver_path = f'{device_path}/driver'
-        if os.path.islink(driver_path):
-            driver = os.path.basename(os.readlink(driver_path))
+        if os.path.islink(host_path(driver_path)):
+            driver = os.path.basename(os.readlink(host_path(driver_path)))
             gpu_info['driver'] = driver
     
     return gpu_info
@@ -817,19 +3053,17 @@ def get_gpu_vendor_name(vendor_id):
 def collect_network_information(verbosity):
     """Collect network interfaces (NIC) hardware information."""
     info = HardwareInfo()
-    net_path = '/sys/class/net'
+    net_path = HOTPLUG_SUBSYSTEMS['net']
     
-    if not os.path.exists(net_path):
+    net_devices = DEVICE_INVENTORY.names('net')
+    if net_devices is None:
         info.severity = SEVERITY_WARN
         info.data['Status'] = "Network interface information not available"
         return info
     
     interfaces = []
-    net_devices = os.listdir(net_path)
-    
     for dev in net_devices:
-        dev_path = os.path.join(net_path, dev)
-        if dev == 'lo' or (verbosity < VERBOSITY_FULL and not os.path.exists(os.path.join(dev_path, 'device'))):
+        if dev == 'lo' or (verbosity < VERBOSITY_FULL and not is_physical_interface(dev, net_path)):
             continue
         
         interface_info = parse_network_device(dev, net_path, verbosity)
@@ -848,20 +3082,57 @@ def collect_network_information(verbosity):
     else:
         info.data['Interfaces'] = interface_display
     
-    # Optional: lspci for Ethernet
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v lspci'):
-        lspci_eth = run_command_safe('lspci | grep -i ethernet')
-        if lspci_eth:
-            info.data['PCI Ethernet Devices'] = lspci_eth
+    # Traffic, drop and error rates from /proc/net/dev deltas
+    if verbosity >= VERBOSITY_DETAILED:
+        add_network_traffic_info(info, verbosity)
+    
+    # Optional: network controllers from the shared PCI enumeration
+    if verbosity >= VERBOSITY_DETAILED:
+        pci_network = [d.describe() for d in get_pci_devices(PCI_CLASS_NETWORK)]
+        if pci_network:
+            info.data['PCI Ethernet Devices'] = pci_network
 
     # Optional: ip link show
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v ip'):
-        ip_link = run_command_safe('ip link show')
+    if verbosity >= VERBOSITY_DETAILED and tool_available('ip'):
+        ip_link = run_command_safe(['ip', 'link', 'show'])
         if ip_link:
             info.data['IP Link Summary'] = ip_link
     
     return info
 
+def add_network_traffic_info(info, verbosity):
+    """Add per-interface throughput, packet, drop, error and utilization rates."""
+    sampler = NetDevSampler(include_queues=verbosity >= VERBOSITY_FULL)
+    sampler.sample_rates()
+    time.sleep(SAMPLE_PAUSE)
+    rates = sampler.sample_rates()
+    if verbosity < VERBOSITY_FULL:
+        rates = OrderedDict((name, r) for name, r in rates.items() if sampler.is_physical(name))
+    if not rates:
+        return
+    
+    info.data['Interface Traffic'] = [format_net_rates(name, r) for name, r in rates.items()]
+    
+    if verbosity >= VERBOSITY_FULL:
+        error_totals = []
+        for name in rates:
+            if sampler.is_physical(name):
+                counters = sampler.last_extra.get(name, {})
+                error_totals.extend(f"{name} {key.split(':', 1)[1]}: {value}"
+                                    for key, value in counters.items()
+                                    if key.startswith('error:') and value)
+        if error_totals:
+            info.data['NIC Error Counters'] = error_totals
+        queues = [f"{name} {queue}: {bytes_to_human(value)} in flight"
+                  for name, r in rates.items() for queue, value in r.queue_inflight.items()]
+        if queues:
+            info.data['TX Queues'] = queues
+
+def is_physical_interface(dev, net_path=HOTPLUG_SUBSYSTEMS['net']):
+    """Check whether a network interface is backed by a device (cached per hotplug)."""
+    return DEVICE_INVENTORY.entry('net', dev, 'physical',
+                                  lambda: os.path.exists(host_path(os.path.join(net_path, dev, 'device'))))
+
 def parse_network_device(dev, net_path, verbosity):
     """Parse information for a single network device."""
     dev_path = os.path.join(net_path, dev)
@@ -890,14 +3161,32 @@ def collect_power_information(verbosity):
     """Collect power supply (PSU) information."""
     info = HardwareInfo()
     power_path = '/sys/class/power_supply'
+    rapl = RaplSampler()
     
-    if not os.path.exists(power_path):
+    if not os.path.exists(host_path(power_path)) and not rapl.domains:
         info.severity = SEVERITY_WARN
         info.data['Status'] = "Power supply information not available"
         return info
     
+    if os.path.exists(host_path(power_path)):
+        add_power_supply_info(info, power_path, verbosity)
+    
+    # CPU package/DRAM power draw from RAPL energy counters
+    if rapl.domains:
+        add_rapl_power_info(info, rapl, verbosity)
+    
+    # Optional: power supply units from the shared DMI table
+    if verbosity >= VERBOSITY_FULL:
+        psus = [format_dmi_power_supply(r) for r in get_dmi_records(DMI_TYPE_POWER_SUPPLY)]
+        if psus:
+            info.data['Power Supply Details (DMI)'] = psus
+    
+    return info
+
+def add_power_supply_info(info, power_path, verbosity):
+    """Add the batteries, AC adapters and USB supplies from /sys/class/power_supply."""
     supplies = []
-    power_devices = os.listdir(power_path)
+    power_devices = os.listdir(host_path(power_path))
     
     for sup in power_devices:
         sup_info = parse_power_device(sup, power_path, verbosity)
@@ -912,14 +3201,34 @@ def collect_power_information(verbosity):
     ]
     
     info.data['Power Supplies'] = supply_display
+
+def add_rapl_power_info(info, rapl, verbosity):
+    """Add RAPL domains and, at --vv, their power draw over a short interval."""
+    info.data['RAPL Domains'] = len(rapl.domains)
+    if verbosity < VERBOSITY_DETAILED:
+        return
     
-    # Optional: dmidecode for power-supply
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v dmidecode'):
-        dmidecode_psu = run_command_safe('dmidecode -t power-supply')
-        if dmidecode_psu:
-            info.data['Power Supply Details (DMI)'] = dmidecode_psu[:200] + "..." if len(dmidecode_psu) > 200 else dmidecode_psu
+    samples = sample_over_interval(rapl)
+    if rapl.unreadable:
+        info.data['RAPL Energy Counters'] = "Permission denied (root required)"
+    if not samples:
+        return
     
-    return info
+    info.data['RAPL Power Draw'] = [Metric.from_sample(s) for s in samples]
+    packages = [s.value for s in samples if s.labels['domain'].startswith('package') and '/' not in s.labels['domain']]
+    if packages:
+        info.data['Total Package Power'] = Metric('power.package', sum(packages), 'W')
+
+def format_dmi_power_supply(psu):
+    """Format a DMI system power supply record for display."""
+    name = psu.get('Name') or psu.get('Location') or 'PSU'
+    model = ' '.join(str(v) for v in (psu.get('Manufacturer'), psu.get('Model Part Number')) if v)
+    details = [model] if model else []
+    if psu.get('Max Power Capacity'):
+        details.append(f"{psu.get('Max Power Capacity')} W")
+    if psu.get('Status'):
+        details.append(psu.get('Status'))
+    return f"{name}: {', '.join(details)}" if details else name
 
 def parse_power_device(sup, power_path, verbosity):
     """Parse information for a single power supply device."""
@@ -956,14 +3265,16 @@ def collect_cooling_information(verbosity):
     """Collect cooling system information."""
     info = HardwareInfo()
     thermal_path = '/sys/class/thermal'
+    hwmon_readings = read_hwmon_sensors()
     
-    if not os.path.exists(thermal_path):
+    if not os.path.exists(host_path(thermal_path)) and not hwmon_readings:
         info.severity = SEVERITY_WARN
         info.data['Status'] = "Cooling information not available"
         return info
     
     zones = []
-    zone_dirs = [z for z in os.listdir(thermal_path) if z.startswith('thermal_zone')]
+    zone_dirs = ([z for z in os.listdir(host_path(thermal_path)) if z.startswith('thermal_zone')]
+                 if os.path.exists(host_path(thermal_path)) else [])
     
     for zone in zone_dirs:
         zone_info = parse_thermal_zone(zone, thermal_path, verbosity)
@@ -980,7 +3291,8 @@ def collect_cooling_information(verbosity):
     info.data['Thermal Zones'] = zone_display
     
     # Cooling devices
-    cooling_devices = [c for c in os.listdir(thermal_path) if c.startswith('cooling_device')]
+    cooling_devices = ([c for c in os.listdir(host_path(thermal_path)) if c.startswith('cooling_device')]
+                       if os.path.exists(host_path(thermal_path)) else [])
     info.data['Cooling Devices'] = len(cooling_devices)
     
     if verbosity >= VERBOSITY_FULL:
@@ -994,152 +3306,2665 @@ def collect_cooling_information(verbosity):
             cooling_display.append(f"... (+{len(cooling_devices) - 3} more)")
         info.data['Cooling Device Details'] = cooling_display
     
-    # Optional: sensors if lm-sensors installed
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v sensors'):
-        sensors_output = run_command_safe('sensors')
-        if sensors_output:
-            info.data['Sensors Output'] = sensors_output[:200] + "..." if len(sensors_output) > 200 else sensors_output
+    # Hardware monitoring chips (replaces parsing lm-sensors output)
+    if hwmon_readings:
+        add_hwmon_info(info, hwmon_readings, verbosity)
     
-    # Set severity based on temperatures
+    # Set severity from the alert rules for every temperature
+    temperatures = [('thermal.temperature', OrderedDict([('zone', z['name']), ('type', z.get('type'))]), z['temp'])
+                    for z in zones if isinstance(z.get('temp'), (int, float))]
+    temperatures.extend(('hwmon.temperature', OrderedDict([('chip', sensor.chip), ('sensor', sensor.label)]), value)
+                        for sensor, value, _ in hwmon_readings if sensor.kind == 'temp')
     high_temp = False
-    for z in zones:
-        if 'temp' in z and isinstance(z['temp'], (int, float)) and z['temp'] > 80:
+    for name, labels, temp in temperatures:
+        severity = ALERT_RULES.classify(name, labels, temp)
+        info.severity = worse_severity(info.severity, severity)
+        high_temp = high_temp or severity == SEVERITY_CRITICAL
+    
+    # Chip-reported limits and alarms override the generic thresholds
+    for sensor, value, alarm in hwmon_readings:
+        if alarm or (sensor.crit is not None and value >= sensor.crit):
             info.severity = SEVERITY_CRITICAL
-            high_temp = True
-            break
-        elif 'temp' in z and isinstance(z['temp'], (int, float)) and z['temp'] > 70:
+            high_temp = high_temp or sensor.kind == 'temp'
+        elif sensor.max is not None and value >= sensor.max and info.severity != SEVERITY_CRITICAL:
             info.severity = SEVERITY_WARN
     if high_temp:
         info.data['Temperature Status'] = "High temperatures detected"
     
     return info
 
-def parse_thermal_zone(zone, thermal_path, verbosity):
-    """Parse information for a single thermal zone."""
-    zone_path = os.path.join(thermal_path, zone)
-    zone_info = {'name': zone}
-    
-    type_ = read_file_safe(f'{zone_path}/type')
-    if type_:
-        zone_info['type'] = type_
-    
-    temp = read_file_safe(f'{zone_path}/temp')
-    if temp:
+def add_hwmon_info(info, readings, verbosity):
+    """Add hwmon temperatures and fans, plus voltages, power and currents at --vv."""
+    chips = sorted({sensor.chip for sensor, _, _ in readings})
+    info.data['Sensor Chips'] = f"{len(chips)} ({', '.join(chips)})"
+    
+    temperatures = [value for sensor, value, _ in readings if sensor.kind == 'temp']
+    if temperatures:
+        info.data['Max Temperature'] = Metric('cooling.max_temp', max(temperatures), '°C')
+    
+    shown_kinds = ['temp', 'fan'] + (['in', 'power', 'curr'] if verbosity >= VERBOSITY_DETAILED else [])
+    for kind in shown_kinds:
+        lines = [sensor.describe(value, alarm) for sensor, value, alarm in readings if sensor.kind == kind]
+        if lines:
+            info.data[HWMON_SECTION_TITLES[kind]] = lines
+    
+    alarms = [f"{sensor.chip}/{sensor.label}" for sensor, _, alarm in readings if alarm]
+    if alarms:
+        info.data['Sensor Alarms'] = alarms
+
+def parse_thermal_zone(zone, thermal_path, verbosity):
+    """Parse information for a single thermal zone."""
+    zone_path = os.path.join(thermal_path, zone)
+    zone_info = {'name': zone}
+    
+    type_ = read_file_safe(f'{zone_path}/type')
+    if type_:
+        zone_info['type'] = type_
+    
+    temp = read_file_safe(f'{zone_path}/temp')
+    if temp:
+        try:
+            zone_info['temp'] = float(int(temp) / 1000.0)
+        except ValueError:
+            pass
+    
+    if verbosity >= VERBOSITY_DETAILED:
+        trip_points = read_file_safe(f'{zone_path}/trip_point_0_temp')
+        if trip_points:
+            try:
+                zone_info['trip_point'] = f"{int(trip_points) / 1000:.1f} °C"
+            except ValueError:
+                pass
+    
+    return zone_info
+
+def collect_peripherals_information(verbosity):
+    """Collect peripherals information (USB, etc.)."""
+    info = HardwareInfo()
+    
+    peripherals = USB_DEVICES.get()
+    if peripherals is None:
+        info.severity = SEVERITY_WARN
+        info.data['Status'] = "Peripherals information not available"
+        return info
+    
+    info.data['Total USB Devices'] = len(peripherals)
+    
+    peripheral_display = [
+        f"{p['name']} ({p.get('product', 'Unknown')}) - {p.get('manufacturer', 'Unknown')}"
+        for p in peripherals
+    ]
+    
+    if len(peripheral_display) > 5 and verbosity < VERBOSITY_FULL:
+        info.data['Peripherals'] = peripheral_display[:5] + [f"... (+{len(peripheral_display) - 5} more)"]
+    else:
+        info.data['Peripherals'] = peripheral_display
+    
+    # Optional: lsusb if available
+    if verbosity >= VERBOSITY_DETAILED and tool_available('lsusb'):
+        lsusb_output = run_command_cached('lsusb', ['lsusb'])
+        if lsusb_output:
+            info.data['LSUSB Summary'] = lsusb_output
+
+    # Optional: lsusb -t
+    if verbosity >= VERBOSITY_FULL and tool_available('lsusb'):
+        lsusb_t = run_command_cached('lsusb_tree', ['lsusb', '-t'])
+        if lsusb_t:
+            info.data['LSUSB Topology'] = lsusb_t
+    
+    return info
+
+def parse_usb_device(dev, usb_path):
+    """Parse information for a single USB device."""
+    dev_path = os.path.join(usb_path, dev)
+    dev_info = {'name': dev}
+    
+    product = read_file_safe(f'{dev_path}/product')
+    if product:
+        dev_info['product'] = product
+    
+    manufacturer = read_file_safe(f'{dev_path}/manufacturer')
+    if manufacturer:
+        dev_info['manufacturer'] = manufacturer
+    
+    serial = read_file_safe(f'{dev_path}/serial')
+    if serial:
+        dev_info['serial'] = serial
+    
+    speed = read_file_safe(f'{dev_path}/speed')
+    if speed:
+        dev_info['speed'] = f"{speed} Mb/s"
+    
+    return dev_info if 'product' in dev_info or 'manufacturer' in dev_info else None
+
+def enumerate_usb_devices(usb_path=USB_DEVICES_PATH):
+    """List USB devices (not interfaces or root hubs) with their strings, or None."""
+    names = DEVICE_INVENTORY.names('usb')
+    if names is None:
+        return None
+    devices = (DEVICE_INVENTORY.entry('usb', dev, 'device', lambda: parse_usb_device(dev, usb_path))
+               for dev in names if not dev.startswith('usb') or ':' in dev)
+    return [device for device in devices if device]
+
+USB_DEVICES = SharedSource(enumerate_usb_devices, 'usb')
+
+def collect_pci_information(verbosity):
+    """Collect PCI devices information."""
+    info = HardwareInfo()
+    
+    if not os.path.isdir(host_path(PCI_DEVICES_PATH)):
+        info.severity = SEVERITY_WARN
+        info.data['Status'] = "PCI information not available"
+        return info
+    
+    devices = get_pci_devices()
+    info.data['Total PCI Devices'] = len(devices)
+    info.data['PCI Devices Summary'] = [d.describe() for d in devices]
+    
+    if verbosity >= VERBOSITY_DETAILED:
+        classes = OrderedDict()
+        for device in devices:
+            classes[device.class_name] = classes.get(device.class_name, 0) + 1
+        info.data['Devices by Class'] = classes
+        info.data['PCI Detailed'] = [format_pci_details(d) for d in devices]
+    
+    if verbosity >= VERBOSITY_FULL:
+        downgraded = [f"{d.address}: {d.link_status()}" for d in devices if d.is_link_downgraded()]
+        info.data['Downgraded PCIe Links'] = downgraded or ["None"]
+        if PCI_IDS.get() is None:
+            info.data['Device Names'] = "pci.ids not found, showing numeric IDs"
+    
+    return info
+
+def format_pci_details(device):
+    """Format driver, NUMA node and link details for a PCI device."""
+    details = [f"driver {device.driver or 'none'}"]
+    if device.numa_node is not None:
+        details.append(f"NUMA node {device.numa_node}")
+    link = device.link_status()
+    if link:
+        details.append(f"link {link}")
+    return f"{device.address}: {', '.join(details)}"
+
+####################
+# DYNAMIC SAMPLERS #
+####################
+
+Sample = namedtuple('Sample', ['name', 'labels', 'value', 'unit'])
+
+def format_sample_value(value, unit):
+    """Format a sampled numeric value with its unit for display."""
+    if unit == 'B':
+        return bytes_to_human(value)
+    if unit == '%':
+        return f"{value:.1f}%"
+    if unit == 'B/s':
+        return f"{bytes_to_human(value)}/s"
+    if unit == '°C':
+        return f"{value:.1f} °C"
+    if unit == 'state':
+        return "Up" if value else "Down"
+    if unit == 's':
+        seconds = int(value)
+        return f"{seconds // 86400}d {seconds % 86400 // 3600}h {seconds % 3600 // 60}m"
+    if unit:
+        return f"{value:.0f} {unit}" if float(value).is_integer() else f"{value:.2f} {unit}"
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:.2f}"
+
+def summarize_samples(samples, names):
+    """Collapse per-device series of the given names into min/avg/max samples."""
+    summarized = []
+    groups = OrderedDict()
+    for sample in samples:
+        if sample.name in names:
+            if sample.name not in groups:
+                groups[sample.name] = []
+                summarized.append(sample.name)
+            groups[sample.name].append(sample)
+        else:
+            summarized.append(sample)
+    
+    result = []
+    for item in summarized:
+        if not isinstance(item, str):
+            result.append(item)
+            continue
+        group = groups[item]
+        values = [s.value for s in group]
+        unit = group[0].unit
+        result.append(Sample(item, OrderedDict([('stat', 'min')]), min(values), unit))
+        result.append(Sample(item, OrderedDict([('stat', 'avg')]), sum(values) / len(values), unit))
+        busiest = max(group, key=lambda s: s.value)
+        result.append(Sample(item, OrderedDict([('stat', 'max'), ('cpu', busiest.labels.get('cpu'))]),
+                             busiest.value, unit))
+    return result
+
+def format_sample_label(sample):
+    """Build the display label of a sample from its name and labels."""
+    label = SAMPLE_LABELS.get(sample.name, sample.name)
+    if sample.labels:
+        label += f" [{', '.join(str(v) for v in sample.labels.values())}]"
+    return label
+
+class LoadSampler:
+    """Samples the system load averages."""
+    
+    def sample(self):
+        load_avg = read_file_safe('/proc/loadavg', persistent=True)
+        if not load_avg:
+            return []
+        loads = load_avg.split()[:3]
+        return [Sample(f'os.load{period}', {}, float(value), '')
+                for period, value in zip((1, 5, 15), loads)]
+
+class MemorySampler:
+    """Samples RAM and swap usage."""
+    
+    def sample(self):
+        mem_data = parse_meminfo(read_lines_safe('/proc/meminfo', persistent=True))
+        total_mem = mem_data.get('MemTotal', 0)
+        if not total_mem:
+            return []
+        available_mem = mem_data.get('MemAvailable', mem_data.get('MemFree', 0))
+        samples = [
+            Sample('memory.usage', {}, (total_mem - available_mem) / total_mem * 100, '%'),
+            Sample('memory.available', {}, available_mem, 'B'),
+        ]
+        swap_total = mem_data.get('SwapTotal', 0)
+        if swap_total:
+            swap_used = swap_total - mem_data.get('SwapFree', 0)
+            samples.append(Sample('memory.swap_usage', {}, swap_used / swap_total * 100, '%'))
+        return samples
+
+class TemperatureSampler:
+    """Samples thermal zone temperatures; zones are discovered once."""
+    
+    def __init__(self, thermal_path='/sys/class/thermal'):
+        self.zones = []
+        if os.path.isdir(host_path(thermal_path)):
+            for zone in sorted(os.listdir(host_path(thermal_path))):
+                if zone.startswith('thermal_zone'):
+                    zone_path = os.path.join(thermal_path, zone)
+                    zone_type = read_file_safe(f'{zone_path}/type') or zone
+                    self.zones.append((zone, zone_type, f'{zone_path}/temp'))
+    
+    def sample(self):
+        samples = []
+        for zone, zone_type, temp_path in self.zones:
+            temp = read_file_safe(temp_path, persistent=True)
+            if temp and temp.lstrip('-').isdigit():
+                samples.append(Sample('thermal.temperature', OrderedDict([('zone', zone), ('type', zone_type)]),
+                                      int(temp) / 1000.0, '°C'))
+        return samples
+
+class HwmonSampler:
+    """Samples every hwmon temperature, fan, voltage, power and current input."""
+    
+    def sample(self):
+        samples = []
+        for sensor, value, _ in read_hwmon_sensors():
+            labels = OrderedDict([('chip', sensor.chip), ('sensor', sensor.label)])
+            samples.append(Sample(HWMON_SAMPLE_NAMES[sensor.kind], labels, value, sensor.unit))
+        return samples
+
+class RaplDomain:
+    """A powercap RAPL zone (package, core, uncore, dram or psys)."""
+    
+    __slots__ = ('zone', 'name', 'energy_path', 'max_range')
+    
+    def __init__(self, zone, name, energy_path, max_range):
+        self.zone = zone
+        self.name = name
+        self.energy_path = energy_path
+        self.max_range = max_range
+
+def discover_rapl_domains(powercap_path=POWERCAP_PATH):
+    """Find the enabled RAPL zones; sub-zones are named after their package (package-0/dram).
+    
+    intel-rapl-mmio zones expose the same package counters as the MSR based
+    intel-rapl zones under the same name. When both exist the MSR zone wins
+    and the MMIO duplicate is skipped, so no package is counted twice.
+    """
+    if not os.path.isdir(host_path(powercap_path)):
+        return []
+    
+    names = {}
+    domains = []
+    taken = set()
+    zones = [z for z in os.listdir(host_path(powercap_path)) if RAPL_ZONE_PATTERN.match(z)]
+    for zone in sorted(zones, key=lambda z: ([int(n) for n in re.findall(r'\d+', z)], 'mmio' in z)):
+        zone_path = os.path.join(powercap_path, zone)
+        if read_file_safe(f'{zone_path}/enabled') == '0':
+            continue
+        name = read_file_safe(f'{zone_path}/name') or zone
+        names[zone] = name
+        parent = zone.rpartition(':')[0]
+        if parent in names:
+            name = f'{names[parent]}/{name}'
+        if name in taken:
+            continue
+        taken.add(name)
+        max_range = read_int_safe(f'{zone_path}/max_energy_range_uj')
+        domains.append(RaplDomain(zone, name, f'{zone_path}/energy_uj', max_range))
+    return domains
+
+class RaplSampler:
+    """Power draw per RAPL domain from energy_uj deltas between samples.
+    
+    The energy counters wrap at max_energy_range_uj, which is added back when a
+    counter went backwards. Since kernel 5.10 energy_uj is only readable by
+    root; unreadable domains are reported through self.unreadable.
+    """
+    
+    def __init__(self, powercap_path=POWERCAP_PATH):
+        self.domains = discover_rapl_domains(powercap_path)
+        self.unreadable = []
+        self._previous = None
+        self._previous_time = None
+    
+    def read_energy(self):
+        """Return the raw energy_uj counter of every domain (None when unreadable)."""
+        values = []
+        for content in FILE_READER.read_batch([domain.energy_path for domain in self.domains]):
+            try:
+                values.append(int(content))
+            except (TypeError, ValueError):
+                values.append(None)
+        self.unreadable = [d.name for d, value in zip(self.domains, values) if value is None]
+        return values
+    
+    def sample_watts(self):
+        """Return [(domain, watts)] since the previous call (empty on the first)."""
+        now = time.monotonic()
+        energy = self.read_energy()
+        previous, previous_time = self._previous, self._previous_time
+        self._previous, self._previous_time = energy, now
+        if previous is None or now <= previous_time:
+            return []
+        
+        elapsed = now - previous_time
+        watts = []
+        for domain, current, prior in zip(self.domains, energy, previous):
+            if current is None or prior is None:
+                continue
+            delta = current - prior
+            if delta < 0:
+                if not domain.max_range:
+                    continue
+                delta += domain.max_range
+            watts.append((domain, delta / 1e6 / elapsed))
+        return watts
+    
+    def sample(self):
+        return [Sample('power.rapl', {'domain': domain.name}, value, 'W')
+                for domain, value in self.sample_watts()]
+    
+    def counter_samples(self):
+        """Return the cumulative energy of the latest read (wraps at max_energy_range_uj)."""
+        return [Sample('power.energy_joules_total', {'domain': domain.name}, value / 1e6, '')
+                for domain, value in zip(self.domains, self._previous or []) if value is not None]
+
+class CpuFreqPolicy:
+    """A cpufreq policy and the logical CPUs that share its frequency."""
+    
+    __slots__ = ('name', 'cpus', 'governor', 'min_freq', 'max_freq', 'hw_max_freq', 'cur_path')
+    
+    def __init__(self, name, cpus, cur_path):
+        self.name = name
+        self.cpus = cpus
+        self.cur_path = cur_path
+        self.governor = None
+        self.min_freq = None
+        self.max_freq = None
+        self.hw_max_freq = None
+    
+    def is_capped(self):
+        """Check whether scaling_max_freq is limited below the hardware maximum."""
+        return bool(self.max_freq and self.hw_max_freq and self.max_freq < self.hw_max_freq)
+
+class CpuFreqSampler:
+    """Samples the current frequency of every logical CPU in one batch.
+    
+    Policies are discovered once with their governor and min/max limits; each
+    sample then does a single persistent read per policy and expands it to all
+    CPUs of the policy, so the cost scales with policies rather than CPUs.
+    """
+    
+    def __init__(self, cpu_path=CPU_SYSFS_PATH, topology=None):
+        self.cpu_path = cpu_path
+        self.policies = self._discover_policies()
+        self.cpu_count = sum(len(policy.cpus) for policy in self.policies)
+        if topology is None:
+            topology = CPU_TOPOLOGY.get() if cpu_path == CPU_SYSFS_PATH else read_cpu_topology(cpu_path)
+        self.sockets = {cpu: topology.package_of(cpu) for policy in self.policies for cpu in policy.cpus}
+        self._cur_paths = [policy.cur_path for policy in self.policies]
+        self._policy_cpus = [policy.cpus for policy in self.policies]
+        self._frequencies = array('d', bytes(self.cpu_count * 8))
+    
+    def _discover_policies(self):
+        policies = []
+        policy_dirs = host_glob(f'{self.cpu_path}/cpufreq/policy[0-9]*')
+        for policy_dir in sorted(policy_dirs, key=lambda p: int(re.search(r'(\d+)$', p).group(1))):
+            cpus = parse_cpu_list(read_file_safe(f'{policy_dir}/affected_cpus')
+                                  or read_file_safe(f'{policy_dir}/related_cpus'))
+            if cpus:
+                policies.append(self._load_policy(os.path.basename(policy_dir), cpus, policy_dir))
+        
+        if not policies:
+            # Older kernels only expose per-CPU cpufreq directories
+            for cpufreq_dir in host_glob(f'{self.cpu_path}/cpu[0-9]*/cpufreq'):
+                cpu = int(re.search(r'cpu(\d+)/cpufreq$', cpufreq_dir).group(1))
+                policies.append(self._load_policy(f'cpu{cpu}', [cpu], cpufreq_dir))
+            policies.sort(key=lambda policy: policy.cpus[0])
+        return policies
+    
+    @staticmethod
+    def _load_policy(name, cpus, policy_dir):
+        policy = CpuFreqPolicy(name, cpus, f'{policy_dir}/scaling_cur_freq')
+        policy.governor = read_file_safe(f'{policy_dir}/scaling_governor')
+        for attr, filename in (('min_freq', 'scaling_min_freq'), ('max_freq', 'scaling_max_freq'),
+                               ('hw_max_freq', 'cpuinfo_max_freq')):
+            value = read_file_safe(f'{policy_dir}/{filename}')
+            if value and value.isdigit():
+                setattr(policy, attr, int(value) / 1000.0)
+        return policy
+    
+    def read_frequencies(self):
+        """Return (cpus, frequencies in MHz) for every CPU with a readable policy."""
+        cpus = []
+        frequencies = self._frequencies
+        index = 0
+        contents = FILE_READER.read_batch(self._cur_paths)
+        for policy_cpus, content in zip(self._policy_cpus, contents):
+            try:
+                mhz = int(content) / 1000.0
+            except (TypeError, ValueError):
+                continue
+            for cpu in policy_cpus:
+                frequencies[index] = mhz
+                index += 1
+            cpus.extend(policy_cpus)
+        return cpus, frequencies[:index]
+    
+    def summarize(self):
+        """Return the frequency distribution of all CPUs, or None without cpufreq."""
+        cpus, frequencies = self.read_frequencies()
+        if not frequencies:
+            return None
+        
+        ordered = sorted(frequencies)
+        summary = OrderedDict([
+            ('count', len(ordered)),
+            ('min', ordered[0]),
+            ('median', percentile(ordered, 50)),
+            ('p95', percentile(ordered, 95)),
+            ('max', ordered[-1]),
+        ])
+        
+        low = min([p.min_freq for p in self.policies if p.min_freq] or [ordered[0]])
+        high = max([p.hw_max_freq or p.max_freq for p in self.policies if p.hw_max_freq or p.max_freq]
+                   or [ordered[-1]])
+        summary['histogram'] = build_histogram(ordered, min(low, ordered[0]), max(high, ordered[-1]),
+                                               CPU_FREQ_HISTOGRAM_BUCKETS)
+        
+        per_socket = OrderedDict()
+        for cpu, mhz in zip(cpus, frequencies):
+            per_socket.setdefault(self.sockets.get(cpu, 0), []).append(mhz)
+        summary['sockets'] = OrderedDict(
+            (socket, percentile(sorted(values), 50)) for socket, values in sorted(per_socket.items()))
+        return summary
+    
+    def sample(self):
+        summary = self.summarize()
+        if summary is None:
+            return []
+        samples = [Sample('cpu.frequency', {'stat': stat}, summary[stat], 'MHz')
+                   for stat in ('min', 'median', 'p95', 'max')]
+        if len(summary['sockets']) > 1:
+            samples.extend(Sample('cpu.socket_frequency', {'socket': socket}, mhz, 'MHz')
+                           for socket, mhz in summary['sockets'].items())
+        return samples
+
+def percentile(sorted_values, pct):
+    """Return the nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def build_histogram(sorted_values, low, high, buckets):
+    """Count sorted values into equal-width buckets; return (low, high, count) tuples."""
+    if high <= low:
+        return [(low, high, len(sorted_values))]
+    width = (high - low) / buckets
+    edges = [bisect.bisect_left(sorted_values, low + i * width) for i in range(1, buckets)]
+    edges = [0] + edges + [len(sorted_values)]
+    return [(low + i * width, low + (i + 1) * width, edges[i + 1] - edges[i]) for i in range(buckets)]
+
+class LinkStateSampler:
+    """Samples carrier state and speed of physical network interfaces."""
+    
+    def __init__(self, net_path=HOTPLUG_SUBSYSTEMS['net']):
+        self.net_path = net_path
+        self.interfaces = []
+        self.discover()
+    
+    def on_hotplug(self, action, name):
+        self.discover()
+    
+    def discover(self):
+        """(Re)build the list of physical interfaces."""
+        self.interfaces = [(dev, os.path.join(self.net_path, dev))
+                           for dev in DEVICE_INVENTORY.names('net') or []
+                           if dev != 'lo' and is_physical_interface(dev, self.net_path)]
+    
+    def sample(self):
+        samples = []
+        for dev, dev_path in self.interfaces:
+            labels = {'interface': dev}
+            carrier = read_file_safe(f'{dev_path}/carrier', persistent=True)
+            samples.append(Sample('network.link', labels, 1 if carrier == '1' else 0, 'state'))
+            if carrier != '1':
+                continue
+            # speed fails with EINVAL on a link without carrier
+            speed = read_file_safe(f'{dev_path}/speed', persistent=True)
+            if speed and speed.isdigit():
+                samples.append(Sample('network.speed', labels, int(speed), 'Mb/s'))
+        return samples
+
+class CpuStatSampler:
+    """Per-core and aggregate CPU time breakdown from /proc/stat deltas.
+    
+    Counters of all CPUs are kept in one flat array('Q') with a fixed stride
+    of CPU_STAT_FIELDS per row, so the delta of a whole sample is computed in
+    one pass without per-core dictionaries.
+    """
+    
+    def __init__(self, stat_path='/proc/stat'):
+        self.stat_path = stat_path
+        self.cpus = []
+        self._previous = None
+    
+    def read_counters(self):
+        """Read the cpu lines of /proc/stat into (names, flat counter array)."""
+        content = read_file_safe(self.stat_path, persistent=True)
+        if not content:
+            return None, None
+        
+        stride = len(CPU_STAT_FIELDS)
+        names = []
+        counters = array('Q')
+        for line in content.split('\n'):
+            if not line.startswith('cpu'):
+                break
+            values = line.split()
+            names.append('all' if values[0] == 'cpu' else values[0])
+            row = values[1:stride + 1]
+            counters.extend(int(v) for v in row)
+            if len(row) < stride:
+                counters.extend([0] * (stride - len(row)))
+        return names, counters
+    
+    def sample_usage(self):
+        """Return (cpu names, flat percentage array) since the previous call.
+        
+        The first call only records a baseline and returns (names, None), as
+        does any call after the set of online CPUs changed.
+        """
+        names, counters = self.read_counters()
+        previous, self._previous = self._previous, counters
+        if counters is None or previous is None or names != self.cpus:
+            self.cpus = names or []
+            return self.cpus, None
+        
+        stride = len(CPU_STAT_FIELDS)
+        # iowait can go backwards on some kernels, so negative deltas are clamped
+        deltas = array('d', (max(0, current - prior) for current, prior in zip(counters, previous)))
+        percentages = array('d', bytes(len(deltas) * deltas.itemsize))
+        idle_index = CPU_STAT_FIELDS.index('idle')
+        for offset in range(0, len(deltas), stride):
+            total = sum(deltas[offset:offset + stride])
+            if total > 0:
+                scale = 100.0 / total
+                for i in range(offset, offset + stride):
+                    percentages[i] = deltas[i] * scale
+            else:
+                # No tick elapsed (very short interval or a static snapshot): report idle
+                percentages[offset + idle_index] = 100.0
+        return names, percentages
+    
+    def sample(self):
+        """Return aggregate mode percentages and per-core busy/iowait/steal samples."""
+        names, percentages = self.sample_usage()
+        if percentages is None:
+            return []
+        
+        stride = len(CPU_STAT_FIELDS)
+        idle_index = CPU_STAT_FIELDS.index('idle')
+        samples = []
+        for row, cpu in enumerate(names):
+            offset = row * stride
+            values = percentages[offset:offset + stride]
+            busy = 100.0 - values[idle_index] - values[CPU_STAT_FIELDS.index('iowait')]
+            if cpu == 'all':
+                samples.append(Sample('cpu.usage', {'cpu': cpu}, busy, '%'))
+                for mode in CPU_USAGE_MODES:
+                    samples.append(Sample(f'cpu.{mode}', {'cpu': cpu}, values[CPU_STAT_FIELDS.index(mode)], '%'))
+            else:
+                samples.append(Sample('cpu.core_usage', {'cpu': cpu}, busy, '%'))
+                samples.append(Sample('cpu.core_iowait', {'cpu': cpu}, values[CPU_STAT_FIELDS.index('iowait')], '%'))
+                samples.append(Sample('cpu.core_steal', {'cpu': cpu}, values[CPU_STAT_FIELDS.index('steal')], '%'))
+        return samples
+
+def sample_over_interval(sampler, interval=None):
+    """Take a baseline sample, wait interval seconds (SAMPLE_PAUSE) and return the rate samples."""
+    sampler.sample()
+    time.sleep(SAMPLE_PAUSE if interval is None else interval)
+    return sampler.sample()
+
+class DiskStatsSampler:
+    """Per-disk IOPS, throughput, latency and utilization from /proc/diskstats deltas.
+    
+    The whole file is fetched with a single persistent read per sample. The
+    counter columns of each disk are kept as the raw text and only parsed when
+    they changed since the previous sample, so thousands of idle dm/multipath
+    devices cost a string comparison each. Partitions are resolved to their
+    parent disk once per device name and rolled up under it, since the
+    whole-disk counters already include them.
+    """
+    
+    def __init__(self, diskstats_path=DISKSTATS_PATH, block_path='/sys/class/block',
+                 include_virtual=False):
+        self.diskstats_path = diskstats_path
+        self.block_path = block_path
+        self.include_virtual = include_virtual
+        self.partitions = OrderedDict()
+        self._parents = {}
+        self._previous = None
+        self._previous_time = None
+    
+    def parent_of(self, name):
+        """Return the parent disk of a partition, or None for whole disks (cached)."""
+        if name not in self._parents:
+            parent = None
+            device_path = os.path.join(self.block_path, name)
+            if os.path.exists(host_path(os.path.join(device_path, 'partition'))):
+                parent = os.path.basename(os.path.dirname(os.path.realpath(host_path(device_path))))
+            self._parents[name] = parent
+        return self._parents[name]
+    
+    def read_counters(self):
+        """Return {disk: counter columns as text}, in /proc/diskstats layout without the name."""
+        # One record per block device: with thousands of dm/multipath devices this spans
+        # many seq_file pages, which the persistent reader reads up to EOF
+        content = read_file_safe(self.diskstats_path, persistent=True)
+        if content is None:
+            return self._read_sysfs_counters()
+        
+        counters = OrderedDict()
+        partitions = OrderedDict()
+        skip_virtual = not self.include_virtual
+        for line in content.split('\n'):
+            fields = line.split(None, 3)
+            if len(fields) < 4:
+                continue
+            name = fields[2]
+            if skip_virtual and name.startswith(DISK_VIRTUAL_PREFIXES):
+                continue
+            parent = self._parents[name] if name in self._parents else self.parent_of(name)
+            if parent is not None:
+                partitions.setdefault(parent, []).append(name)
+                continue
+            counters[name] = fields[3]
+        self.partitions = partitions
+        return counters
+    
+    def _read_sysfs_counters(self):
+        """Fallback for kernels without /proc/diskstats: read /sys/block/*/stat."""
+        sys_block = os.path.join(os.path.dirname(self.block_path), 'block')
+        if not os.path.isdir(host_path(sys_block)):
+            return None
+        counters = OrderedDict()
+        for name in sorted(os.listdir(host_path(sys_block))):
+            if not self.include_virtual and name.startswith(DISK_VIRTUAL_PREFIXES):
+                continue
+            stat = read_file_safe(f'{sys_block}/{name}/stat', persistent=True)
+            if stat:
+                counters[name] = stat
+        return counters
+    
+    def sample_rates(self):
+        """Return {disk: DiskRates} since the previous call (empty on the first)."""
+        now = time.monotonic()
+        counters = self.read_counters()
+        previous, previous_time = self._previous, self._previous_time
+        self._previous, self._previous_time = counters, now
+        if not counters or previous is None or now <= previous_time:
+            return OrderedDict()
+        
+        elapsed = now - previous_time
+        rates = OrderedDict()
+        for name, columns in counters.items():
+            prior_columns = previous.get(name)
+            if prior_columns is None:
+                continue
+            if columns == prior_columns:
+                # No counter moved, so nothing completed and nothing is in flight
+                rates[name] = DISK_IDLE_RATES
+                continue
+            
+            current = columns.split()
+            prior = prior_columns.split()
+            if len(current) < 11 or len(prior) < 11:
+                continue
+            reads = max(0, int(current[0]) - int(prior[0]))
+            writes = max(0, int(current[4]) - int(prior[4]))
+            ios = reads + writes
+            wait_ms = max(0, int(current[3]) - int(prior[3])) + max(0, int(current[7]) - int(prior[7]))
+            rates[name] = DiskRates(
+                reads / elapsed,
+                writes / elapsed,
+                max(0, int(current[2]) - int(prior[2])) * DISK_SECTOR_SIZE / elapsed,
+                max(0, int(current[6]) - int(prior[6])) * DISK_SECTOR_SIZE / elapsed,
+                wait_ms / ios if ios else 0.0,
+                min(100.0, max(0, int(current[9]) - int(prior[9])) / (elapsed * 10.0)),
+                int(current[8]),
+            )
+        return rates
+    
+    def sample(self):
+        samples = []
+        for name, rates in self.sample_rates().items():
+            labels = {'device': name}
+            for metric, value in zip(DiskRates._fields, rates):
+                samples.append(Sample(f'disk.{metric}', labels, value, DISK_METRIC_UNITS[metric]))
+        return samples
+    
+    def counter_samples(self):
+        """Return the cumulative counters of the latest read as samples."""
+        samples = []
+        for name, columns in (self._previous or {}).items():
+            fields = columns.split()
+            if len(fields) < 11:
+                continue
+            labels = {'device': name}
+            for metric, column, scale, unit in DISK_COUNTER_COLUMNS:
+                samples.append(Sample(f'disk.{metric}', labels, int(fields[column]) * scale, unit))
+        return samples
+
+DiskRates = namedtuple('DiskRates', list(DISK_METRIC_UNITS))
+DISK_IDLE_RATES = DiskRates(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+
+def format_disk_rates(name, rates, partitions=None):
+    """Format the I/O rates of a disk on one line."""
+    text = (f"{name}: r {rates.read_iops:.1f}/s {bytes_to_human(rates.read_bytes)}/s, "
+            f"w {rates.write_iops:.1f}/s {bytes_to_human(rates.write_bytes)}/s, "
+            f"await {rates.await_ms:.2f} ms, util {rates.utilization:.1f}%, "
+            f"queue {rates.queue_depth}")
+    if partitions:
+        text += f" ({len(partitions)} partitions)"
+    return text
+
+class NetDevSampler:
+    """Per-interface traffic, drop and error rates from /proc/net/dev deltas.
+    
+    All interfaces come from one persistent read of /proc/net/dev and are only
+    parsed when their counters changed, so thousands of idle veth/bridge
+    devices stay cheap. Physical NICs additionally get their negotiated speed,
+    the detailed error counters from statistics/ and, when requested, per TX
+    queue counters; those files are kept open and re-read in one batch.
+    """
+    
+    def __init__(self, netdev_path=NETDEV_PATH, net_path='/sys/class/net', include_queues=False):
+        self.netdev_path = netdev_path
+        self.net_path = net_path
+        self.include_queues = include_queues
+        self._physical = {}
+        self._extra_paths = {}
+        self._previous = None
+        self._previous_extra = None
+        self._previous_time = None
+        self.last_extra = {}
+    
+    def on_hotplug(self, action, name):
+        """Drop what was learned about an interface when it is hotplugged or renamed."""
+        self._physical.pop(name, None)
+        self._extra_paths.pop(name, None)
+    
+    def is_physical(self, name):
+        """Check (once per interface) whether an interface is backed by a device."""
+        if name not in self._physical:
+            self._physical[name] = os.path.exists(host_path(os.path.join(self.net_path, name, 'device')))
+        return self._physical[name]
+    
+    def _discover_extra_paths(self, name):
+        """Return [(key, path)] of the per-interface sysfs counters sampled for a NIC."""
+        if name not in self._extra_paths:
+            dev_path = os.path.join(self.net_path, name)
+            paths = [('speed', f'{dev_path}/speed')]
+            paths.extend((f'error:{counter}', f'{dev_path}/statistics/{counter}')
+                         for counter in NET_ERROR_COUNTERS)
+            if self.include_queues:
+                for queue in sorted(host_glob(f'{dev_path}/queues/tx-*')):
+                    queue_name = os.path.basename(queue)
+                    if os.path.exists(host_path(f'{queue}/tx_timeout')):
+                        paths.append((f'error:{queue_name}_tx_timeout', f'{queue}/tx_timeout'))
+                    if os.path.exists(host_path(f'{queue}/byte_queue_limits/inflight')):
+                        paths.append((f'inflight:{queue_name}', f'{queue}/byte_queue_limits/inflight'))
+            self._extra_paths[name] = paths
+        return self._extra_paths[name]
+    
+    def read_counters(self):
+        """Return {interface: counter columns as text} from /proc/net/dev."""
+        # One record per interface: with thousands of veth/bridge devices this spans many
+        # seq_file pages, which the persistent reader reads up to EOF
+        content = read_file_safe(self.netdev_path, persistent=True)
+        if content is None:
+            return None
+        counters = OrderedDict()
+        for line in content.split('\n')[2:]:
+            name, sep, columns = line.partition(':')
+            name = name.strip()
+            if sep and name and name != 'lo':
+                counters[name] = columns
+        return counters
+    
+    def read_extra(self, names):
+        """Batch-read speed, error and queue counters of the physical interfaces."""
+        keys = []
+        paths = []
+        for name in names:
+            if self.is_physical(name):
+                for key, path in self._discover_extra_paths(name):
+                    keys.append((name, key))
+                    paths.append(path)
+        extra = {}
+        for (name, key), content in zip(keys, FILE_READER.read_batch(paths)):
+            try:
+                extra.setdefault(name, {})[key] = int(content)
+            except (TypeError, ValueError):
+                continue
+        return extra
+    
+    def sample_rates(self):
+        """Return {interface: NetRates} since the previous call (empty on the first)."""
+        now = time.monotonic()
+        counters = self.read_counters()
+        extra = self.read_extra(counters) if counters else {}
+        previous, previous_extra, previous_time = self._previous, self._previous_extra, self._previous_time
+        self._previous, self._previous_extra, self._previous_time = counters, extra, now
+        self.last_extra = extra
+        if not counters or previous is None or now <= previous_time:
+            return OrderedDict()
+        
+        elapsed = now - previous_time
+        rates = OrderedDict()
+        for name, columns in counters.items():
+            prior_columns = previous.get(name)
+            if prior_columns is None:
+                continue
+            nic = extra.get(name, {})
+            prior_nic = previous_extra.get(name, {})
+            errors = OrderedDict(
+                (key.split(':', 1)[1], max(0, value - prior_nic[key]) / elapsed)
+                for key, value in nic.items()
+                if key.startswith('error:') and key in prior_nic)
+            inflight = OrderedDict((key.split(':', 1)[1], value) for key, value in nic.items()
+                                   if key.startswith('inflight:'))
+            speed = nic.get('speed') if nic.get('speed', -1) > 0 else None
+            
+            if columns == prior_columns:
+                rates[name] = NetRates(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                                       0.0 if speed else None, speed, errors, inflight)
+                continue
+            
+            current = columns.split()
+            prior = prior_columns.split()
+            if len(current) < 16 or len(prior) < 16:
+                continue
+            delta = [max(0, int(c) - int(p)) / elapsed for c, p in zip(current, prior)]
+            rx_bytes, tx_bytes = delta[0], delta[8]
+            utilization = (max(rx_bytes, tx_bytes) * 8 / (speed * 1e6) * 100) if speed else None
+            rates[name] = NetRates(rx_bytes, tx_bytes, delta[1], delta[9], delta[3], delta[11],
+                                   delta[2], delta[10], utilization, speed, errors, inflight)
+        return rates
+    
+    def sample(self):
+        samples = []
+        for name, rates in self.sample_rates().items():
+            labels = {'interface': name}
+            for metric in NET_RATE_UNITS:
+                value = getattr(rates, metric)
+                if value is not None:
+                    samples.append(Sample(f'network.{metric}', labels, value, NET_RATE_UNITS[metric]))
+            for counter, value in rates.error_rates.items():
+                samples.append(Sample('network.error_rate', OrderedDict([('interface', name), ('counter', counter)]),
+                                      value, '/s'))
+            for queue, value in rates.queue_inflight.items():
+                samples.append(Sample('network.queue_inflight', OrderedDict([('interface', name), ('queue', queue)]),
+                                      value, 'B'))
+        return samples
+    
+    def counter_samples(self):
+        """Return the cumulative counters of the latest read as samples."""
+        samples = []
+        for name, columns in (self._previous or {}).items():
+            fields = columns.split()
+            if len(fields) < 16:
+                continue
+            labels = {'interface': name}
+            for metric, column, unit in NET_COUNTER_COLUMNS:
+                samples.append(Sample(f'network.{metric}', labels, int(fields[column]), unit))
+        return samples
+
+NetRates = namedtuple('NetRates', list(NET_RATE_UNITS) + ['speed', 'error_rates', 'queue_inflight'])
+
+def format_net_rates(name, rates):
+    """Format the traffic rates of an interface on one line."""
+    text = (f"{name}: rx {bytes_to_human(rates.rx_bytes)}/s ({rates.rx_packets:.0f} pkt/s), "
+            f"tx {bytes_to_human(rates.tx_bytes)}/s ({rates.tx_packets:.0f} pkt/s), "
+            f"drops {rates.rx_drops + rates.tx_drops:.1f}/s, errors {rates.rx_errors + rates.tx_errors:.1f}/s")
+    if rates.utilization is not None:
+        text += f", util {rates.utilization:.1f}% of {rates.speed} Mb/s"
+    return text
+
+def create_dynamic_samplers():
+    """Create the samplers for metrics that change between ticks.
+    
+    Samplers that cache per-interface state are subscribed to network
+    hotplug events so new, removed or renamed NICs are picked up.
+    """
+    samplers = [LoadSampler(), CpuStatSampler(), MemorySampler(), TemperatureSampler(),
+                HwmonSampler(), RaplSampler(), CpuFreqSampler(), LinkStateSampler(), DiskStatsSampler(), NetDevSampler()]
+    for sampler in samplers:
+        if hasattr(sampler, 'on_hotplug'):
+            DEVICE_INVENTORY.subscribe('net', sampler.on_hotplug)
+    return samplers
+
+EMPTY_SLOT = array('d', [0.0])
+
+class MetricSeries:
+    """Fixed-capacity ring of (timestamp, value) slots for one labelled series.
+    
+    Timestamps and values live in two preallocated array('d') buffers, so a
+    series always costs SERIES_SLOT_BYTES per slot regardless of how long it
+    has been recorded. Aggregations walk memoryview segments of the ring in
+    place instead of materialising the window.
+    """
+    
+    __slots__ = ('name', 'labels', 'unit', 'capacity', 'times', 'values', 'count', 'head')
+    
+    def __init__(self, name, labels, unit, capacity):
+        self.name = name
+        self.labels = labels
+        self.unit = unit
+        self.capacity = capacity
+        self.times = EMPTY_SLOT * capacity
+        self.values = EMPTY_SLOT * capacity
+        self.count = 0
+        self.head = 0
+    
+    def append(self, timestamp, value):
+        """Store a point, overwriting the oldest one once the ring is full."""
+        self.times[self.head] = timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def _slot(self, index):
+        """Map a logical index (0 = oldest retained point) to a ring slot."""
+        return (self.head - self.count + index) % self.capacity
+    
+    def latest(self):
+        """Return the most recent (timestamp, value), or None when empty."""
+        if not self.count:
+            return None
+        slot = self._slot(self.count - 1)
+        return self.times[slot], self.values[slot]
+    
+    def _window_start(self, since):
+        """Binary search the first logical index with a timestamp >= since."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[self._slot(middle)] < since:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _segments(self, buffer, since=None):
+        """Return up to two memoryview slices covering the window in order."""
+        start = self._window_start(since) if since is not None else 0
+        if start >= self.count:
+            return []
+        first = self._slot(start)
+        last = self._slot(self.count - 1) + 1
+        view = memoryview(buffer)
+        if first < last:
+            return [view[first:last]]
+        return [view[first:], view[:last]]
+    
+    def window_size(self, since=None):
+        """Return the number of retained points at or after since."""
+        start = self._window_start(since) if since is not None else 0
+        return self.count - start
+    
+    def min(self, since=None):
+        segments = self._segments(self.values, since)
+        return min(min(segment) for segment in segments) if segments else None
+    
+    def max(self, since=None):
+        segments = self._segments(self.values, since)
+        return max(max(segment) for segment in segments) if segments else None
+    
+    def mean(self, since=None):
+        size = self.window_size(since)
+        if not size:
+            return None
+        return sum(sum(segment) for segment in self._segments(self.values, since)) / size
+    
+    def percentile(self, pct, since=None):
+        """Nearest-rank percentile of the window (sorting needs one copy of it)."""
+        segments = self._segments(self.values, since)
+        if not segments:
+            return None
+        ordered = sorted(segments[0])
+        if len(segments) > 1:
+            ordered.extend(segments[1])
+            ordered.sort()
+        return percentile(ordered, pct)
+    
+    def rate(self, since=None):
+        """Per-second change between the first and last point of the window."""
+        start = self._window_start(since) if since is not None else 0
+        if self.count - start < 2:
+            return None
+        first, last = self._slot(start), self._slot(self.count - 1)
+        elapsed = self.times[last] - self.times[first]
+        if elapsed <= 0:
+            return None
+        return (self.values[last] - self.values[first]) / elapsed
+    
+    def points(self, since=None):
+        """Yield (timestamp, value) pairs of the window, oldest first."""
+        for times, values in zip(self._segments(self.times, since), self._segments(self.values, since)):
+            for point in zip(times, values):
+                yield point
+
+class MetricStore:
+    """Bounded in-memory history of sampled metrics, one ring per series."""
+    
+    def __init__(self, capacity=DEFAULT_HISTORY_SLOTS):
+        self.capacity = capacity
+        self.series = OrderedDict()
+    
+    @staticmethod
+    def series_key(name, labels):
+        return (name, tuple(labels.items()) if labels else ())
+    
+    def record(self, samples, timestamp=None):
+        """Append a batch of samples taken at the same time."""
+        if timestamp is None:
+            timestamp = time.time()
+        lookup = self.series.get
+        for name, labels, value, unit in samples:
+            if value.__class__ is not float and not isinstance(value, (int, float)):
+                continue
+            key = (name, tuple(labels.items()) if labels else ())
+            series = lookup(key)
+            if series is None:
+                series = MetricSeries(name, labels, unit, self.capacity)
+                self.series[key] = series
+            series.append(timestamp, value)
+    
+    def get(self, name, labels=None):
+        """Return the series of a metric and label set, or None."""
+        return self.series.get(self.series_key(name, labels))
+    
+    def select(self, name):
+        """Return every series recorded under a metric name."""
+        return [series for (series_name, _), series in self.series.items() if series_name == name]
+    
+    def memory_bytes(self):
+        """Bytes held by the ring buffers (fixed per series once allocated)."""
+        return len(self.series) * self.capacity * SERIES_SLOT_BYTES
+    
+    def __len__(self):
+        return len(self.series)
+
+def sample_dynamic_metrics(samplers):
+    """Take one sample from every dynamic sampler."""
+    samples = []
+    for sampler in samplers:
+        try:
+            samples.extend(sampler.sample())
+        except Exception:
+            continue
+    return samples
+
+########################
+# SELECTIVE COLLECTION #
+########################
+
+def read_root_filesystem_space():
+    """Return (used, available) bytes of the root filesystem, from a snapshot when replaying one."""
+    if HOST_ROOT:
+        space = read_host_metadata().get('root_filesystem')
+        return (space['used'], space['available']) if space else None
+    stat = os.statvfs('/')
+    return (stat.f_blocks - stat.f_bfree) * stat.f_frsize, stat.f_bavail * stat.f_frsize
+
+def read_root_filesystem_usage():
+    """Return the used percentage of the root filesystem, as df computes it."""
+    space = read_root_filesystem_space()
+    if space is None:
+        return None
+    used, available = space
+    return used / (used + available) * 100 if used + available else 0.0
+
+def read_nic_error_totals():
+    """Return {interface: receive + transmit errors since boot} of the physical NICs."""
+    sampler = NetDevSampler()
+    counters = sampler.read_counters()
+    if counters is None:
+        return None
+    totals = OrderedDict()
+    for name, columns in counters.items():
+        fields = columns.split()
+        if len(fields) >= 16 and sampler.is_physical(name):
+            totals[name] = int(fields[2]) + int(fields[10])
+    return totals
+
+def select_memory_usage(sources):
+    mem_data = sources['meminfo']
+    total = mem_data.get('MemTotal', 0)
+    available = mem_data.get('MemAvailable', mem_data.get('MemFree', 0))
+    return [Metric('memory.usage', (total - available) / total * 100, '%')] if total else []
+
+def select_memory_available(sources):
+    mem_data = sources['meminfo']
+    available = mem_data.get('MemAvailable', mem_data.get('MemFree'))
+    return [Metric('memory.available', available, 'B')] if isinstance(available, int) else []
+
+def select_swap_usage(sources):
+    mem_data = sources['meminfo']
+    total = mem_data.get('SwapTotal', 0)
+    return [Metric('memory.swap_usage', (total - mem_data.get('SwapFree', 0)) / total * 100, '%')] if total else []
+
+def select_max_temperature(sources):
+    temperatures = [sample.value for sample in sources['thermal']]
+    temperatures.extend(value for sensor, value, _ in sources['hwmon'] if sensor.kind == 'temp')
+    return [Metric('cooling.max_temp', max(temperatures), '°C')] if temperatures else []
+
+def select_load(sources):
+    loads = sources['loadavg'].split()[:3]
+    return [Metric(f'os.load{period}', float(value), '') for period, value in zip((1, 5, 15), loads)]
+
+def select_uptime(sources):
+    return [Metric('os.uptime', float(sources['uptime'].split()[0]), 's')]
+
+def select_cpu_usage(sources):
+    return [Metric.from_sample(sample) for sample in sources['cpustat']
+            if sample.name == 'cpu.usage' and sample.labels.get('cpu') == 'all']
+
+def select_root_usage(sources):
+    return [Metric('storage.root_usage', sources['statvfs:/'], '%')]
+
+def select_nic_errors(sources):
+    return [Metric('network.errors', errors, '', OrderedDict([('interface', name)]))
+            for name, errors in sources['netdev'].items()]
+
+# Readers the selectable metrics depend on; each runs at most once per run
+SELECTION_SOURCES = OrderedDict([
+    ('meminfo', lambda: parse_meminfo(read_lines_safe('/proc/meminfo'))),
+    ('loadavg', lambda: read_file_safe('/proc/loadavg')),
+    ('uptime', lambda: read_file_safe('/proc/uptime')),
+    ('cpustat', lambda: sample_over_interval(CpuStatSampler())),
+    ('thermal', lambda: TemperatureSampler().sample()),
+    ('hwmon', read_hwmon_sensors),
+    ('statvfs:/', read_root_filesystem_usage),
+    ('netdev', read_nic_error_totals),
+])
+
+SelectableMetric = namedtuple('SelectableMetric', ['sources', 'collect', 'description'])
+
+METRIC_REGISTRY = OrderedDict([
+    ('memory.usage', SelectableMetric(('meminfo',), select_memory_usage, 'RAM in use (%)')),
+    ('memory.available', SelectableMetric(('meminfo',), select_memory_available, 'RAM available (bytes)')),
+    ('memory.swap_usage', SelectableMetric(('meminfo',), select_swap_usage, 'Swap in use (%)')),
+    ('cpu.usage', SelectableMetric(('cpustat',), select_cpu_usage, 'CPU utilization over a short interval (%)')),
+    ('cooling.max_temp', SelectableMetric(('thermal', 'hwmon'), select_max_temperature,
+                                          'Hottest thermal zone or hwmon sensor (°C)')),
+    ('os.load', SelectableMetric(('loadavg',), select_load, '1, 5 and 15 minute load averages')),
+    ('os.uptime', SelectableMetric(('uptime',), select_uptime, 'Time since boot (s)')),
+    ('storage.root_usage', SelectableMetric(('statvfs:/',), select_root_usage, 'Root filesystem in use (%)')),
+    ('network.errors', SelectableMetric(('netdev',), select_nic_errors,
+                                        'Receive + transmit errors since boot per physical NIC')),
+])
+
+def plan_selection(names):
+    """Resolve metric names or patterns to registry entries and the sources they need.
+    
+    Returns ([(name, SelectableMetric)], [source names]) in registry order.
+    Raises ValueError for a name that matches no registered metric.
+    """
+    selected = []
+    for pattern in names:
+        matches = [name for name in METRIC_REGISTRY if fnmatch.fnmatchcase(name, pattern)]
+        if not matches:
+            raise ValueError(f"unknown metric '{pattern}' (available: {', '.join(METRIC_REGISTRY)})")
+        selected.extend(name for name in matches if name not in selected)
+    selected = [(name, METRIC_REGISTRY[name]) for name in METRIC_REGISTRY if name in selected]
+    needed = {source for _, definition in selected for source in definition.sources}
+    return selected, [source for source in SELECTION_SOURCES if source in needed]
+
+def collect_selected_metrics(selected, sources):
+    """Run each planned source once and build the selected metrics from them."""
+    values = {}
+    for source in sources:
+        try:
+            values[source] = SELECTION_SOURCES[source]()
+        except (OSError, ValueError):
+            values[source] = None
+    
+    info = HardwareInfo()
+    for name, definition in selected:
+        metrics = []
+        if all(values[source] is not None for source in definition.sources):
+            try:
+                metrics = definition.collect(values)
+            except (IndexError, KeyError, ValueError):
+                metrics = []
+        if not metrics:
+            info.data[SAMPLE_LABELS.get(name, name)] = 'N/A'
+        for metric in metrics:
+            info.data[format_sample_label(metric)] = metric
+    info.apply_rules(ALERT_RULES)
+    return info
+
+def run_selected_metrics(names, export_format=None, output_path='.'):
+    """Collect and print only the named metrics, without section headers."""
+    try:
+        selected, sources = plan_selection(names)
+    except ValueError as e:
+        print(f"{colorize('[ERROR]', COLOR_RED)} {e}")
+        sys.exit(1)
+    info = collect_selected_metrics(selected, sources)
+    emit(render_info_table(info.data, VERBOSITY_FULL))
+    if export_format:
+        export_data(OrderedDict([('selected', info.to_dict())]), export_format, output_path)
+
+################
+# HISTORY FILE #
+################
+
+class HistoryFile:
+    """Append-only on-disk history of sampled metrics.
+    
+    The file is a sequence of fixed-size blocks. Block 0 holds the file header;
+    every other block starts with a small header (kind, series id, record
+    count, used bytes, first and last timestamp) followed by either series
+    definitions (one JSON line per series) or fixed-width (timestamp, value)
+    records of a single series. Blocks are allocated strictly in order and
+    records are only ever appended, so a reader can skip whole blocks by their
+    header and only touch the byte ranges of matching series and time ranges.
+    The file grows in chunks of zeroed blocks; a zero kind marks the end.
+    """
+    
+    HEADER = struct.Struct('<8sII')
+    BLOCK_HEADER = struct.Struct('<BxxxIIIdd')
+    RECORD = struct.Struct('<dd')
+    MAGIC = b'HWMHIST1'
+    VERSION = 1
+    
+    KIND_FREE = 0
+    KIND_NAMES = 1
+    KIND_DATA = 2
+    
+    RECORDS_PER_BLOCK = (HISTORY_BLOCK_SIZE - BLOCK_HEADER.size) // RECORD.size
+    
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self.series = OrderedDict()
+        self._keys = {}
+        self._fd = None
+        self._map = None
+        self._next_block = HISTORY_BLOCK_SIZE
+        self._names_block = None
+        self._open_blocks = {}
+    
+    def open(self):
+        """Open (and when writable create and lock) the file; return success."""
         try:
-            zone_info['temp'] = float(int(temp) / 1000.0)
-        except ValueError:
-            pass
-    
-    if verbosity >= VERBOSITY_DETAILED:
-        trip_points = read_file_safe(f'{zone_path}/trip_point_0_temp')
-        if trip_points:
+            if self.writable:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, HISTORY_BLOCK_SIZE * (1 + HISTORY_GROW_BLOCKS))
+                    os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, self.VERSION, HISTORY_BLOCK_SIZE), 0)
+                self._map = mmap.mmap(self._fd, 0)
+            else:
+                self._fd = os.open(self.path, os.O_RDONLY)
+                self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.close()
+            return False
+        
+        if len(self._map) < self.HEADER.size:
+            self.close()
+            return False
+        magic, version, block_size = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or version != self.VERSION or block_size != HISTORY_BLOCK_SIZE:
+            self.close()
+            return False
+        if self.writable:
+            for _ in self.blocks():
+                pass
+        return True
+    
+    def close(self):
+        if self._map is not None:
+            if self.writable:
+                self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def blocks(self):
+        """Yield (offset, kind, series_id, count, t_first, t_last) of every used block.
+        
+        Series definitions are loaded as name blocks are passed, so data blocks
+        can be matched against self.series while iterating.
+        """
+        data = self._map
+        offset = HISTORY_BLOCK_SIZE
+        size = len(data)
+        while offset + HISTORY_BLOCK_SIZE <= size:
+            kind, series_id, count, used, t_first, t_last = self.BLOCK_HEADER.unpack_from(data, offset)
+            if kind == self.KIND_FREE:
+                break
+            if kind == self.KIND_NAMES:
+                self._load_names(offset, used)
+            elif kind == self.KIND_DATA:
+                self._open_blocks[series_id] = offset
+                yield offset, kind, series_id, count, t_first, t_last
+            offset += HISTORY_BLOCK_SIZE
+        self._next_block = offset
+    
+    def _load_names(self, offset, used):
+        """Read the series definitions stored in a name block."""
+        start = offset + self.BLOCK_HEADER.size
+        for line in bytes(self._map[start:start + used]).split(b'\n'):
+            if not line:
+                continue
             try:
-                zone_info['trip_point'] = f"{int(trip_points) / 1000:.1f} °C"
+                entry = json.loads(line.decode('utf-8'))
             except ValueError:
-                pass
-    
-    return zone_info
+                continue
+            labels = OrderedDict(entry.get('labels') or [])
+            self.series[entry['id']] = (entry['name'], labels, entry.get('unit', ''))
+            self._keys[(entry['name'], tuple(labels.items()))] = entry['id']
+        self._names_block = (offset, used)
+    
+    def _allocate(self, kind, series_id):
+        """Claim the next free block, growing the file by a chunk if needed."""
+        offset = self._next_block
+        if offset + HISTORY_BLOCK_SIZE > len(self._map):
+            new_size = len(self._map) + HISTORY_BLOCK_SIZE * HISTORY_GROW_BLOCKS
+            os.ftruncate(self._fd, new_size)
+            self._map.resize(new_size)
+        self.BLOCK_HEADER.pack_into(self._map, offset, kind, series_id, 0, 0, 0.0, 0.0)
+        self._next_block = offset + HISTORY_BLOCK_SIZE
+        return offset
+    
+    def _series_id(self, name, labels, unit):
+        """Return the id of a series, appending its definition on first use."""
+        key = (name, tuple(labels.items()) if labels else ())
+        series_id = self._keys.get(key)
+        if series_id is not None:
+            return series_id
+        
+        series_id = len(self.series)
+        entry = json.dumps({'id': series_id, 'name': name, 'labels': list(key[1]), 'unit': unit},
+                           separators=(',', ':')).encode('utf-8') + b'\n'
+        capacity = HISTORY_BLOCK_SIZE - self.BLOCK_HEADER.size
+        if len(entry) > capacity:
+            return None
+        offset, used = self._names_block or (None, 0)
+        if offset is None or used + len(entry) > capacity:
+            offset, used = self._allocate(self.KIND_NAMES, 0), 0
+        start = offset + self.BLOCK_HEADER.size + used
+        self._map[start:start + len(entry)] = entry
+        count = self.BLOCK_HEADER.unpack_from(self._map, offset)[2]
+        self.BLOCK_HEADER.pack_into(self._map, offset, self.KIND_NAMES, 0, count + 1, used + len(entry), 0.0, 0.0)
+        self._names_block = (offset, used + len(entry))
+        
+        self.series[series_id] = (name, OrderedDict(key[1]), unit)
+        self._keys[key] = series_id
+        return series_id
+    
+    def append(self, samples, timestamp=None):
+        """Append one record per numeric sample, all taken at timestamp."""
+        if timestamp is None:
+            timestamp = time.time()
+        block_header = self.BLOCK_HEADER
+        record = self.RECORD
+        for name, labels, value, unit in samples:
+            if not isinstance(value, (int, float)):
+                continue
+            series_id = self._series_id(name, labels, unit)
+            if series_id is None:
+                continue
+            offset = self._open_blocks.get(series_id)
+            if offset is None:
+                count = self.RECORDS_PER_BLOCK
+            else:
+                _, _, count, _, t_first, _ = block_header.unpack_from(self._map, offset)
+            if count >= self.RECORDS_PER_BLOCK:
+                offset = self._allocate(self.KIND_DATA, series_id)
+                self._open_blocks[series_id] = offset
+                count, t_first = 0, timestamp
+            record.pack_into(self._map, offset + block_header.size + count * record.size, timestamp, value)
+            block_header.pack_into(self._map, offset, self.KIND_DATA, series_id, count + 1, 0, t_first, timestamp)
+    
+    def records(self, offset, count):
+        """Return the (timestamp, value) records of a data block without copying it."""
+        start = offset + self.BLOCK_HEADER.size
+        return self.RECORD.iter_unpack(memoryview(self._map)[start:start + count * self.RECORD.size])
 
-def collect_peripherals_information(verbosity):
-    """Collect peripherals information (USB, etc.)."""
-    info = HardwareInfo()
-    usb_path = '/sys/bus/usb/devices'
-    
-    if not os.path.exists(usb_path):
-        info.severity = SEVERITY_WARN
-        info.data['Status'] = "Peripherals information not available"
-        return info
-    
-    peripherals = []
-    usb_devices = [d for d in os.listdir(usb_path) if not d.startswith('usb') or ':' in d]
-    
-    for dev in usb_devices:
-        dev_info = parse_usb_device(dev, usb_path, verbosity)
-        if dev_info:
-            peripherals.append(dev_info)
-    
-    info.data['Total USB Devices'] = len(peripherals)
-    
-    peripheral_display = [
-        f"{p['name']} ({p.get('product', 'Unknown')}) - {p.get('manufacturer', 'Unknown')}"
-        for p in peripherals
-    ]
+def parse_duration(value):
+    """Argparse type for durations such as 90, 30s, 5m, 24h or 7d."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdw]?)', value.strip().lower())
+    if not match or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (use e.g. 30s, 5m, 24h, 7d)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2) or 's']
+
+def parse_label_filter(value):
+    """Argparse type for KEY=VALUE label filters."""
+    key, sep, label_value = value.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"invalid label filter: {value!r} (use KEY=VALUE)")
+    return key, label_value
+
+def query_history(path, pattern='*', labels=(), since=None, until=None, step=None, agg='max'):
+    """Aggregate matching series of a history file into time buckets.
+    
+    Returns a list of (name, labels, unit, [(bucket_start, value), ...]) tuples
+    or None when the file is not a readable history file. Only headers of
+    non-matching blocks are read.
+    """
+    history = HistoryFile(path)
+    if not history.open():
+        return None
     
-    if len(peripheral_display) > 5 and verbosity < VERBOSITY_FULL:
-        info.data['Peripherals'] = peripheral_display[:5] + [f"... (+{len(peripheral_display) - 5} more)"]
-    else:
-        info.data['Peripherals'] = peripheral_display
+    wanted = {}
+    buckets = OrderedDict()
+    try:
+        for offset, _, series_id, count, t_first, t_last in history.blocks():
+            if series_id not in wanted:
+                name, series_labels, unit = history.series.get(series_id, (None, None, None))
+                wanted[series_id] = name is not None and fnmatch.fnmatchcase(name, pattern) and \
+                    all(str(series_labels.get(k)) == v for k, v in labels)
+            if not wanted[series_id] or not count:
+                continue
+            if (since is not None and t_last < since) or (until is not None and t_first > until):
+                continue
+            
+            series_buckets = buckets.setdefault(series_id, OrderedDict())
+            for timestamp, value in history.records(offset, count):
+                if (since is not None and timestamp < since) or (until is not None and timestamp > until):
+                    continue
+                bucket = timestamp - timestamp % step if step else timestamp
+                state = series_buckets.get(bucket)
+                if state is None:
+                    series_buckets[bucket] = [value, value, value, 1, value]
+                else:
+                    state[0] = min(state[0], value)
+                    state[1] = max(state[1], value)
+                    state[2] += value
+                    state[3] += 1
+                    state[4] = value
+    finally:
+        history.close()
+    
+    aggregate = HISTORY_AGGREGATES[agg]
+    return [history.series[series_id] + ([(bucket, aggregate(state)) for bucket, state in sorted(series_buckets.items())],)
+            for series_id, series_buckets in buckets.items()]
+
+def run_history_query(args):
+    """Print the result of the query subcommand, one table per series."""
+    now = time.time()
+    since = now - args.since if args.since else None
+    results = query_history(args.file, args.series, args.label, since, None, args.step, args.agg)
+    if results is None:
+        print(f"{colorize('[ERROR]', COLOR_RED)} Not a readable history file: {args.file}")
+        sys.exit(1)
+    if not results:
+        print(f"{colorize('[INFO]', COLOR_CYAN)} No samples match {args.series!r} in {args.file}")
+        return
     
-    # Optional: lsusb if available
-    if verbosity >= VERBOSITY_DETAILED and run_command_safe('command -v lsusb'):
-        lsusb_output = run_command_safe('lsusb')
-        if lsusb_output:
-            info.data['LSUSB Summary'] = lsusb_output
+    for name, labels, unit, points in results:
+        title = format_sample_label(Sample(name, labels, None, unit))
+        print_section_header(f"{title} - {args.agg}")
+        rows = [[datetime.fromtimestamp(bucket).strftime('%Y-%m-%d %H:%M:%S'),
+                 format_sample_value(value, '' if args.agg == 'count' else unit)]
+                for bucket, value in points]
+        print_formatted_table(["Time", "Value"], rows, COLOR_CYAN)
 
-    # Optional: lsusb -t
-    if verbosity >= VERBOSITY_FULL and run_command_safe('command -v lsusb'):
-        lsusb_t = run_command_safe('lsusb -t')
-        if lsusb_t:
-            info.data['LSUSB Topology'] = lsusb_t
+def record_history_snapshot(path, samples):
+    """Append one batch of samples to a history file."""
+    history = HistoryFile(path, writable=True)
+    if not history.open():
+        print(f"\n{colorize('[ERROR]', COLOR_RED)} Cannot write history file: {path}")
+        return False
+    try:
+        history.append(samples)
+    finally:
+        history.close()
+    return True
+
+#######################
+# PROMETHEUS EXPORTER #
+#######################
+
+def prometheus_metric_name(name, unit):
+    """Map a sample name and unit to a Prometheus metric name.
+    
+    The unit becomes a base-unit suffix (percent, bytes, celsius, ...) unless
+    the name already ends in it, and counters keep their _total suffix last.
+    """
+    total = name.endswith('_total')
+    if total:
+        name = name[:-len('_total')]
+    base = PROMETHEUS_PREFIX + re.sub(r'[^a-zA-Z0-9_]', '_', name.replace('.', '_'))
+    suffix = PROMETHEUS_UNIT_SUFFIXES.get(unit, '')
+    if suffix:
+        stem, _, last = base.rpartition('_')
+        if last in (unit.lower(), suffix.split('_')[1]):
+            base = stem
+        base += suffix
+    return base + '_total' if total else base
+
+def escape_label_value(value):
+    """Escape a label value for the text exposition format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus(samples):
+    """Render samples in the Prometheus text exposition format (version 0.0.4).
+    
+    Samples of the same metric are grouped under one HELP/TYPE header; names
+    ending in _total are typed as counters, everything else as gauges.
+    """
+    families = OrderedDict()
+    for sample in samples:
+        if not isinstance(sample.value, (int, float)):
+            continue
+        metric = prometheus_metric_name(sample.name, sample.unit)
+        family = families.get(metric)
+        if family is None:
+            family = families[metric] = (SAMPLE_LABELS.get(sample.name, sample.name), [])
+        family[1].append(sample)
+    
+    lines = []
+    for metric, (help_text, family) in families.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+        for sample in family:
+            value = float(sample.value)
+            if sample.labels:
+                labels = ','.join(f'{re.sub(r"[^a-zA-Z0-9_]", "_", str(key))}="{escape_label_value(label)}"'
+                                  for key, label in sample.labels.items())
+                lines.append(f"{metric}{{{labels}}} {value!r}")
+            else:
+                lines.append(f"{metric} {value!r}")
+    return '\n'.join(lines) + '\n'
+
+def collect_inventory_samples():
+    """Return the static inventory exposed next to the sampled metrics."""
+    samples = [Sample('build_info', OrderedDict([('version', VERSION)]), 1, '')]
+    topology = CPU_TOPOLOGY.get()
+    if topology is not None and topology.thread_count:
+        samples.append(Sample('cpu.sockets', {}, topology.socket_count, ''))
+        samples.append(Sample('cpu.cores', {}, topology.core_count, ''))
+        samples.append(Sample('cpu.logical_cpus', {}, topology.thread_count, ''))
+    mem_data = parse_meminfo(read_lines_safe('/proc/meminfo'))
+    if isinstance(mem_data.get('MemTotal'), int):
+        samples.append(Sample('memory.total', {}, mem_data['MemTotal'], 'B'))
+    if isinstance(mem_data.get('SwapTotal'), int):
+        samples.append(Sample('memory.swap_size', {}, mem_data['SwapTotal'], 'B'))
+    return samples
+
+class MetricsSnapshot:
+    """Pre-rendered /metrics payload refreshed by a background thread.
+    
+    Scrapes only ever read the latest rendered bytes under a lock, so any
+    number of concurrent scrapes costs nothing beyond the socket write and
+    never triggers a collection; the refresh thread is the only sampler.
+    """
+    
+    def __init__(self, interval=PROMETHEUS_REFRESH_INTERVAL):
+        self.interval = interval
+        self.samplers = create_dynamic_samplers()
+        self.inventory = collect_inventory_samples()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._body = b''
+        self.refreshes = 0
+        self.monitor = UeventMonitor()
+    
+    def refresh(self):
+        """Sample all dynamic metrics and swap in a newly rendered payload."""
+        started = time.monotonic()
+        self.monitor.poll()
+        DEVICE_INVENTORY.drain_events()
+        samples = list(self.inventory)
+        samples.extend(sample_dynamic_metrics(self.samplers))
+        for sampler in self.samplers:
+            if hasattr(sampler, 'counter_samples'):
+                samples.extend(sampler.counter_samples())
+        ALERT_RULES.evaluate(samples)
+        samples.extend(ALERT_RULES.alert_samples())
+        samples.append(Sample('snapshot.timestamp_seconds', {}, time.time(), ''))
+        samples.append(Sample('snapshot.duration_seconds', {}, time.monotonic() - started, ''))
+        body = render_prometheus(samples).encode('utf-8')
+        with self._lock:
+            self._body = body
+            self.refreshes += 1
+    
+    def body(self):
+        with self._lock:
+            return self._body
+    
+    def start(self):
+        """Take the first snapshot (with a rate baseline) and start refreshing."""
+        self.monitor.start()
+        sample_dynamic_metrics(self.samplers)
+        time.sleep(RATE_SAMPLE_INTERVAL)
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name='metrics-refresh', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                continue
     
-    return info
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.monitor.stop()
 
-def parse_usb_device(dev, usb_path, verbosity):
-    """Parse information for a single USB device."""
-    dev_path = os.path.join(usb_path, dev)
-    dev_info = {'name': dev}
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the cached snapshot on /metrics and a short index on /."""
+    
+    snapshot = None
+    
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            self._send(200, PROMETHEUS_CONTENT_TYPE, self.snapshot.body())
+        elif path == '/':
+            self._send(200, 'text/html; charset=utf-8',
+                       b'<html><body><a href="/metrics">Metrics</a></body></html>\n')
+        else:
+            self._send(404, 'text/plain; charset=utf-8', b'Not Found\n')
     
-    product = read_file_safe(f'{dev_path}/product')
-    if product:
-        dev_info['product'] = product
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
     
-    manufacturer = read_file_safe(f'{dev_path}/manufacturer')
-    if manufacturer:
-        dev_info['manufacturer'] = manufacturer
+    def log_message(self, format, *args):
+        pass
+
+class MetricsHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+def create_metrics_server(snapshot, address='127.0.0.1', port=PROMETHEUS_DEFAULT_PORT):
+    """Bind an HTTP server serving the given snapshot; port 0 picks a free port."""
+    handler = type('BoundMetricsRequestHandler', (MetricsRequestHandler,), {'snapshot': snapshot})
+    return MetricsHTTPServer((address, port), handler)
+
+def run_exporter(address, port, interval):
+    """Serve /metrics until interrupted."""
+    snapshot = MetricsSnapshot(interval)
+    try:
+        server = create_metrics_server(snapshot, address, port)
+    except OSError as e:
+        print(f"{colorize('[ERROR]', COLOR_RED)} Cannot listen on {address}:{port}: {str(e)}")
+        sys.exit(1)
+    snapshot.start()
     
-    if verbosity >= VERBOSITY_DETAILED:
-        serial = read_file_safe(f'{dev_path}/serial')
-        if serial:
-            dev_info['serial'] = serial
+    host, bound_port = server.server_address[:2]
+    print(f"{colorize('[INFO]', COLOR_CYAN)} Serving metrics on "
+          f"{colorize(f'http://{host}:{bound_port}/metrics', COLOR_GREEN)} (refresh every {interval:g}s)")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        snapshot.stop()
+
+#############
+# DASHBOARD #
+#############
+
+class DashboardFeed:
+    """Samples dynamic metrics on a background thread for the dashboard.
+    
+    Each refresh groups the samples into panel rows that are already
+    formatted, and swaps them in under a lock. The UI thread only ever copies
+    the latest rows, so a slow sysfs read delays the next update but never
+    blocks redraws or key handling.
+    """
+    
+    def __init__(self, interval=DASHBOARD_DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samplers = create_dynamic_samplers()
+        self.monitor = UeventMonitor()
+        self._panel_names = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._panels = OrderedDict((title, []) for title in DASHBOARD_PANEL_TITLES)
+        self.ticks = 0
+        self.duration = 0.0
+    
+    def panel_of(self, name):
+        """Return the panel a metric name is shown in (None to hide it)."""
+        if name not in self._panel_names:
+            self._panel_names[name] = next((title for title, prefixes in DASHBOARD_PANELS
+                                            if name.startswith(prefixes)), None)
+        return self._panel_names[name]
+    
+    def refresh(self):
+        """Sample all dynamic metrics, evaluate the alert rules and publish the panel rows."""
+        started = time.monotonic()
+        self.monitor.poll()
+        DEVICE_INVENTORY.drain_events()
+        samples = sample_dynamic_metrics(self.samplers)
+        ALERT_RULES.evaluate(samples)
         
-        speed = read_file_safe(f'{dev_path}/speed')
-        if speed:
-            dev_info['speed'] = f"{speed} Mb/s"
-    
-    return dev_info if 'product' in dev_info or 'manufacturer' in dev_info else None
+        panels = OrderedDict((title, []) for title in DASHBOARD_PANEL_TITLES)
+        for sample in samples:
+            if not sample.value and sample.name.startswith(WATCH_HIDE_IDLE_PREFIXES):
+                continue
+            title = self.panel_of(sample.name)
+            if title is not None:
+                panels[title].append((format_sample_label(sample),
+                                      format_sample_value(sample.value, sample.unit),
+                                      ALERT_RULES.severity(sample.name, sample.labels)))
+        panels['Alerts'] = [(format_sample_label(sample), format_sample_value(sample.value, sample.unit),
+                             SEVERITY_LEVELS[level])
+                            for level, sample in sorted(ALERT_RULES.firing.values(), key=lambda a: -a[0])]
+        
+        with self._lock:
+            self._panels = panels
+            self.ticks += 1
+            self.duration = time.monotonic() - started
+    
+    def snapshot(self):
+        """Return (panels, ticks, duration) of the latest refresh."""
+        with self._lock:
+            return self._panels, self.ticks, self.duration
+    
+    def start(self):
+        self.monitor.start()
+        self._thread = threading.Thread(target=self._run, name='dashboard-sampler', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        # Baseline for the rate samplers, then one refresh per interval
+        sample_dynamic_metrics(self.samplers)
+        if self._stop.wait(RATE_SAMPLE_INTERVAL):
+            return
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            if self._stop.wait(self.interval):
+                return
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.monitor.stop()
 
-def collect_pci_information(verbosity):
-    """Collect PCI devices information."""
-    info = HardwareInfo()
-    
-    if run_command_safe('command -v lspci'):
-        lspci_basic = run_command_safe('lspci')
-        if lspci_basic:
-            info.data['PCI Devices Summary'] = lspci_basic
+class ScreenModel:
+    """The text and attribute last drawn at each screen position.
+    
+    put() only reaches curses when a cell's content changed, so an unchanged
+    dashboard produces no terminal output and an update redraws just the
+    values that moved.
+    """
+    
+    def __init__(self, window):
+        self.window = window
+        self.cells = {}
+    
+    def put(self, y, x, text, width, attr=0):
+        if width <= 0:
+            return
+        text = text[:width].ljust(width)
+        if self.cells.get((y, x)) == (text, attr):
+            return
+        self.cells[(y, x)] = (text, attr)
+        try:
+            self.window.addstr(y, x, text, attr)
+        except curses.error:
+            pass  # writing the bottom-right cell moves the cursor off screen
+    
+    def reset(self):
+        """Forget every cell, e.g. after a resize."""
+        self.cells.clear()
+        self.window.erase()
+
+class Dashboard:
+    """Full-screen view of the dashboard feed with focusable, scrollable panels."""
+    
+    def __init__(self, window, feed):
+        self.window = window
+        self.feed = feed
+        self.screen = ScreenModel(window)
+        self.focus = 0
+        self.offsets = dict.fromkeys(DASHBOARD_PANEL_TITLES, 0)
+        self.attrs = {SEVERITY_INFO: 0, SEVERITY_WARN: curses.A_BOLD, SEVERITY_CRITICAL: curses.A_BOLD,
+                      'title': curses.A_BOLD, 'focus': curses.A_REVERSE}
+        self.layout = []
+        self.page = 1
+        self.hostname = read_kernel_identity().nodename
+    
+    def setup_colors(self):
+        if not (USE_COLOR and curses.has_colors()):
+            return
+        curses.start_color()
+        curses.use_default_colors()
+        for pair, color in enumerate((curses.COLOR_YELLOW, curses.COLOR_RED, curses.COLOR_CYAN), 1):
+            curses.init_pair(pair, color, -1)
+        self.attrs[SEVERITY_WARN] = curses.color_pair(1) | curses.A_BOLD
+        self.attrs[SEVERITY_CRITICAL] = curses.color_pair(2) | curses.A_BOLD
+        self.attrs['title'] = curses.color_pair(3) | curses.A_BOLD
+    
+    def compute_layout(self):
+        """Split the screen into two columns of stacked panels."""
+        self.screen.reset()
+        height, width = self.window.getmaxyx()
+        body = height - 2
+        half = len(DASHBOARD_PANEL_TITLES) - len(DASHBOARD_PANEL_TITLES) // 2
+        columns = (DASHBOARD_PANEL_TITLES[:half], DASHBOARD_PANEL_TITLES[half:])
+        column_width = width // 2
+        self.layout = []
+        for index, titles in enumerate(columns):
+            x = index * column_width
+            panel_height = body // len(titles)
+            for row, title in enumerate(titles):
+                y = 1 + row * panel_height
+                last = row == len(titles) - 1
+                self.layout.append((title, y, x, body + 1 - y if last else panel_height,
+                                    width - x if index else column_width - 1))
+        self.page = max(1, min(panel[3] for panel in self.layout) - 1) if self.layout else 1
+    
+    def draw(self):
+        panels, ticks, duration = self.feed.snapshot()
+        height, width = self.window.getmaxyx()
+        put = self.screen.put
         
-        if verbosity >= VERBOSITY_DETAILED:
-            lspci_v = run_command_safe('lspci -v')
-            if lspci_v:
-                info.data['PCI Detailed'] = lspci_v[:500] + "..." if len(lspci_v) > 500 else lspci_v
+        status = "collecting..." if not ticks else f"sample #{ticks} in {duration * 1000:.0f} ms"
+        put(0, 0, f" hardware_monitor.py {VERSION} | {self.hostname} | "
+                  f"{datetime.now().strftime('%H:%M:%S')} | {status}", width, curses.A_REVERSE)
         
-        if verbosity >= VERBOSITY_FULL:
-            lspci_vvv = run_command_safe('lspci -vvv')
-            if lspci_vvv:
-                info.data['PCI Full'] = lspci_vvv[:1000] + "..." if len(lspci_vvv) > 1000 else lspci_vvv
-    else:
-        info.data['Status'] = "lspci not available"
+        for index, (title, y, x, panel_height, panel_width) in enumerate(self.layout):
+            rows = panels.get(title, [])
+            visible = panel_height - 1
+            offset = self.offsets[title] = max(0, min(self.offsets[title], len(rows) - visible))
+            more = f" {offset + 1}-{min(len(rows), offset + visible)}/{len(rows)}" if len(rows) > visible else ""
+            put(y, x, f" {title} ({len(rows)}){more}", panel_width,
+                self.attrs['focus'] if index == self.focus else self.attrs['title'])
+            value_width = min(16, panel_width // 3)
+            label_width = panel_width - value_width - 1
+            for line in range(visible):
+                if offset + line < len(rows):
+                    label, value, severity = rows[offset + line]
+                else:
+                    label, value, severity = '', '', SEVERITY_INFO
+                put(y + 1 + line, x, f" {label}", label_width)
+                put(y + 1 + line, x + label_width, value.rjust(value_width), value_width + 1,
+                    self.attrs[severity])
+        
+        put(height - 1, 0, " q quit | Tab/Left/Right panel | Up/Down PgUp/PgDn Home/End scroll",
+            width - 1, curses.A_REVERSE)
+        self.window.noutrefresh()
+        curses.doupdate()
+    
+    def handle_key(self, key):
+        """Apply a key press; return False to quit."""
+        if key in (ord('q'), ord('Q'), 27):
+            return False
+        if key == curses.KEY_RESIZE:
+            self.compute_layout()
+            return True
+        if key in (ord('\t'), curses.KEY_RIGHT):
+            self.focus = (self.focus + 1) % len(self.layout)
+        elif key in (curses.KEY_BTAB, curses.KEY_LEFT):
+            self.focus = (self.focus - 1) % len(self.layout)
+        else:
+            title = self.layout[self.focus][0]
+            steps = {curses.KEY_DOWN: 1, curses.KEY_UP: -1, curses.KEY_NPAGE: self.page,
+                     curses.KEY_PPAGE: -self.page, curses.KEY_HOME: -sys.maxsize, curses.KEY_END: sys.maxsize}
+            if key in steps:
+                self.offsets[title] = max(0, min(self.offsets[title] + steps[key], sys.maxsize // 2))
+        return True
+    
+    def run(self):
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        self.window.keypad(True)
+        self.window.timeout(DASHBOARD_KEY_TIMEOUT_MS)
+        self.setup_colors()
+        self.compute_layout()
+        drawn_at = None
+        while True:
+            now = int(time.time())
+            if drawn_at != (self.feed.ticks, now):
+                self.draw()
+                drawn_at = (self.feed.ticks, now)
+            key = self.window.getch()
+            if key == -1:
+                continue
+            if not self.handle_key(key):
+                return
+            self.draw()
+
+def run_dashboard(interval):
+    """Run the curses dashboard until the user quits."""
+    global curses
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        print(f"{colorize('[ERROR]', COLOR_RED)} The dashboard needs an interactive terminal")
+        sys.exit(1)
+    try:
+        import curses
+    except ImportError:
+        print(f"{colorize('[ERROR]', COLOR_RED)} The dashboard needs the curses module, "
+              f"which this Python was built without")
+        sys.exit(1)
+    feed = DashboardFeed(interval)
+    feed.start()
+    try:
+        curses.wrapper(lambda window: Dashboard(window, feed).run())
+    finally:
+        feed.stop()
+
+#############
+# BENCHMARK #
+#############
+
+class SyscallCounter:
+    """Count open() calls and subprocess launches through an interpreter audit hook.
     
-    return info
+    The hook sees builtin open(), os.open() and every Popen, including those
+    of code that bypasses FILE_READER and TOOLS. Audit hooks cannot be
+    removed, so one counter is installed per process and only counts while
+    a measurement is running.
+    """
+    
+    def __init__(self):
+        self.opens = 0
+        self.subprocesses = 0
+        self.active = False
+        sys.addaudithook(self._hook)
+    
+    def _hook(self, event, args):
+        if not self.active:
+            return
+        if event == 'open':
+            self.opens += 1
+        elif event == 'subprocess.Popen':
+            self.subprocesses += 1
+    
+    def measure(self, func):
+        """Run func once; return (elapsed seconds, opens, subprocesses)."""
+        opens, subprocesses = self.opens, self.subprocesses
+        self.active = True
+        start = time.perf_counter()
+        try:
+            func()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.active = False
+        return elapsed, self.opens - opens, self.subprocesses - subprocesses
+
+def synthetic_fixture_files(cpus=BENCHMARK_FIXTURE_CPUS, disks=BENCHMARK_FIXTURE_DISKS,
+                            nics=BENCHMARK_FIXTURE_NICS):
+    """Return ({path: content}, {path: symlink target}) of a small synthetic host tree.
+    
+    The tree covers every file the collectors read (CPU, memory, block,
+    network, thermal, hwmon, RAPL, power supply, DMI, PCI, USB, DRM), so a
+    benchmark exercises all parsing paths without root or real hardware.
+    """
+    files = OrderedDict()
+    links = OrderedDict()
+    cores = max(1, cpus // 2)
+    
+    files['/etc/os-release'] = ('NAME="Fixture Linux"\nID=fixture\nVERSION_ID="1.0"\n'
+                                'PRETTY_NAME="Fixture Linux 1.0"\n')
+    files['/proc/sys/kernel/random/boot_id'] = '00000000-0000-4000-8000-000000000000\n'
+    files['/proc/sys/kernel/hostname'] = 'fixture\n'
+    files['/proc/sys/kernel/ostype'] = 'Linux\n'
+    files['/proc/sys/kernel/osrelease'] = '6.1.0-fixture\n'
+    files['/proc/sys/kernel/version'] = '#1 SMP PREEMPT_DYNAMIC Fixture\n'
+    files['/proc/sys/kernel/arch'] = 'x86_64\n'
+    files['/proc/uptime'] = '356521.42 2811023.77\n'
+    files['/proc/loadavg'] = '0.52 0.48 0.40 2/512 12345\n'
+    files['/proc/cmdline'] = 'BOOT_IMAGE=/vmlinuz-6.1.0-fixture root=/dev/sda1 ro quiet\n'
+    files['/proc/modules'] = ''.join(f'module{i} 16384 0 - Live 0x0000000000000000\n' for i in range(40))
+    files['/proc/meminfo'] = ''.join(f'{key}: {value:>12} kB\n' for key, value in (
+        ('MemTotal', 16318412), ('MemFree', 4211820), ('MemAvailable', 9876544), ('Buffers', 412300),
+        ('Cached', 5123400), ('SwapCached', 1024), ('Active', 6123400), ('Inactive', 3987600),
+        ('SwapTotal', 2097148), ('SwapFree', 2001000), ('Dirty', 1204), ('Writeback', 0),
+        ('Slab', 512300), ('SReclaimable', 310200), ('SUnreclaim', 202100)))
+    files['/proc/cpuinfo'] = '\n'.join(
+        f'processor\t: {cpu}\nvendor_id\t: GenuineIntel\ncpu family\t: 6\nmodel\t\t: 85\n'
+        f'model name\t: Intel(R) Xeon(R) Fixture CPU @ 2.40GHz\nstepping\t: 7\nmicrocode\t: 0x5003604\n'
+        f'cpu MHz\t\t: 2400.000\ncache size\t: 16384 KB\nphysical id\t: 0\nsiblings\t: {cpus}\n'
+        f'core id\t\t: {cpu % cores}\ncpu cores\t: {cores}\n'
+        f'flags\t\t: fpu vme de pse tsc msr pae mce cx8 apic sep mtrr sse sse2 ht syscall nx lm '
+        f'constant_tsc pni ssse3 fma cx16 sse4_1 sse4_2 popcnt aes avx f16c rdrand avx2 avx512f\n'
+        f'bogomips\t: 4800.00\naddress sizes\t: 46 bits physical, 48 bits virtual\n'
+        for cpu in range(cpus))
+    files['/proc/stat'] = (
+        f'cpu  {cpus * 10000} {cpus * 50} {cpus * 4000} {cpus * 90000} {cpus * 300} 0 {cpus * 80} 0 0 0\n'
+        + ''.join(f'cpu{cpu} 10000 50 4000 90000 300 0 80 0 0 0\n' for cpu in range(cpus))
+        + 'intr 123456789\nctxt 987654321\nbtime 1700000000\nprocesses 54321\n'
+        'procs_running 2\nprocs_blocked 0\n')
+    
+    cpu_path = CPU_SYSFS_PATH
+    files[f'{cpu_path}/online'] = f'0-{cpus - 1}\n'
+    for cpu in range(cpus):
+        siblings = format_cpu_list([cpu % cores, cpu % cores + cores]) if cpus > 1 else '0'
+        files[f'{cpu_path}/cpu{cpu}/topology/thread_siblings_list'] = siblings + '\n'
+        files[f'{cpu_path}/cpu{cpu}/topology/physical_package_id'] = '0\n'
+        files[f'{cpu_path}/cpu{cpu}/topology/core_id'] = f'{cpu % cores}\n'
+        for index, (level, kind, size, shared) in enumerate((
+                (1, 'Data', '48K', siblings), (1, 'Instruction', '32K', siblings),
+                (2, 'Unified', '1280K', siblings), (3, 'Unified', '16384K', f'0-{cpus - 1}'))):
+            cache_dir = f'{cpu_path}/cpu{cpu}/cache/index{index}'
+            files[f'{cache_dir}/level'] = f'{level}\n'
+            files[f'{cache_dir}/type'] = f'{kind}\n'
+            files[f'{cache_dir}/size'] = f'{size}\n'
+            files[f'{cache_dir}/shared_cpu_list'] = f'{shared}\n'
+        policy_dir = f'{cpu_path}/cpufreq/policy{cpu}'
+        for name, value in (('affected_cpus', cpu), ('related_cpus', cpu), ('scaling_governor', 'powersave'),
+                            ('scaling_cur_freq', 2400000 + cpu * 1000), ('scaling_min_freq', 800000),
+                            ('scaling_max_freq', 3900000), ('cpuinfo_max_freq', 3900000)):
+            files[f'{policy_dir}/{name}'] = f'{value}\n'
+    files[f'{NODE_SYSFS_PATH}/node0/cpulist'] = f'0-{cpus - 1}\n'
+    files[f'{NODE_SYSFS_PATH}/node0/meminfo'] = 'Node 0 MemTotal:       16318412 kB\nNode 0 MemFree:         4211820 kB\n'
+    
+    diskstats = []
+    for index in range(disks):
+        disk = f'sd{chr(ord("a") + index)}'
+        partition = f'{disk}1'
+        disk_path = f'/sys/block/{disk}'
+        files[f'{disk_path}/size'] = f'{(index + 1) * 500118192}\n'
+        files[f'{disk_path}/queue/rotational'] = f'{index % 2}\n'
+        files[f'{disk_path}/device/model'] = f'Fixture Disk {index}\n'
+        files[f'{disk_path}/device/vendor'] = 'ATA\n'
+        files[f'{disk_path}/stat'] = '12345 0 987654 4321 6789 0 456789 9876 0 5432 14197 0 0 0 0\n'
+        files[f'{disk_path}/{partition}/partition'] = '1\n'
+        links[f'/sys/class/block/{disk}'] = f'../../block/{disk}'
+        links[f'/sys/class/block/{partition}'] = f'../../block/{disk}/{partition}'
+        diskstats.append(f'   8 {index * 16:7d} {disk} 12345 0 987654 4321 6789 0 456789 9876 0 5432 14197 0 0 0 0')
+        diskstats.append(f'   8 {index * 16 + 1:7d} {partition} 12000 0 980000 4200 6700 0 450000 9800 0 5400 14000 0 0 0 0')
+    diskstats.append('   7       0 loop0 100 0 200 10 0 0 0 0 0 10 10 0 0 0 0')
+    files['/proc/diskstats'] = '\n'.join(diskstats) + '\n'
+    
+    netdev = ['Inter-|   Receive                                                |  Transmit',
+              ' face |bytes    packets errs drop fifo frame compressed multicast|'
+              'bytes    packets errs drop fifo colls carrier compressed',
+              '    lo: 1234567    8901    0    0    0     0          0         0  1234567    8901    0    0    0     0       0          0']
+    files['/sys/class/net/lo/operstate'] = 'unknown\n'
+    files['/sys/class/net/lo/address'] = '00:00:00:00:00:00\n'
+    for index in range(nics):
+        nic = f'eth{index}'
+        nic_path = f'/sys/class/net/{nic}'
+        files[f'{nic_path}/operstate'] = 'up\n'
+        files[f'{nic_path}/address'] = f'52:54:00:12:34:{index:02x}\n'
+        files[f'{nic_path}/speed'] = '1000\n'
+        files[f'{nic_path}/carrier'] = '1\n'
+        files[f'{nic_path}/mtu'] = '1500\n'
+        files[f'{nic_path}/device/vendor'] = '0x8086\n'
+        for counter in NET_ERROR_COUNTERS:
+            files[f'{nic_path}/statistics/{counter}'] = '0\n'
+        files[f'{nic_path}/queues/tx-0/tx_timeout'] = '0\n'
+        files[f'{nic_path}/queues/tx-0/byte_queue_limits/inflight'] = '0\n'
+        netdev.append(f'  {nic}: 987654321  765432    0    0    0     0          0       120 '
+                      f'123456789  234567    0    0    0     0       0          0')
+    files['/proc/net/dev'] = '\n'.join(netdev) + '\n'
+    
+    files['/sys/class/thermal/thermal_zone0/type'] = 'x86_pkg_temp\n'
+    files['/sys/class/thermal/thermal_zone0/temp'] = '48000\n'
+    files['/sys/class/thermal/thermal_zone0/trip_point_0_temp'] = '100000\n'
+    files['/sys/class/thermal/cooling_device0/type'] = 'Processor\n'
+    files['/sys/class/thermal/cooling_device0/cur_state'] = '0\n'
+    files['/sys/class/thermal/cooling_device0/max_state'] = '3\n'
+    files[f'{HWMON_PATH}/hwmon0/name'] = 'coretemp\n'
+    for core in range(cores):
+        files[f'{HWMON_PATH}/hwmon0/temp{core + 1}_input'] = f'{45000 + core * 1000}\n'
+        files[f'{HWMON_PATH}/hwmon0/temp{core + 1}_label'] = f'Core {core}\n'
+        files[f'{HWMON_PATH}/hwmon0/temp{core + 1}_max'] = '100000\n'
+        files[f'{HWMON_PATH}/hwmon0/temp{core + 1}_crit'] = '100000\n'
+        files[f'{HWMON_PATH}/hwmon0/temp{core + 1}_crit_alarm'] = '0\n'
+    files[f'{HWMON_PATH}/hwmon1/name'] = 'nct6775\n'
+    files[f'{HWMON_PATH}/hwmon1/fan1_input'] = '1180\n'
+    files[f'{HWMON_PATH}/hwmon1/in0_input'] = '1032\n'
+    
+    for zone, name, energy in (('intel-rapl:0', 'package-0', 123456789012), ('intel-rapl:0:0', 'core', 98765432101)):
+        files[f'{POWERCAP_PATH}/{zone}/name'] = f'{name}\n'
+        files[f'{POWERCAP_PATH}/{zone}/enabled'] = '1\n'
+        files[f'{POWERCAP_PATH}/{zone}/energy_uj'] = f'{energy}\n'
+        files[f'{POWERCAP_PATH}/{zone}/max_energy_range_uj'] = '262143328850\n'
+    files['/sys/class/power_supply/AC/type'] = 'Mains\n'
+    files['/sys/class/power_supply/AC/online'] = '1\n'
+    files['/sys/class/power_supply/BAT0/type'] = 'Battery\n'
+    files['/sys/class/power_supply/BAT0/capacity'] = '87\n'
+    files['/sys/class/power_supply/BAT0/status'] = 'Charging\n'
+    files['/sys/class/power_supply/BAT0/voltage_now'] = '12600000\n'
+    
+    for name, value in (('board_vendor', 'Fixture Inc.'), ('board_name', 'FX-1000'), ('board_version', '1.0'),
+                        ('sys_vendor', 'Fixture Inc.'), ('product_name', 'Fixture Server'),
+                        ('product_version', '1.0'), ('bios_vendor', 'Fixture BIOS'),
+                        ('bios_version', '2.4.1'), ('bios_date', '01/15/2024'),
+                        ('chassis_vendor', 'Fixture Inc.'), ('chassis_type', '17')):
+        files[f'/sys/class/dmi/id/{name}'] = f'{value}\n'
+    
+    for address, vendor, device, pci_class, driver in (
+            ('0000:00:00.0', '0x8086', '0x2020', '0x060000', None),
+            ('0000:00:02.0', '0x8086', '0x3e92', '0x030000', 'i915'),
+            ('0000:00:1f.6', '0x8086', '0x15bc', '0x020000', 'e1000e')):
+        device_path = f'{PCI_DEVICES_PATH}/{address}'
+        for name, value in (('vendor', vendor), ('device', device), ('class', pci_class), ('revision', '0x00'),
+                            ('subsystem_vendor', vendor), ('subsystem_device', '0x0000'), ('numa_node', '-1'),
+                            ('current_link_speed', '8.0 GT/s PCIe'), ('current_link_width', '4'),
+                            ('max_link_speed', '8.0 GT/s PCIe'), ('max_link_width', '4')):
+            files[f'{device_path}/{name}'] = f'{value}\n'
+        if driver:
+            files[f'/sys/bus/pci/drivers/{driver}/bind'] = ''
+            links[f'{device_path}/driver'] = f'../../../bus/pci/drivers/{driver}'
+    files['/sys/class/drm/card0/device/vendor'] = '0x8086\n'
+    links['/sys/class/drm/card0/device/driver'] = '../../../../bus/pci/drivers/i915'
+    files['/sys/bus/usb/devices/usb1/product'] = 'xHCI Host Controller\n'
+    files['/sys/bus/usb/devices/1-1/product'] = 'Fixture Keyboard\n'
+    files['/sys/bus/usb/devices/1-1/manufacturer'] = 'Fixture Inc.\n'
+    files['/sys/bus/usb/devices/1-1/serial'] = 'FX0001\n'
+    return files, links
+
+def generate_fixture_tree(root, cpus=BENCHMARK_FIXTURE_CPUS, disks=BENCHMARK_FIXTURE_DISKS,
+                          nics=BENCHMARK_FIXTURE_NICS):
+    """Write the synthetic host tree below root; return the number of files written."""
+    files, links = synthetic_fixture_files(cpus, disks, nics)
+    for path, content in files.items():
+        target = root + path
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w') as f:
+            f.write(content)
+    for path, link in links.items():
+        target = root + path
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if not os.path.lexists(target):
+            os.symlink(link, target)
+    return len(files)
+
+def reset_collection_state():
+    """Forget shared sources and cached descriptors so the next collection starts cold."""
+    SharedSource.reset_all()
+    FILE_READER.close_all()
+
+def benchmark_cases(verbosity, scratch_dir):
+    """Return (name, function, cold) for every collector and render/export path.
+    
+    Cold cases start from reset_collection_state(), as a fresh run of the
+    script would. The render, export and sampling cases work on data
+    collected once up front, so they time only their own code.
+    """
+    sections = get_hardware_sections()
+    cases = [(f'collect.{key}', (lambda key=key, func=func: run_collector(key, func, verbosity)), True)
+             for _, key, func in sections]
+    cases.append(('collect.all', lambda: list(collect_sections(verbosity, sections=sections)), True))
+    
+    reset_collection_state()
+    collected = OrderedDict((key, data) for _, key, data, _ in collect_sections(verbosity, sections=sections))
+    samplers = create_dynamic_samplers()
+    samples = sample_dynamic_metrics(samplers)
+    
+    def render():
+        return [render_info_table(data['data'], verbosity) for data in collected.values()]
+    
+    def export(function, extension):
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(collected, os.path.join(scratch_dir, f'benchmark.{extension}'))
+    
+    cases.extend([
+        ('render.tables', render, False),
+        ('export.json', lambda: export(export_to_json, 'json'), False),
+        ('export.csv', lambda: export(export_to_csv, 'csv'), False),
+        ('export.log', lambda: export(export_to_log, 'log'), False),
+        ('export.prometheus', lambda: render_prometheus(samples), False),
+        ('sample.dynamic', lambda: sample_dynamic_metrics(samplers), False),
+    ])
+    return cases
+
+def run_benchmark_cases(cases, iterations, rounds, counter):
+    """Time each case after one warm-up run; return {name: {'best_ms', 'p50_ms', 'p99_ms', 'opens', 'subprocesses'}}.
+    
+    The cases take turns for several rounds of iterations each, so a burst
+    of load on the machine slows one round rather than one case. best_ms is
+    the lowest median of any round: background noise only ever adds time,
+    so it is the figure that repeats from run to run.
+    """
+    for _, func, cold in cases:
+        if cold:
+            reset_collection_state()
+        func()
+    
+    timings = {name: [] for name, _, _ in cases}
+    medians = {name: [] for name, _, _ in cases}
+    opens = dict.fromkeys(timings, 0)
+    subprocesses = dict.fromkeys(timings, 0)
+    for _ in range(rounds):
+        for name, func, cold in cases:
+            round_timings = []
+            for _ in range(iterations):
+                if cold:
+                    reset_collection_state()
+                elapsed, case_opens, case_subprocesses = counter.measure(func)
+                round_timings.append(elapsed * 1000.0)
+                opens[name] = max(opens[name], case_opens)
+                subprocesses[name] = max(subprocesses[name], case_subprocesses)
+            round_timings.sort()
+            medians[name].append(percentile(round_timings, 50))
+            timings[name].extend(round_timings)
+    
+    results = OrderedDict()
+    for name, _, _ in cases:
+        timings[name].sort()
+        results[name] = OrderedDict([
+            ('best_ms', round(min(medians[name]), 4)),
+            ('p50_ms', round(percentile(timings[name], 50), 4)),
+            ('p99_ms', round(percentile(timings[name], 99), 4)),
+            ('opens', opens[name]),
+            ('subprocesses', subprocesses[name]),
+        ])
+    return results
+
+def compare_benchmark(results, baseline, threshold):
+    """Compare results with a baseline; return {name: (baseline best_ms or None, status)}.
+    
+    A case fails when its best round median grew by more than threshold
+    percent (and by more than BENCHMARK_MIN_DELTA_MS, the scheduler and
+    timer noise of sub-millisecond cases) or when it opens more files or
+    spawns more subprocesses than before.
+    """
+    verdicts = OrderedDict()
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            verdicts[name] = (None, 'NEW')
+            continue
+        failures = []
+        delta = result['best_ms'] - base['best_ms']
+        if delta > max(base['best_ms'] * threshold / 100.0, BENCHMARK_MIN_DELTA_MS):
+            failures.append('SLOWER')
+        if result['opens'] > base.get('opens', 0):
+            failures.append('MORE OPENS')
+        if result['subprocesses'] > base.get('subprocesses', 0):
+            failures.append('MORE SUBPROCESSES')
+        verdicts[name] = (base['best_ms'], ', '.join(failures) or 'OK')
+    return verdicts
+
+def load_benchmark_baseline(path):
+    """Load a baseline file written with --save."""
+    try:
+        with open(path) as f:
+            content = json.load(f, object_pairs_hook=OrderedDict)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read {path}: {e}")
+    if not isinstance(content, dict) or content.get('version') != BENCHMARK_BASELINE_VERSION \
+            or not isinstance(content.get('results'), dict):
+        raise ValueError(f"{path} is not a benchmark baseline (version {BENCHMARK_BASELINE_VERSION})")
+    return content
+
+def print_benchmark_report(results, verdicts=None):
+    """Print one row per case, with the baseline comparison when there is one."""
+    headers = ["Benchmark", "Best ms", "p50 ms", "p99 ms", "Opens", "Subprocesses"]
+    if verdicts is not None:
+        headers += ["Baseline best", "Change", "Status"]
+    rows = []
+    colors = []
+    for name, result in results.items():
+        row = [name, f"{result['best_ms']:.3f}", f"{result['p50_ms']:.3f}", f"{result['p99_ms']:.3f}",
+               str(result['opens']), str(result['subprocesses'])]
+        row_colors = [COLOR_BLUE, COLOR_WHITE, COLOR_WHITE, COLOR_WHITE, COLOR_WHITE, COLOR_WHITE]
+        if verdicts is not None:
+            base_best, status = verdicts[name]
+            change = f"{(result['best_ms'] - base_best) / base_best * 100:+.1f}%" if base_best else '-'
+            row += [f"{base_best:.3f}" if base_best is not None else '-', change, status]
+            row_colors += [COLOR_WHITE, COLOR_WHITE,
+                           COLOR_GREEN if status == 'OK' else COLOR_CYAN if status == 'NEW' else COLOR_RED]
+        rows.append(row)
+        colors.append(row_colors)
+    print_formatted_table(headers, rows, COLOR_GREEN, colors, max_col_width=40)
+
+def run_benchmark(args):
+    """Run the benchmark subcommand; return the process exit status."""
+    if args.generate_fixture:
+        count = generate_fixture_tree(os.path.abspath(args.generate_fixture))
+        print(f"{colorize('[SUCCESS]', COLOR_GREEN)} Wrote {count} fixture files to: "
+              f"{colorize(args.generate_fixture, COLOR_CYAN)}")
+        return 0
+    
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_benchmark_baseline(args.compare)
+        except ValueError as e:
+            print(f"{colorize('[ERROR]', COLOR_RED)} Invalid baseline: {e}")
+            return 1
+    
+    with tempfile.TemporaryDirectory(prefix='hardware_monitor_bench_') as scratch_dir:
+        if args.live:
+            source = 'live host'
+        elif args.fixture:
+            source = os.path.abspath(args.fixture)
+            try:
+                configure_host_root(prepare_host_root(args.fixture))
+            except ValueError as e:
+                print(f"{colorize('[ERROR]', COLOR_RED)} Invalid fixture: {e}")
+                return 1
+        else:
+            source = 'synthetic'
+            generate_fixture_tree(os.path.join(scratch_dir, 'fixture'))
+            configure_host_root(os.path.join(scratch_dir, 'fixture'))
+        TOOLS.configure(offline=not args.live)
+        INVENTORY_CACHE.configure(enabled=False)
+        configure_sample_pause(0.0)
+        
+        print_section_header("BENCHMARK", COLOR_GREEN)
+        print(f"Source: {colorize(source, COLOR_CYAN)} | Iterations: {args.iterations} x {args.rounds} rounds | "
+              f"Verbosity: {args.verbosity}\n")
+        counter = SyscallCounter()
+        results = run_benchmark_cases(benchmark_cases(args.verbosity, scratch_dir), args.iterations,
+                                      args.rounds, counter)
+    
+    verdicts = None
+    if baseline is not None:
+        for field, current in (('source', source), ('verbosity', args.verbosity)):
+            if baseline.get(field) != current:
+                print(f"{colorize('[WARNING]', COLOR_YELLOW)} The baseline was recorded with {field} "
+                      f"{baseline.get(field)}, this run uses {current}; timings may not be comparable\n")
+        verdicts = compare_benchmark(results, baseline['results'], args.threshold)
+    print_benchmark_report(results, verdicts)
+    
+    if args.save:
+        content = OrderedDict([
+            ('version', BENCHMARK_BASELINE_VERSION),
+            ('created', datetime.now().isoformat(timespec='seconds')),
+            ('source', source),
+            ('iterations', args.iterations),
+            ('rounds', args.rounds),
+            ('verbosity', args.verbosity),
+            ('results', results),
+        ])
+        try:
+            with open(args.save, 'w') as f:
+                json.dump(content, f, indent=2)
+            print(f"\n{colorize('[SUCCESS]', COLOR_GREEN)} Baseline saved to: {colorize(args.save, COLOR_CYAN)}")
+        except OSError as e:
+            print(f"\n{colorize('[ERROR]', COLOR_RED)} Failed to save baseline: {e}")
+            return 1
+    
+    if verdicts is not None:
+        failed = [name for name, (_, status) in verdicts.items() if status not in ('OK', 'NEW')]
+        if failed:
+            print(f"\n{colorize('[FAIL]', COLOR_RED)} {len(failed)} benchmark(s) regressed beyond "
+                  f"{args.threshold:g}%: {', '.join(failed)}")
+            return 1
+        print(f"\n{colorize('[PASS]', COLOR_GREEN)} No regression beyond {args.threshold:g}% against "
+              f"{colorize(args.compare, COLOR_CYAN)}")
+    return 0
+
+##################
+# HOST SNAPSHOTS #
+##################
+
+class SnapshotWriter:
+    """Copy host files into a tar archive so the collectors can replay them with --root.
+    
+    Each path is resolved one component at a time. The symlinks met on the
+    way are stored as links (absolute targets rewritten relative) and the
+    file or directory itself at its real location, so the extracted tree
+    resolves like sysfs does. Files are read rather than stat'ed, since /proc
+    and /sys report sizes of 0 or 4096, and unreadable files are left out as
+    they are unreadable for the collectors too. Directories also get their
+    entries, unread files as empty placeholders, so listings match.
+    """
+    
+    def __init__(self, root=''):
+        self.root = root
+        self.entries = {}
+    
+    def add(self, path):
+        """Add a host path and every symlink leading to it."""
+        real = self._resolve(path, 0)
+        if real is None or not os.path.lexists(self.root + real):
+            return
+        if os.path.isdir(self.root + real):
+            self._add_directory(real)
+        elif self.entries.get(real) is None:
+            try:
+                with open(self.root + real, 'rb') as f:
+                    self.entries[real] = ('file', f.read())
+            except OSError:
+                self.entries.pop(real, None)
+    
+    def _resolve(self, path, depth):
+        if depth > SNAPSHOT_MAX_LINK_DEPTH:
+            return None
+        real = '/'
+        for part in path.strip('/').split('/'):
+            candidate = os.path.join(real, part)
+            if os.path.islink(self.root + candidate):
+                target = self._add_link(candidate)
+                if target is None:
+                    return None
+                real = self._resolve(os.path.normpath(os.path.join(real, target)), depth + 1)
+                if real is None:
+                    return None
+            else:
+                real = candidate
+        return real
+    
+    def _add_link(self, path):
+        try:
+            target = os.readlink(self.root + path)
+        except OSError:
+            return None
+        if self.root and target.startswith(self.root + '/'):
+            target = target[len(self.root):]
+        stored = os.path.relpath(target, os.path.dirname(path)) if os.path.isabs(target) else target
+        self.entries[path] = ('link', stored)
+        return target
+    
+    def _add_directory(self, path):
+        self.entries[path] = ('dir', None)
+        try:
+            names = os.listdir(self.root + path)
+        except OSError:
+            return
+        for name in names:
+            child = os.path.join(path, name)
+            if child in self.entries:
+                continue
+            if os.path.islink(self.root + child):
+                self._add_link(child)
+            elif os.path.isdir(self.root + child):
+                self.entries[child] = ('dir', None)
+            else:
+                self.entries[child] = None
+    
+    def write(self, archive, metadata):
+        """Write every entry and the metadata file; return the number of files stored."""
+        files = 0
+        for path in sorted(self.entries):
+            entry = self.entries[path] or ('file', b'')
+            member = tarfile.TarInfo(path.lstrip('/'))
+            member.mtime = int(metadata['captured'])
+            if entry[0] == 'dir':
+                member.type, member.mode = tarfile.DIRTYPE, 0o755
+                archive.addfile(member)
+            elif entry[0] == 'link':
+                member.type, member.linkname = tarfile.SYMTYPE, entry[1]
+                archive.addfile(member)
+            else:
+                member.size, member.mode = len(entry[1]), 0o444
+                archive.addfile(member, io.BytesIO(entry[1]))
+                files += 1
+        content = json.dumps(dict(metadata, files=files), indent=2).encode('utf-8')
+        member = tarfile.TarInfo(SNAPSHOT_METADATA_NAME)
+        member.size, member.mode, member.mtime = len(content), 0o444, int(metadata['captured'])
+        archive.addfile(member, io.BytesIO(content))
+        return files
+
+def record_host_paths(verbosity=VERBOSITY_FULL):
+    """Run every collector, sampler and selectable metric source once; return the host paths they touched.
+    
+    External tools are not run, as their output cannot be replayed from a
+    snapshot, and rate metrics are sampled without a pause.
+    """
+    global HOST_PATH_LOG
+    TOOLS.configure(offline=True)
+    INVENTORY_CACHE.configure(enabled=False)
+    configure_sample_pause(0.0)
+    reset_collection_state()
+    HOST_PATH_LOG = paths = set()
+    try:
+        for _ in collect_sections(verbosity):
+            pass
+        sample_dynamic_metrics(create_dynamic_samplers())
+        for loader in SELECTION_SOURCES.values():
+            try:
+                loader()
+            except (OSError, ValueError):
+                continue
+    finally:
+        HOST_PATH_LOG = None
+    return paths
+
+def capture_host_snapshot(output_path, verbosity=VERBOSITY_FULL):
+    """Write a gzip-compressed snapshot of every host file the collectors read; return the file count."""
+    paths = record_host_paths(verbosity)
+    writer = SnapshotWriter(HOST_ROOT)
+    for path in sorted(paths):
+        writer.add(path)
+    
+    metadata = OrderedDict([
+        ('version', SNAPSHOT_VERSION),
+        ('captured', time.time()),
+        ('tool_version', VERSION),
+        ('uname', read_kernel_identity()._asdict()),
+    ])
+    space = read_root_filesystem_space()
+    if space is not None:
+        metadata['root_filesystem'] = {'used': space[0], 'available': space[1]}
+    
+    with tarfile.open(output_path, 'w:gz') as archive:
+        return writer.write(archive, metadata)
+
+def snapshot_member_safe(member, directory):
+    """Check that a member stays inside directory (for Pythons without tarfile filters)."""
+    target = os.path.realpath(os.path.join(directory, member.name))
+    if not (member.isfile() or member.isdir() or member.issym()) or \
+            os.path.commonpath([directory, target]) != directory:
+        return False
+    if member.issym():
+        link = os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))
+        return not os.path.isabs(member.linkname) and os.path.commonpath([directory, link]) == directory
+    return True
+
+def prepare_host_root(path):
+    """Return the directory to read the host tree from.
+    
+    A directory is used as is; a snapshot archive written by the capture
+    subcommand is extracted to a temporary directory removed at exit.
+    Raises ValueError for anything else.
+    """
+    if os.path.isdir(path):
+        return os.path.abspath(path)
+    if not os.path.isfile(path) or not tarfile.is_tarfile(path):
+        raise ValueError(f"{path} is neither a directory nor a snapshot archive")
+    
+    directory = os.path.realpath(tempfile.mkdtemp(prefix='hardware_monitor_root_'))
+    atexit.register(shutil.rmtree, directory, True)
+    try:
+        with tarfile.open(path) as archive:
+            if hasattr(tarfile, 'data_filter'):
+                archive.extractall(directory, filter='data')
+            else:
+                archive.extractall(directory, [m for m in archive.getmembers()
+                                               if snapshot_member_safe(m, directory)])
+    except (OSError, tarfile.TarError) as e:
+        raise ValueError(f"cannot extract {path}: {e}")
+    return directory
+
+def run_capture(args):
+    """Run the capture subcommand; return the process exit status."""
+    started = time.monotonic()
+    try:
+        files = capture_host_snapshot(args.output, args.verbosity)
+    except (OSError, tarfile.TarError) as e:
+        print(f"{colorize('[ERROR]', COLOR_RED)} Failed to write snapshot: {e}")
+        return 1
+    print(f"{colorize('[SUCCESS]', COLOR_GREEN)} Captured {files} files "
+          f"({bytes_to_human(os.path.getsize(args.output))}) in {time.monotonic() - started:.2f}s to: "
+          f"{colorize(args.output, COLOR_CYAN)}")
+    if os.geteuid() != 0:
+        print(f"{colorize('[WARNING]', COLOR_YELLOW)} Captured as a non-root user; "
+              f"files readable only by root are missing from the snapshot.")
+    return 0
 
 ####################
 # EXPORT FUNCTIONS #
 ####################
 
+def export_value(value):
+    """JSON encoder hook that exports Metrics as their raw value and unit."""
+    if isinstance(value, Metric):
+        return value.to_export()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 def export_to_json(data, filepath):
     """Export collected data to JSON file."""
     try:
         with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, indent=2, default=export_value)
         print(f"\n{colorize('[SUCCESS]', COLOR_GREEN)} Data exported to: {colorize(filepath, COLOR_CYAN)}")
     except Exception as e:
         print(f"\n{colorize('[ERROR]', COLOR_RED)} Failed to export JSON: {str(e)}")
@@ -1149,7 +5974,7 @@ def export_to_csv(data, filepath):
     try:
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(['Category', 'Severity', 'Key', 'Value'])
+            writer.writerow(['Category', 'Severity', 'Key', 'Value', 'Unit'])
             
             for category, info in data.items():
                 if isinstance(info, dict):
@@ -1158,9 +5983,12 @@ def export_to_csv(data, filepath):
                     
                     if 'data' in info and isinstance(info['data'], dict):
                         for key, value in info['data'].items():
+                            if isinstance(value, Metric):
+                                writer.writerow([category_name, severity, key, value.value, value.unit])
+                                continue
                             if isinstance(value, (list, dict)):
-                                value = json.dumps(value)
-                            writer.writerow([category_name, severity, key, str(value)])
+                                value = json.dumps(value, default=export_value)
+                            writer.writerow([category_name, severity, key, str(value), ''])
         
         print(f"\n{colorize('[SUCCESS]', COLOR_GREEN)} Data exported to: {colorize(filepath, COLOR_CYAN)}")
     except Exception as e:
@@ -1187,7 +6015,7 @@ def export_to_log(data, filepath):
                         for key, value in info['data'].items():
                             if isinstance(value, (list, dict)):
                                 f.write(f"{key}:\n")
-                                f.write(f"  {json.dumps(value, indent=2)}\n")
+                                f.write(f"  {json.dumps(value, indent=2, default=str)}\n")
                             else:
                                 f.write(f"{key}: {value}\n")
         
@@ -1211,6 +6039,15 @@ Examples:
   %(prog)s --vv --export-format=json
   %(prog)s --vvv --export-format=log --path=/tmp/reports
   %(prog)s --vv --export-format=csv --path=./output
+  %(prog)s --vvv --workers=4
+  %(prog)s --vv --watch=2
+  %(prog)s --watch=60 --history-file=/var/lib/hardware_monitor/history.hwh
+  %(prog)s --serve=9105 --refresh=15
+  %(prog)s query /var/lib/hardware_monitor/history.hwh --series='thermal.*' --since=24h --step=5m --agg=max
+  %(prog)s capture host.tar.gz
+  %(prog)s --vvv --root=host.tar.gz
+  %(prog)s benchmark --iterations=50 --save=baseline.json
+  %(prog)s benchmark --compare=baseline.json --threshold=25
         """)
     
     parser.add_argument('--v', action='store_const', const=VERBOSITY_BASIC, 
@@ -1222,19 +6059,104 @@ Examples:
     parser.add_argument('--vvv', action='store_const', const=VERBOSITY_FULL, 
                        dest='verbosity',
                        help='Full verbosity (comprehensive hardware analysis)')
+    parser.add_argument('--only', type=metric_name_list, metavar='METRICS',
+                       help='Collect only these comma-separated metrics (names or patterns) and '
+                            f'skip every other read: {", ".join(METRIC_REGISTRY)}')
     parser.add_argument('--export-format', choices=['log', 'json', 'csv'],
                        help='Export format (log/json/csv)')
     parser.add_argument('--path', default='.',
                        help='Output directory for exported files (default: current directory)')
+    parser.add_argument('--workers', type=positive_int, default=DEFAULT_COLLECTOR_WORKERS,
+                       help=f'Number of collectors run in parallel (default: {DEFAULT_COLLECTOR_WORKERS})')
+    parser.add_argument('--watch', type=positive_float, metavar='INTERVAL',
+                       help='Keep running and re-sample dynamic metrics every INTERVAL seconds')
+    parser.add_argument('--dashboard', type=positive_float, metavar='INTERVAL', nargs='?',
+                       const=DASHBOARD_DEFAULT_INTERVAL,
+                       help=f'Full-screen live dashboard refreshed every INTERVAL seconds '
+                            f'(default: {DASHBOARD_DEFAULT_INTERVAL:g})')
+    parser.add_argument('--count', type=positive_int,
+                       help='Number of samples to take in watch mode (default: until interrupted)')
+    parser.add_argument('--history', type=positive_int, default=DEFAULT_HISTORY_SLOTS, metavar='SAMPLES',
+                       help=f'Samples kept per metric in watch mode (default: {DEFAULT_HISTORY_SLOTS})')
+    parser.add_argument('--history-file', metavar='PATH',
+                       help='Append sampled dynamic metrics to an on-disk history file')
+    parser.add_argument('--no-color', action='store_true',
+                       help='Disable colored output (default when stdout is not a terminal)')
+    parser.add_argument('--root', metavar='PATH',
+                       help='Read /proc, /sys and /etc below PATH, a directory or a snapshot written by capture')
+    parser.add_argument('--rules', metavar='FILE',
+                       help='JSON file of alert rules overriding the default thresholds')
+    parser.add_argument('--serve', type=port_number, metavar='PORT', nargs='?', const=PROMETHEUS_DEFAULT_PORT,
+                       help=f'Serve Prometheus metrics on /metrics (default port: {PROMETHEUS_DEFAULT_PORT})')
+    parser.add_argument('--bind', default='127.0.0.1', metavar='ADDRESS',
+                       help='Address the metrics server listens on (default: 127.0.0.1)')
+    parser.add_argument('--refresh', type=positive_float, default=PROMETHEUS_REFRESH_INTERVAL, metavar='SECONDS',
+                       help=f'Seconds between metric snapshots when serving (default: {PROMETHEUS_REFRESH_INTERVAL:g})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the boot-scoped inventory cache')
+    parser.add_argument('--refresh-cache', action='store_true',
+                       help='Re-collect the static inventory and rewrite the cache')
+    parser.add_argument('--cache-report', action='store_true',
+                       help='Show inventory cache hits and misses per source')
+    parser.add_argument('--tool-report', action='store_true',
+                       help='Show resolved external tools and subprocess counts per tool')
     parser.add_argument('--version', action='version', version=f'%(prog)s {VERSION}')
     
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    query = subparsers.add_parser('query', help='Query a history file written with --history-file')
+    query.add_argument('file', help='History file to read')
+    query.add_argument('--series', default='*',
+                       help="Metric name or glob pattern, e.g. 'thermal.temperature' or 'cpu.*' (default: all)")
+    query.add_argument('--label', type=parse_label_filter, action='append', default=[], metavar='KEY=VALUE',
+                       help='Only series with this label value (repeatable)')
+    query.add_argument('--since', type=parse_duration, default=DURATION_UNITS['d'], metavar='DURATION',
+                       help='How far back to look, e.g. 30m, 24h, 7d (default: 24h)')
+    query.add_argument('--step', type=parse_duration, metavar='DURATION',
+                       help='Aggregate into buckets of this size, e.g. 5m (default: every sample)')
+    query.add_argument('--agg', choices=list(HISTORY_AGGREGATES), default='max',
+                       help='Aggregation applied within each bucket (default: max)')
+    
+    
+    capture = subparsers.add_parser('capture', help='Archive every host file the collectors read, for --root')
+    capture.add_argument('output', help='Snapshot archive to write (gzip-compressed tar)')
+    capture.add_argument('--verbosity', type=int, choices=[VERBOSITY_BASIC, VERBOSITY_DETAILED, VERBOSITY_FULL],
+                         default=VERBOSITY_FULL, help='Verbosity whose reads are captured (default: 3)')
+    
+    bench = subparsers.add_parser('benchmark', help='Time every collector and the render/export paths')
+    bench.add_argument('--iterations', type=positive_int, default=BENCHMARK_ITERATIONS,
+                       help=f'Runs per benchmark in each round (default: {BENCHMARK_ITERATIONS})')
+    bench.add_argument('--rounds', type=positive_int, default=BENCHMARK_ROUNDS,
+                       help=f'Rounds the benchmarks take turns in (default: {BENCHMARK_ROUNDS})')
+    bench.add_argument('--verbosity', type=int, choices=[VERBOSITY_BASIC, VERBOSITY_DETAILED, VERBOSITY_FULL],
+                       default=VERBOSITY_FULL, help='Verbosity the collectors run at (default: 3)')
+    source = bench.add_mutually_exclusive_group()
+    source.add_argument('--fixture', metavar='PATH',
+                        help='Host tree or snapshot archive to read from (default: a generated synthetic tree)')
+    source.add_argument('--live', action='store_true',
+                        help='Benchmark the running host, including external tools')
+    source.add_argument('--generate-fixture', metavar='DIR',
+                        help='Write the synthetic fixture tree to DIR and exit')
+    bench.add_argument('--save', metavar='FILE', help='Save the results as a JSON baseline')
+    bench.add_argument('--compare', metavar='FILE',
+                       help='Compare with a saved baseline and exit with status 1 on a regression')
+    bench.add_argument('--threshold', type=positive_float, default=BENCHMARK_THRESHOLD, metavar='PCT',
+                       help=f'Allowed slowdown of the best round median in percent (default: {BENCHMARK_THRESHOLD:g})')
+    
     return parser
 
-def collect_all_hardware_info(verbosity):
-    """Collect all hardware information."""
-    collected_data = OrderedDict()
-    
-    sections = [
+def positive_int(value):
+    """Argparse type for strictly positive integers."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"value must be at least 1, got {number}")
+    return number
+
+def get_hardware_sections():
+    """Return the ordered list of (title, key, collector) report sections."""
+    return [
         ("SYSTEM OVERVIEW", 'os', collect_os_information),
         ("PROCESSOR INFORMATION", 'cpu', collect_cpu_information),
         ("MEMORY INFORMATION", 'memory', collect_memory_information),
@@ -1247,15 +6169,48 @@ def collect_all_hardware_info(verbosity):
         ("PERIPHERALS INFORMATION", 'peripherals', collect_peripherals_information),
         ("PCI DEVICES INFORMATION", 'pci', collect_pci_information),
     ]
+
+def run_collector(key, collector_func, verbosity):
+    """Run a single collector and return (result_dict, error_message)."""
+    try:
+        info = collector_func(verbosity)
+        info.apply_rules(ALERT_RULES)
+        return info.to_dict(), None
+    except Exception as e:
+        error_data = {'category': key, 'severity': SEVERITY_CRITICAL, 'data': {'Error': str(e)}}
+        return error_data, str(e)
+
+def collect_sections(verbosity, workers=DEFAULT_COLLECTOR_WORKERS, sections=None):
+    """Run collectors on a bounded thread pool and yield results in section order.
+
+    Every collector is submitted up front, so the blocking sysfs reads and
+    subprocess calls overlap. Results are yielded as (title, key, data, error)
+    in the original section order, which lets callers render each section as
+    soon as it and all sections before it are done.
+    """
+    if sections is None:
+        sections = get_hardware_sections()
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            (section_title, key, executor.submit(run_collector, key, collector_func, verbosity))
+            for section_title, key, collector_func in sections
+        ]
+        for section_title, key, future in futures:
+            data, error = future.result()
+            yield section_title, key, data, error
+
+def collect_all_hardware_info(verbosity, workers=DEFAULT_COLLECTOR_WORKERS, sections=None):
+    """Collect all hardware information and print each section in order."""
+    collected_data = OrderedDict()
     
-    for section_title, key, collector_func in sections:
-        print_section_header(section_title)
-        try:
-            collected_data[key] = collector_func(verbosity).to_dict()
-            print_info_table(collected_data[key]['data'], key.upper(), verbosity)
-        except Exception as e:
-            print(f"{colorize('[ERROR]', COLOR_RED)} Failed to collect {section_title}: {str(e)}")
-            collected_data[key] = {'category': key, 'severity': SEVERITY_CRITICAL, 'data': {'Error': str(e)}}
+    for section_title, key, data, error in collect_sections(verbosity, workers, sections):
+        collected_data[key] = data
+        if error is not None:
+            body = f"{colorize('[ERROR]', COLOR_RED)} Failed to collect {section_title}: {error}\n"
+        else:
+            body = render_info_table(data['data'], verbosity)
+        emit(render_section_header(section_title) + body)
     
     return collected_data
 
@@ -1274,6 +6229,8 @@ def print_summary(collected_data):
          "CRITICAL" if critical_count > 0 else "OK"],
         ["Warnings", str(warn_count), 
          "WARNING" if warn_count > 0 else "OK"],
+        ["Subprocesses Spawned", str(TOOLS.spawn_count()), "OK"],
+        ["Inventory Cache", format_cache_summary(), "OK"],
         ["Overall Status", 
          "HEALTHY" if critical_count == 0 else "ISSUES DETECTED",
          "OK" if critical_count == 0 else "WARNING"]
@@ -1293,6 +6250,42 @@ def print_summary(collected_data):
     print_formatted_table(["Metric", "Value", "Status"], summary_data, 
                          COLOR_GREEN, summary_colors, max_col_width=30)
 
+def print_tool_report():
+    """Print external tool resolution and subprocess counts for this run."""
+    print_section_header("EXTERNAL TOOLS REPORT", COLOR_GREEN)
+    
+    rows = [[name, path, str(spawns)] for name, path, spawns in TOOLS.report()]
+    rows.append(["Total", "-", str(TOOLS.spawn_count())])
+    colors = [[COLOR_BLUE, COLOR_WHITE if path != 'not found' else COLOR_YELLOW, COLOR_WHITE]
+              for _, path, _ in rows]
+    
+    print_formatted_table(["Tool", "Path", "Subprocesses"], rows,
+                         COLOR_GREEN, colors, max_col_width=40)
+
+def format_cache_summary():
+    """Summarise inventory cache hits and misses for this run."""
+    statuses = [status for _, status in INVENTORY_CACHE.report()]
+    if not INVENTORY_CACHE.enabled:
+        return "disabled"
+    summary = f"{statuses.count('hit')} hit / {statuses.count('miss')} miss"
+    if 'empty' in statuses:
+        summary += f" / {statuses.count('empty')} empty"
+    return summary
+
+def print_cache_report():
+    """Print the inventory cache status of every static source used in this run."""
+    print_section_header("INVENTORY CACHE REPORT", COLOR_GREEN)
+    
+    status_colors = {'hit': COLOR_GREEN, 'miss': COLOR_YELLOW, 'empty': COLOR_RED, 'disabled': COLOR_WHITE}
+    rows = [[name, status, ', '.join(INVENTORY_DEPENDENCIES.get(name, ())) or 'boot']
+            for name, status in INVENTORY_CACHE.report()]
+    colors = [[COLOR_BLUE, status_colors.get(status, COLOR_WHITE), COLOR_WHITE]
+              for _, status, _ in rows]
+    
+    print_formatted_table(["Source", "Status", "Invalidated By"], rows,
+                         COLOR_GREEN, colors, max_col_width=50)
+    print(f"Cache file: {colorize(INVENTORY_CACHE.path, COLOR_CYAN)}")
+
 def export_data(collected_data, export_format, output_path):
     """Export collected data to specified format."""
     # Ensure output directory exists
@@ -1319,24 +6312,221 @@ def export_data(collected_data, export_format, output_path):
     if export_func:
         export_func(collected_data, filepath)
 
+def metric_name_list(value):
+    """Argparse type for a comma-separated list of metric names."""
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("expected at least one metric name")
+    return names
+
+def port_number(value):
+    """Argparse type for TCP port numbers; 0 picks a free port."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid port number: '{value}'")
+    if not 0 <= number <= 65535:
+        raise argparse.ArgumentTypeError(f"port must be between 0 and 65535, got {number}")
+    return number
+
+def positive_float(value):
+    """Argparse type for strictly positive numbers."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid numeric value: '{value}'")
+    if not math.isfinite(number):
+        raise argparse.ArgumentTypeError(f"value must be a finite number, got {value}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"value must be greater than 0, got {value}")
+    return number
+
+def format_sample_window(series):
+    """Format the min / avg / max of a series over its retained history."""
+    if series is None or series.count < 2 or series.unit == 'state':
+        return "-"
+    return " / ".join(format_sample_value(value, series.unit)
+                      for value in (series.min(), series.mean(), series.max()))
+
+def print_watch_tick(samples, tick, store):
+    """Print one tick of dynamic metrics as a table."""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    displayed = summarize_samples(samples, WATCH_SUMMARIZED_SAMPLES)
+    # Summary rows are tracked per statistic, not per (changing) busiest device
+    history_keys = [(s.name, OrderedDict([('stat', s.labels['stat'])]))
+                    if s.name in WATCH_SUMMARIZED_SAMPLES else (s.name, s.labels) for s in displayed]
+    store.record(samples)
+    store.record([Sample(name, labels, s.value, s.unit) for (name, labels), s in zip(history_keys, displayed)
+                  if name in WATCH_SUMMARIZED_SAMPLES])
+    
+    for alert in ALERT_RULES.evaluate(samples):
+        print_alert_change(alert)
+    
+    rows = []
+    colors = []
+    for sample, (name, labels) in zip(displayed, history_keys):
+        if not sample.value and sample.name.startswith(WATCH_HIDE_IDLE_PREFIXES):
+            continue
+        label = format_sample_label(sample)
+        value_str = format_sample_value(sample.value, sample.unit)
+        if name in WATCH_SUMMARIZED_SAMPLES:
+            severity = ALERT_RULES.classify(name, labels, sample.value)
+        else:
+            severity = ALERT_RULES.severity(name, labels)
+        status, status_color = SEVERITY_STATUS[severity]
+        window = format_sample_window(store.get(name, labels))
+        rows.append([label, value_str, window, status])
+        colors.append([COLOR_BLUE, COLOR_WHITE, COLOR_WHITE, status_color])
+    
+    emit(render_section_header(f"LIVE METRICS #{tick} - {timestamp}")
+         + render_table(["Metric", "Value", "Window (min / avg / max)", "Status"], rows,
+                        COLOR_CYAN, colors, max_col_width=40))
+
+def print_alert_change(alert):
+    """Print an alert that was raised, changed level or resolved."""
+    label = format_sample_label(alert.sample)
+    value = format_sample_value(alert.sample.value, alert.sample.unit)
+    if alert.level:
+        status, color = SEVERITY_STATUS[SEVERITY_LEVELS[alert.level]]
+        print(f"\n{colorize('[ALERT]', color)} {label}: {colorize(status, color)} ({value})")
+    else:
+        print(f"\n{colorize('[RESOLVED]', COLOR_GREEN)} {label} ({value})")
+
+def handle_hotplug_events(events, verbosity, workers=DEFAULT_COLLECTOR_WORKERS):
+    """Report device additions/removals and re-collect only the affected sections."""
+    keys = set()
+    for subsystem, action, name in events:
+        if subsystem is None:
+            keys.update(HOTPLUG_SECTIONS.values())
+        elif action in ('add', 'remove', 'move'):
+            print(f"\n{colorize('[HOTPLUG]', COLOR_MAGENTA)} {subsystem} device {colorize(name, COLOR_CYAN)}: {action}")
+            keys.add(HOTPLUG_SECTIONS[subsystem])
+    if not keys:
+        return
+    
+    if 'peripherals' in keys:
+        USB_DEVICES.reset()
+    if keys & {'storage', 'network', 'graphics'}:
+        PCI_DEVICES.reset()
+    sections = [s for s in get_hardware_sections() if s[1] in keys]
+    collect_all_hardware_info(verbosity, workers, sections)
+
+def run_watch_mode(verbosity, interval, count=None, workers=DEFAULT_COLLECTOR_WORKERS,
+                   history=DEFAULT_HISTORY_SLOTS, history_file=None):
+    """Collect static inventory once, then re-sample dynamic metrics every interval."""
+    monitor = UeventMonitor()
+    event_driven = monitor.start()
+    print(f"{colorize('[INFO]', COLOR_CYAN)} Hotplug detection: "
+          f"{'kernel uevents' if event_driven else 'polling sysfs every tick'}")
+    static_sections = [s for s in get_hardware_sections() if s[1] in WATCH_STATIC_SECTIONS]
+    collect_all_hardware_info(verbosity, workers, static_sections)
+    
+    samplers = create_dynamic_samplers()
+    store = MetricStore(history)
+    recorder = None
+    if history_file:
+        recorder = HistoryFile(history_file, writable=True)
+        if not recorder.open():
+            print(f"\n{colorize('[ERROR]', COLOR_RED)} Cannot write history file: {history_file}")
+            recorder = None
+    tick = 0
+    next_tick = time.monotonic()
+    try:
+        while count is None or tick < count:
+            tick += 1
+            monitor.poll()
+            handle_hotplug_events(DEVICE_INVENTORY.drain_events(), verbosity, workers)
+            samples = sample_dynamic_metrics(samplers)
+            if recorder is not None:
+                recorder.append(samples)
+            print_watch_tick(samples, tick, store)
+            if count is not None and tick >= count:
+                break
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    finally:
+        monitor.stop()
+        if recorder is not None:
+            recorder.close()
+        print(f"\n{colorize('[INFO]', COLOR_CYAN)} History: {len(store)} series x {store.capacity} samples "
+              f"({bytes_to_human(store.memory_bytes())})")
+    return store
+
 def main():
     """Main execution function."""
     parser = create_argument_parser()
     args = parser.parse_args()
+    configure_color(not args.no_color and 'NO_COLOR' not in os.environ and sys.stdout.isatty())
+    
+    if args.command == 'query':
+        run_history_query(args)
+        return
+    if args.command == 'benchmark':
+        sys.exit(run_benchmark(args))
+    
+    if args.root:
+        # External tools and the boot-scoped cache describe the running host
+        try:
+            configure_host_root(prepare_host_root(args.root))
+        except ValueError as e:
+            print(f"\n{colorize('[ERROR]', COLOR_RED)} Invalid root: {e}")
+            sys.exit(1)
+        TOOLS.configure(offline=True)
+    if args.command == 'capture':
+        sys.exit(run_capture(args))
+    
+    INVENTORY_CACHE.configure(enabled=not args.no_cache and not args.root, refresh=args.refresh_cache)
+    if args.rules:
+        try:
+            ALERT_RULES.configure(load_alert_rules(args.rules))
+        except ValueError as e:
+            print(f"\n{colorize('[ERROR]', COLOR_RED)} Invalid alert rules: {e}")
+            sys.exit(1)
+    
+    if args.serve is not None:
+        try:
+            run_exporter(args.bind, args.serve, args.refresh)
+        except KeyboardInterrupt:
+            print(f"\n{colorize('[INFO]', COLOR_CYAN)} Metrics server stopped by user")
+        return
+    
+    if args.only:
+        run_selected_metrics(args.only, args.export_format, args.path)
+        return
+    
+    if args.dashboard is not None:
+        try:
+            run_dashboard(args.dashboard)
+        except KeyboardInterrupt:
+            pass
+        return
     
     # Set default verbosity
     verbosity = args.verbosity if args.verbosity else VERBOSITY_BASIC
     
     # Print header
     print_main_header()
-    if os.geteuid() != 0:
+    if args.root:
+        print(f"\nHost Root: {colorize(args.root, COLOR_CYAN)} (external tools disabled)")
+    elif os.geteuid() != 0:
         print(f"\n{colorize('[WARNING]', COLOR_YELLOW)} Running as non-root user. Some detailed hardware information may require root privileges.")
     print(f"\nVerbosity Level: {colorize(['Basic', 'Detailed', 'Full'][verbosity - 1], COLOR_YELLOW)}")
     print(f"Timestamp: {colorize(datetime.now().strftime('%Y-%m-%d %H:%M:%S'), COLOR_GREEN)}\n")
     
+    # Watch mode keeps sampling until interrupted
+    if args.watch:
+        try:
+            run_watch_mode(verbosity, args.watch, args.count, args.workers, args.history,
+                           args.history_file)
+        except KeyboardInterrupt:
+            print(f"\n{colorize('[INFO]', COLOR_CYAN)} Watch mode stopped by user")
+        print_main_footer()
+        return
+    
     # Collect hardware information
     try:
-        collected_data = collect_all_hardware_info(verbosity)
+        collected_data = collect_all_hardware_info(verbosity, args.workers)
     except KeyboardInterrupt:
         print(f"\n\n{colorize('[WARNING]', COLOR_YELLOW)} Collection interrupted by user")
         sys.exit(1)
@@ -1346,6 +6536,18 @@ def main():
     
     # Print summary
     print_summary(collected_data)
+    if args.tool_report:
+        print_tool_report()
+    if args.cache_report:
+        print_cache_report()
+    
+    # Record one sample of the dynamic metrics if requested
+    if args.history_file:
+        samplers = create_dynamic_samplers()
+        sample_dynamic_metrics(samplers)
+        time.sleep(RATE_SAMPLE_INTERVAL)
+        if record_history_snapshot(args.history_file, sample_dynamic_metrics(samplers)):
+            print(f"\n{colorize('[SUCCESS]', COLOR_GREEN)} Metrics appended to: {colorize(args.history_file, COLOR_CYAN)}")
     
     # Export if requested
     if args.export_format:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# hardware_monitoring.py is a standalone script, not an installed package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Scripts'))
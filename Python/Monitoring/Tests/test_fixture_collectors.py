@@ -0,0 +1,254 @@
+"""Collectors and samplers run against the synthetic host tree of the benchmark."""
+
+import os
+
+import pytest
+
+import hardware_monitoring as hm
+
+CPUS = 8
+DISKS = 26
+NICS = 100
+
+
+class FakeClock:
+    """Stands in for time.monotonic() so rates have an exact elapsed time."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = str(tmp_path / 'host')
+    hm.generate_fixture_tree(root, cpus=CPUS, disks=DISKS, nics=NICS)
+    hm.configure_host_root(root)
+    hm.TOOLS.configure(offline=True)
+    hm.INVENTORY_CACHE.configure(enabled=False)
+    hm.configure_sample_pause(0.0)
+    hm.reset_collection_state()
+    yield root
+    hm.reset_collection_state()
+    hm.configure_host_root('')
+    hm.TOOLS.configure(offline=False)
+    hm.INVENTORY_CACHE.configure(enabled=True)
+    hm.configure_sample_pause(hm.RATE_SAMPLE_INTERVAL)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(hm.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    """A reader with a tiny buffer, so a file takes many positional reads like a multi-page seq_file."""
+    reader = hm.MetricFileReader(buffer_size=512)
+    monkeypatch.setattr(hm, 'FILE_READER', reader)
+    yield reader
+    reader.close_all()
+
+
+def read_host_file(root, path):
+    with open(root + path) as f:
+        return f.read()
+
+
+def write_host_file(root, path, content):
+    # Rewrite in place: the persistent reader keeps the descriptor of the old contents open
+    with open(root + path, 'w') as f:
+        f.write(content)
+
+
+def add_to_columns(content, names, deltas, name_field=0):
+    """Add {column: delta} to the counter columns of the named records of a table file.
+    
+    Counter columns are numbered from the first field after the name field.
+    """
+    lines = []
+    for line in content.split('\n'):
+        fields = line.split()
+        if len(fields) > name_field and fields[name_field] in names:
+            for column, delta in deltas.items():
+                fields[name_field + 1 + column] = str(int(fields[name_field + 1 + column]) + delta)
+            line = ' '.join(fields)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def test_cpu_information(root):
+    data = hm.collect_cpu_information(hm.VERBOSITY_FULL).data
+    
+    assert data['Model'] == 'Intel(R) Xeon(R) Fixture CPU @ 2.40GHz'
+    assert data['Logical Processors'] == CPUS
+    assert data['Physical CPUs'] == 1
+    assert data['Cores per CPU'] == CPUS // 2
+    assert data['Threads per Core'] == 2
+    assert data['NUMA Nodes'] == 1
+    assert data['Current Frequency'].value == pytest.approx(2400.0)
+    assert data['CPU Caches'] == ['L1d: 48.00 KB x 4', 'L1i: 32.00 KB x 4', 'L2: 1.25 MB x 4', 'L3: 16.00 MB x 1']
+    assert data['Socket Topology'] == ['socket 0: 1 die(s), 4 cores, 8 threads']
+    assert len(data['Frequency Policies']) == CPUS
+
+
+def test_memory_information(root):
+    data = hm.collect_memory_information(hm.VERBOSITY_FULL).data
+    total, available = 16318412 * 1024, 9876544 * 1024
+    
+    assert (data['Total Memory'].value, data['Total Memory'].unit) == (total, 'B')
+    assert data['Available Memory'].value == available
+    assert data['Used Memory'].value == total - available
+    assert data['Usage Percentage'].value == pytest.approx((total - available) / total * 100)
+    assert data['Swap Used'].value == (2097148 - 2001000) * 1024
+    assert data['Dirty Pages'].value == 1204 * 1024
+
+
+def test_os_information(root):
+    data = hm.collect_os_information(hm.VERBOSITY_DETAILED).data
+    
+    assert data['Hostname'] == 'fixture'
+    assert data['Distribution'] == 'Fixture Linux 1.0'
+    assert data['Uptime'].value == pytest.approx(356521.42)
+    assert [data[f'Load Average ({period}min)'].value for period in (1, 5, 15)] == [0.52, 0.48, 0.40]
+
+
+def test_cpu_stat_usage(root):
+    sampler = hm.CpuStatSampler()
+    assert sampler.sample() == []
+    stat = read_host_file(root, '/proc/stat')
+    # cpu0 and the aggregate line: 30 user and 70 idle ticks; the other cores did not tick
+    stat = add_to_columns(stat, {'cpu', 'cpu0'}, {0: 30, 3: 70})
+    write_host_file(root, '/proc/stat', stat)
+    
+    samples = {(s.name, s.labels['cpu']): s.value for s in sampler.sample()}
+    assert samples['cpu.usage', 'all'] == pytest.approx(30.0)
+    assert samples['cpu.user', 'all'] == pytest.approx(30.0)
+    assert samples['cpu.core_usage', 'cpu0'] == pytest.approx(30.0)
+    # A core without elapsed ticks is idle, not busy
+    assert [samples['cpu.core_usage', f'cpu{cpu}'] for cpu in range(1, CPUS)] == [0.0] * (CPUS - 1)
+
+
+def test_disk_rates_cover_every_disk_beyond_one_read(root, clock, small_reads):
+    diskstats = read_host_file(root, '/proc/diskstats')
+    assert len(diskstats) > 4 * len(small_reads._buffer)
+    sampler = hm.DiskStatsSampler()
+    assert sampler.sample_rates() == {}
+    disks = [f'sd{chr(ord("a") + index)}' for index in range(DISKS)]
+    assert list(sampler.partitions) == disks
+    
+    # 100 reads of 2000 sectors taking 200 ms, and 500 ms of I/O time
+    write_host_file(root, '/proc/diskstats', add_to_columns(diskstats, set(disks), {0: 100, 2: 2000, 3: 200, 9: 500},
+                                                            name_field=2))
+    clock.advance(1.0)
+    rates = sampler.sample_rates()
+    
+    assert list(rates) == disks
+    for disk in disks:
+        assert rates[disk].read_iops == pytest.approx(100.0)
+        assert rates[disk].read_bytes == pytest.approx(2000 * hm.DISK_SECTOR_SIZE)
+        assert rates[disk].write_iops == 0.0
+        assert rates[disk].await_ms == pytest.approx(2.0)
+        assert rates[disk].utilization == pytest.approx(50.0)
+        assert sampler.partitions[disk] == [f'{disk}1']
+
+
+def test_storage_information(root):
+    data = hm.collect_storage_information(hm.VERBOSITY_FULL).data
+    
+    assert data['Total Block Devices'] == DISKS
+    assert data['Devices'][:2] == ['sda (SSD) - 238.47 GB', 'sdb (HDD) - 476.95 GB']
+    assert (data['Busiest Disk'].name, data['Busiest Disk'].labels['device']) == ('disk.utilization', 'sda')
+
+
+def test_network_rates_cover_every_interface_beyond_one_read(root, clock, small_reads):
+    netdev = read_host_file(root, '/proc/net/dev')
+    assert len(netdev) > 4 * len(small_reads._buffer)
+    sampler = hm.NetDevSampler()
+    assert sampler.sample_rates() == {}
+    
+    write_host_file(root, '/proc/net/dev', add_to_columns(netdev, {f'eth{index}:' for index in range(NICS)},
+                                                          {0: 1000000, 1: 1000, 8: 500000}))
+    clock.advance(2.0)
+    rates = sampler.sample_rates()
+    
+    assert sorted(rates) == sorted(f'eth{index}' for index in range(NICS))
+    for rate in rates.values():
+        assert rate.rx_bytes == pytest.approx(500000.0)
+        assert rate.rx_packets == pytest.approx(500.0)
+        assert rate.tx_bytes == pytest.approx(250000.0)
+        assert rate.speed == 1000
+        assert rate.utilization == pytest.approx(500000.0 * 8 / 1e9 * 100)
+        assert set(rate.error_rates) == set(hm.NET_ERROR_COUNTERS)
+
+
+def test_link_state_reports_speed_only_with_carrier(root):
+    write_host_file(root, '/sys/class/net/eth1/carrier', '0\n')
+    samples = {(s.name, s.labels['interface']): s.value for s in hm.LinkStateSampler().sample()}
+    
+    assert samples['network.link', 'eth0'] == 1
+    assert samples['network.speed', 'eth0'] == 1000
+    assert samples['network.link', 'eth1'] == 0
+    assert ('network.speed', 'eth1') not in samples
+
+
+def test_rapl_power_draw(root, clock):
+    sampler = hm.RaplSampler()
+    assert [(domain.zone, domain.name) for domain in sampler.domains] == [
+        ('intel-rapl:0', 'package-0'), ('intel-rapl:0:0', 'package-0/core')]
+    assert sampler.sample() == []
+    
+    # The package counter wraps at max_energy_range_uj while the core counter advances 2 J
+    max_range = 262143328850
+    write_host_file(root, f'{hm.POWERCAP_PATH}/intel-rapl:0/energy_uj', f'{123456789012 + 5000000 - max_range}\n')
+    write_host_file(root, f'{hm.POWERCAP_PATH}/intel-rapl:0:0/energy_uj', f'{98765432101 + 2000000}\n')
+    clock.advance(1.0)
+    
+    watts = {s.labels['domain']: s.value for s in sampler.sample()}
+    assert watts == pytest.approx({'package-0': 5.0, 'package-0/core': 2.0})
+
+
+def test_rapl_mmio_duplicate_is_skipped(root):
+    mmio = f'{hm.POWERCAP_PATH}/intel-rapl-mmio:0'
+    os.makedirs(root + mmio)
+    for name, value in (('name', 'package-0'), ('enabled', '1'), ('energy_uj', '1000'),
+                        ('max_energy_range_uj', '262143328850')):
+        write_host_file(root, f'{mmio}/{name}', f'{value}\n')
+    
+    domains = hm.discover_rapl_domains()
+    assert [(domain.zone, domain.name) for domain in domains] == [
+        ('intel-rapl:0', 'package-0'), ('intel-rapl:0:0', 'package-0/core')]
+    data = hm.collect_power_information(hm.VERBOSITY_FULL).data
+    assert data['RAPL Domains'] == 2
+    assert data['Total Package Power'].name == 'power.package'
+
+
+def test_hwmon_readings(root):
+    readings = [(sensor.chip, sensor.label, sensor.kind, value, sensor.max, sensor.crit, alarm)
+                for sensor, value, alarm in hm.read_hwmon_sensors(hm.discover_hwmon_chips())]
+    
+    assert readings == [('coretemp', f'Core {core}', 'temp', 45.0 + core, 100.0, 100.0, False)
+                        for core in range(CPUS // 2)] + [
+        ('nct6775', 'fan1', 'fan', 1180.0, None, None, False),
+        ('nct6775', 'in0', 'in', 1.032, None, None, False),
+    ]
+    samples = {(s.name, s.labels['sensor']): (s.value, s.unit) for s in hm.HwmonSampler().sample()}
+    assert samples['hwmon.fan', 'fan1'] == (1180.0, 'RPM')
+    assert samples['hwmon.voltage', 'in0'] == (pytest.approx(1.032), 'V')
+
+
+def test_hwmon_alarm_and_cooling_summary(root):
+    write_host_file(root, f'{hm.HWMON_PATH}/hwmon0/temp1_crit_alarm', '1\n')
+    alarms = [sensor.label for sensor, _, alarm in hm.read_hwmon_sensors(hm.discover_hwmon_chips()) if alarm]
+    assert alarms == ['Core 0']
+    
+    data = hm.collect_cooling_information(hm.VERBOSITY_FULL).data
+    assert data['Max Temperature'].value == 48.0
+    assert data['Fans'] == ['nct6775/fan1: 1180 RPM']
@@ -0,0 +1,128 @@
+"""Round trips through the on-disk history format: write, reopen, query."""
+
+import math
+from collections import OrderedDict
+
+import pytest
+
+import hardware_monitoring as hm
+
+START = 1_000_000.0
+CYCLES = 5
+SAMPLES_PER_CYCLE = 120
+TOTAL = CYCLES * SAMPLES_PER_CYCLE
+
+
+def series_samples(i):
+    return [
+        ('cpu.usage', OrderedDict([('cpu', 'all')]), float(i % 100), '%'),
+        ('disk.utilization', OrderedDict([('device', 'sda')]), float(i), '%'),
+        ('disk.utilization', OrderedDict([('device', 'sdb')]), float(2 * i), '%'),
+        ('cpu.governor', OrderedDict(), 'performance', ''),
+    ]
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    for cycle in range(CYCLES):
+        history = hm.HistoryFile(path, writable=True)
+        assert history.open()
+        try:
+            for i in range(cycle * SAMPLES_PER_CYCLE, (cycle + 1) * SAMPLES_PER_CYCLE):
+                history.append(series_samples(i), timestamp=START + i)
+        finally:
+            history.close()
+    return path
+
+
+def expected_buckets(values, step, agg):
+    buckets = OrderedDict()
+    for i, value in values:
+        timestamp = START + i
+        buckets.setdefault(timestamp - timestamp % step, []).append(value)
+    reduce = {'max': max, 'min': min, 'count': len, 'last': lambda v: v[-1],
+              'avg': lambda v: sum(v) / len(v)}[agg]
+    return [(bucket, reduce(group)) for bucket, group in buckets.items()]
+
+
+def test_records_span_several_blocks_and_reopens_continue_the_open_block(history_path):
+    history = hm.HistoryFile(history_path)
+    assert history.open()
+    try:
+        blocks = OrderedDict()
+        for _, _, series_id, count, t_first, t_last in history.blocks():
+            blocks.setdefault(series_id, []).append((count, t_first, t_last))
+        names = {series_id: (name, dict(labels)) for series_id, (name, labels, _) in history.series.items()}
+    finally:
+        history.close()
+    
+    # Non-numeric samples are never stored
+    assert sorted(names.values(), key=str) == sorted([
+        ('cpu.usage', {'cpu': 'all'}),
+        ('disk.utilization', {'device': 'sda'}),
+        ('disk.utilization', {'device': 'sdb'}),
+    ], key=str)
+    per_block = hm.HistoryFile.RECORDS_PER_BLOCK
+    for series_id, series_blocks in blocks.items():
+        # A reopened writer appends to the partly filled block instead of starting a new one
+        assert len(series_blocks) == math.ceil(TOTAL / per_block)
+        assert [count for count, _, _ in series_blocks[:-1]] == [per_block] * (len(series_blocks) - 1)
+        assert sum(count for count, _, _ in series_blocks) == TOTAL
+        assert series_blocks[0][1] == START
+        assert series_blocks[-1][2] == START + TOTAL - 1
+
+
+@pytest.mark.parametrize('agg', list(hm.HISTORY_AGGREGATES))
+def test_query_step_and_aggregate(history_path, agg):
+    results = hm.query_history(history_path, 'disk.*', step=60, agg=agg)
+    by_device = {labels['device']: (name, unit, points) for name, labels, unit, points in results}
+    
+    assert sorted(by_device) == ['sda', 'sdb']
+    name, unit, points = by_device['sda']
+    assert (name, unit) == ('disk.utilization', '%')
+    assert points == pytest.approx(expected_buckets([(i, float(i)) for i in range(TOTAL)], 60, agg))
+    assert by_device['sdb'][2] == pytest.approx(
+        expected_buckets([(i, float(2 * i)) for i in range(TOTAL)], 60, agg))
+
+
+def test_query_without_step_returns_every_record(history_path):
+    (name, labels, unit, points), = hm.query_history(history_path, 'cpu.usage')
+    assert (name, dict(labels), unit) == ('cpu.usage', {'cpu': 'all'}, '%')
+    assert points == [(START + i, float(i % 100)) for i in range(TOTAL)]
+
+
+def test_query_filters_labels_and_time_range(history_path):
+    since, until = START + 250, START + 520
+    (name, labels, _, points), = hm.query_history(history_path, 'disk.utilization', labels=[('device', 'sdb')],
+                                                  since=since, until=until, step=100, agg='count')
+    assert labels['device'] == 'sdb'
+    assert points == expected_buckets([(i, 1.0) for i in range(250, 521)], 100, 'count')
+    assert hm.query_history(history_path, 'memory.*') == []
+
+
+def test_file_grows_past_the_preallocated_blocks(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    series = hm.HISTORY_GROW_BLOCKS + 10
+    for round_ in range(2):
+        history = hm.HistoryFile(path, writable=True)
+        assert history.open()
+        try:
+            history.append([('hwmon.temperature', OrderedDict([('sensor', f'temp{n}')]), float(n + round_), '°C')
+                            for n in range(series)], timestamp=START + round_)
+        finally:
+            history.close()
+    
+    results = hm.query_history(path, 'hwmon.temperature')
+    assert len(results) == series
+    for name, labels, unit, points in results:
+        n = int(labels['sensor'][4:])
+        assert points == [(START, float(n)), (START + 1, float(n + 1))]
+
+
+def test_rejects_files_that_are_not_history_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a history file'.ljust(hm.HISTORY_BLOCK_SIZE, b'\0'))
+    assert hm.query_history(str(path)) is None
+    assert not hm.HistoryFile(str(path), writable=True).open()
+    assert hm.query_history(str(tmp_path / 'missing.bin')) is None